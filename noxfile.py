@@ -24,6 +24,9 @@ except ImportError:
 
 package = "datadoc"
 python_versions = ["3.10", "3.11", "3.12"]
+benchmark_storage = Path("tests", "benchmarks", "baselines")
+# Fail when the median time of a benchmark grows by more than this
+benchmark_regression_threshold = "median:25%"
 nox.needs_version = ">= 2021.6.6"
 nox.options.sessions = (
     "pre-commit",
@@ -195,6 +198,50 @@ def coverage(session: Session) -> None:
     session.run("coverage", *args)
 
 
+@session(python=python_versions[-1])
+def benchmarks(session: Session) -> None:
+    """Run the benchmarks, failing if they regress against the stored baseline.
+
+    Record a new baseline with `nox -s benchmarks -- --save-baseline`, on the
+    same kind of machine the benchmarks are compared on. Baselines are stored
+    for each platform, and the latest one is compared against. CI keeps the
+    baselines in a cache for each kind of runner, and records a new one for
+    every push to main which doesn't regress.
+    """
+    session.install(".")
+    session.install(
+        "pytest",
+        "pytest-benchmark",
+        "pygments",
+        "pytest-mock",
+        "requests-mock",
+        "faker",
+    )
+    args = [
+        "tests/benchmarks",
+        "--benchmark-only",
+        f"--benchmark-storage={benchmark_storage}",
+        "-o",
+        "pythonpath=",
+    ]
+    posargs = list(session.posargs)
+    save_baseline = "--save-baseline" in posargs
+    if save_baseline:
+        posargs.remove("--save-baseline")
+        args.append("--benchmark-save=baseline")
+    if any(benchmark_storage.glob("*/*.json")):
+        args += [
+            "--benchmark-compare",
+            f"--benchmark-compare-fail={benchmark_regression_threshold}",
+        ]
+    elif not save_baseline:
+        session.warn(
+            f"No benchmark baseline in {benchmark_storage}, "
+            "record one with `nox -s benchmarks -- --save-baseline`"
+        )
+    session.run("pytest", *args, *posargs)
+
+
 @session(python=python_versions[-1])
 def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
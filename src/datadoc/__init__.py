@@ -1,3 +1,21 @@
 """Datadoc: Document datasets in Statistics Norway."""
 
-from datadoc.app import main
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datadoc.app import main
+
+__all__ = ["main"]
+
+
+def __getattr__(name: str) -> object:
+    # Importing the app imports flask and configures logging, so it is only
+    # done when main is used rather than whenever a module in the package is.
+    if name == "main":
+        from datadoc.app import main
+
+        return main
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
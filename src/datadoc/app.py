@@ -5,36 +5,58 @@ Members of this module should not be imported into any sub-modules, this will ca
 
 from __future__ import annotations
 
-import concurrent
+import atexit
+import hashlib
 import logging
+import logging.config
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import ssb_dash_components as ssb
-from dapla_metadata.datasets import Datadoc
-from dapla_metadata.datasets.code_list import CodeList
-from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
-from dash import Dash
-from dash import dcc
-from dash import html
-from flask_healthz import healthz
+import flask
 
 from datadoc import config
 from datadoc import state
-from datadoc.frontend.callbacks.register_callbacks import register_callbacks
-from datadoc.frontend.components.control_bars import build_controls_bar
-from datadoc.frontend.components.control_bars import build_footer_control_bar
-from datadoc.frontend.components.control_bars import header
+from datadoc.external_sources.cache import DiskCache
+from datadoc.external_sources.loader import ExternalSourcesLoader
+from datadoc.external_sources.loader import prefetch_external_sources
+from datadoc.frontend.components.identifiers import EXTERNAL_SOURCES_INTERVAL_ID
+from datadoc.frontend.components.identifiers import EXTERNAL_SOURCES_LOADED_STORE_ID
+from datadoc.frontend.components.identifiers import JUMP_TO_VARIABLE_STORE_ID
+from datadoc.frontend.components.identifiers import LOADING_OPTIONS_SHOWN_STORE
 from datadoc.logging_configuration.logging_config import get_log_config
+from datadoc.readiness import Readiness
+from datadoc.static_assets import ASSETS_IGNORE
+from datadoc.static_assets import ROUTE as STATIC_ASSETS_ROUTE
+from datadoc.static_assets import StaticAssets
 from datadoc.utils import get_app_version
 from datadoc.utils import pick_random_port
 from datadoc.utils import running_in_notebook
 
+if TYPE_CHECKING:
+    import concurrent.futures
+
+    from dash import Dash
+
 logging.config.dictConfig(get_log_config())
 logger = logging.getLogger(__name__)
 
 
 def build_app(app: type[Dash]) -> Dash:
     """Define the layout, register callbacks."""
+    # Dash, the components and dapla_metadata take seconds to import, so
+    # they are imported when the app is built rather than with this module
+    import ssb_dash_components as ssb
+    from dash import dcc
+    from dash import html
+
+    from datadoc.frontend.callbacks.register_callbacks import register_callbacks
+    from datadoc.frontend.components.control_bars import build_completeness_progress
+    from datadoc.frontend.components.control_bars import build_controls_bar
+    from datadoc.frontend.components.control_bars import build_footer_control_bar
+    from datadoc.frontend.components.control_bars import header
+    from datadoc.metrics import instrument_callbacks
+    from datadoc.profiling import profile_callbacks
+
     app.layout = html.Div(
         children=[
             html.Header(
@@ -50,7 +72,21 @@ def build_app(app: type[Dash]) -> Dash:
                         data=0,
                         storage_type="session",
                     ),
+                    dcc.Store(id=JUMP_TO_VARIABLE_STORE_ID),
+                    dcc.Store(id=EXTERNAL_SOURCES_LOADED_STORE_ID, data=0),
+                    *(
+                        dcc.Store(
+                            id={
+                                "type": LOADING_OPTIONS_SHOWN_STORE,
+                                "workspace": workspace,
+                            },
+                            data=False,
+                        )
+                        for workspace in ("dataset", "variables")
+                    ),
+                    dcc.Interval(id=EXTERNAL_SOURCES_INTERVAL_ID, interval=1000),
                     build_controls_bar(),
+                    build_completeness_progress(),
                     html.Div(id="alerts-section"),
                     dcc.Tabs(
                         id="tabs",
@@ -89,107 +125,233 @@ def build_app(app: type[Dash]) -> Dash:
     )
 
     register_callbacks(app)
+    profile_callbacks(app)
+    instrument_callbacks(app)
+    cache_layout(app)
 
     return app
 
 
+def cache_layout(app: Dash) -> None:
+    """Serialize the layout once, and serve it from memory.
+
+    The layout doesn't change once the app is built, but Dash serializes the
+    whole tree again for every page load. The ETag lets the browser reuse
+    the layout it already has.
+    """
+    from plotly.io.json import to_json_plotly
+
+    layout_json = to_json_plotly(app.layout).encode()
+    etag = hashlib.sha256(layout_json).hexdigest()
+
+    def serve_layout() -> flask.Response:
+        response = flask.Response(layout_json, mimetype="application/json")
+        response.set_etag(etag)
+        response.make_conditional(flask.request)
+        return response
+
+    app.server.view_functions[f"{app.config.routes_pathname_prefix}_dash-layout"] = (
+        serve_layout
+    )
+
+
 def get_app(
     executor: concurrent.futures.ThreadPoolExecutor,
     dataset_path: str | None = None,
 ) -> tuple[Dash, int]:
     """Centralize all the ugliness around initializing the app."""
+    from dapla_metadata.datasets import Datadoc
+    from dash import Dash
+    from flask_healthz import healthz
+
+    from datadoc.compression import init_compression
+    from datadoc.frontend.callbacks.dataset import populate_dataset_workspace
+    from datadoc.logging_configuration.request_context import init_request_context
+    from datadoc.metrics import metrics_endpoint
+    from datadoc.validation.completeness import CompletenessTracker
+    from datadoc.validation.engine import ValidationEngine
+    from datadoc.validation.engine import get_default_rules
+    from datadoc.validation.naming import ShortNameValidator
+
     logger.info("Datadoc version v%s", get_app_version())
+    settings = config.load_config()
+    state.readiness = Readiness(
+        settings.readiness_timeout,
+        allow_degraded=settings.readiness_allow_degraded,
+    )
     collect_data_from_external_sources(executor)
     state.metadata = Datadoc(
         dataset_path=dataset_path,
         statistic_subject_mapping=state.statistic_subject_mapping,
     )
+    state.completeness = CompletenessTracker(state.metadata)
+    state.short_name_validator = ShortNameValidator()
+    state.validation = ValidationEngine(
+        get_default_rules(state.short_name_validator),
+        state.metadata,
+    )
 
     # The service prefix must be set to run correctly on Dapla Jupyter
-    if prefix := config.get_jupyterhub_service_prefix():
+    if prefix := settings.jupyterhub_service_prefix:
         port = pick_random_port()
         requests_pathname_prefix = f"{prefix}proxy/{port}/"
     else:
-        port = config.get_port()
+        port = settings.port
         requests_pathname_prefix = "/"
 
-    name = config.get_app_name()
+    name = settings.app_name
+    assets_folder = Path(__file__).parent / "assets"
+
+    # Dash links the assets itself in development mode, so it can hot reload them
+    if settings.dash_development_mode:
+        static_assets = None
+        assets_options = {}
+    else:
+        static_assets = StaticAssets(
+            assets_folder,
+            f"{requests_pathname_prefix}{STATIC_ASSETS_ROUTE}",
+        )
+        assets_options = {
+            "assets_ignore": ASSETS_IGNORE,
+            "external_stylesheets": static_assets.stylesheets,
+            "external_scripts": static_assets.scripts,
+        }
 
     app = Dash(
         name=name,
         title=name,
-        assets_folder=f"{Path(__file__).parent}/assets",
+        assets_folder=str(assets_folder),
         requests_pathname_prefix=requests_pathname_prefix,
         suppress_callback_exceptions=True,
+        **assets_options,
     )
+    if static_assets is not None:
+        static_assets.init_app(app)
     app = build_app(app)
+    state.readiness.mark_layout_built()
+    # Lazy sources are only waited for when asked for, otherwise they load
+    # when a dropdown first needs them
+    executor.submit(
+        state.readiness.warm_up,
+        lambda: populate_dataset_workspace(state.metadata.dataset, 0),
+        lambda: prefetch_external_sources(*settings.prefetch_external_sources),
+    )
     app.server.register_blueprint(healthz, url_prefix="/healthz")
     app.server.config["HEALTHZ"] = {
         "live": lambda: True,
-        "ready": lambda: True,
+        "ready": state.readiness.check,
         "startup": lambda: True,
     }
-    logger.info("Built app with endpoints configured on /healthz")
+    app.server.add_url_rule("/metrics", view_func=metrics_endpoint)
+    init_request_context(app, settings.slow_request_threshold)
+    # Registered last, so it runs first and the request timings include it
+    init_compression(
+        app,
+        encodings=settings.compression_encodings,
+        min_size=settings.compression_min_bytes,
+        content_types=settings.compression_content_types,
+    )
+    logger.info("Built app with endpoints configured on /healthz and /metrics")
 
     return app, port
 
 
+def get_external_sources_cache() -> DiskCache | None:
+    """Get the cache for external sources, None if caching is disabled."""
+    settings = config.get_config()
+    if directory := settings.external_sources_cache_directory:
+        return DiskCache(directory, settings.external_sources_cache_ttl)
+    return None
+
+
 def collect_data_from_external_sources(
     executor: concurrent.futures.ThreadPoolExecutor,
 ) -> None:
     """Call classes and methods which collect data from external sources.
 
-    Must be non-blocking to prevent delays in app startup.
+    Must be non-blocking to prevent delays in app startup. The executor must
+    outlive this call, see `ExternalSourcesLoader`.
+
+    The statistic subject mapping is needed to open a dataset, so it is
+    fetched straight away. The code lists are lazy, and are only fetched
+    once they are needed.
     """
+    from datadoc.external_sources.sources import CachedCodeList
+    from datadoc.external_sources.sources import CachedStatisticSubjectMapping
+
     logger.debug("Start threads - Collecting data from external sources")
-    state.statistic_subject_mapping = StatisticSubjectMapping(
+    settings = config.get_config()
+    cache = get_external_sources_cache()
+    state.statistic_subject_mapping = CachedStatisticSubjectMapping(
         executor,
-        config.get_statistical_subject_source_url(),
+        settings.statistical_subject_source_url,
+        cache,
     )
 
-    state.unit_types = CodeList(
+    klass_base_url = settings.klass_base_url
+    state.unit_types = CachedCodeList(
         executor,
-        config.get_unit_code(),
+        settings.unit_code,
+        cache,
+        klass_base_url,
+        lazy=True,
     )
 
-    state.measurement_units = CodeList(
+    state.measurement_units = CachedCodeList(
         executor,
-        config.get_measurement_unit_code(),
+        settings.measurement_unit_code,
+        cache,
+        klass_base_url,
+        lazy=True,
     )
 
-    state.organisational_units = CodeList(
+    state.organisational_units = CachedCodeList(
         executor,
-        config.get_organisational_unit_code(),
+        settings.organisational_unit_code,
+        cache,
+        klass_base_url,
+        lazy=True,
     )
 
-    state.data_sources = CodeList(
+    state.data_sources = CachedCodeList(
         executor,
-        config.get_data_source_code(),
+        settings.data_source_code,
+        cache,
+        klass_base_url,
+        lazy=True,
     )
-    logger.debug("Finished blocking - Collecting data from external sources")
+    logger.debug("Submitted all fetches - Collecting data from external sources")
 
 
 def main(dataset_path: str | None = None) -> None:
     """Entrypoint when running as a script."""
     if dataset_path:
         logger.info("Starting app with dataset_path = %s", dataset_path)
+    settings = config.get_config()
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=12) as executor:
-        app, port = get_app(executor, dataset_path)
-        if running_in_notebook():
-            logger.info("Running in notebook")
-            app.run(
-                jupyter_mode="tab",
-                jupyter_server_url=config.get_jupyterhub_http_referrer(),
-                jupyter_height=1000,
-                port=port,
+    # app.run returns straight away in a notebook, so the loader has to be
+    # stopped when the process exits rather than when this function returns.
+    external_sources_loader = ExternalSourcesLoader(
+        refresh_interval=settings.external_sources_refresh_interval,
+    )
+    atexit.register(external_sources_loader.shutdown)
+
+    app, port = get_app(external_sources_loader.start(), dataset_path)
+    if running_in_notebook():
+        logger.info("Running in notebook")
+        app.run(
+            jupyter_mode="tab",
+            jupyter_server_url=settings.jupyterhub_http_referrer,
+            jupyter_height=1000,
+            port=port,
+        )
+    else:
+        if dev_mode := settings.dash_development_mode:
+            logger.warning(
+                "Starting in Development Mode. NOT SUITABLE FOR PRODUCTION.",
             )
-        else:
-            if dev_mode := config.get_dash_development_mode():
-                logger.warning(
-                    "Starting in Development Mode. NOT SUITABLE FOR PRODUCTION.",
-                )
-            app.run(debug=dev_mode, port=port)
+        config.reload_config_on_sighup()
+        app.run(debug=dev_mode, port=port)
 
 
 if __name__ == "__main__":
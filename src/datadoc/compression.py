@@ -0,0 +1,149 @@
+"""Compress responses, such as the JSON of the layout and callbacks.
+
+The variables workspace of a wide dataset is several megabytes of JSON,
+which compresses to a few percent of that. Brotli is used when the brotli
+package is installed and the browser accepts it, gzip otherwise.
+
+Responses whose body never changes, such as the assets and Dash's
+component suites, are compressed once and the compressed body is reused.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import threading
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import flask
+
+from datadoc.metrics import RESPONSE_COMPRESSED_SIZE
+from datadoc.metrics import RESPONSE_SIZE
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    BROTLI_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Collection
+    from collections.abc import Sequence
+
+    from dash import Dash
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+# Levels which compress JSON well in a few milliseconds per megabyte
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0),
+}
+if BROTLI_AVAILABLE:
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+
+# Enough for every asset and component suite the app serves
+MAX_CACHED_BODIES = 256
+
+# Responses which may not have a body, or a different one than the request asked for
+UNCOMPRESSED_STATUSES = frozenset(
+    {HTTPStatus.NO_CONTENT, HTTPStatus.PARTIAL_CONTENT, HTTPStatus.NOT_MODIFIED},
+)
+
+
+def _get_route() -> str:
+    rule = flask.request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _get_cache_key(response: flask.Response) -> str | None:
+    """Get a key which identifies the body of the response, if it never changes.
+
+    A strong ETag identifies the body. Fingerprinted files, such as Dash's
+    component suites, have no ETag, but the fingerprint is in their URL and
+    they may be cached for long.
+    """
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        return f'"{etag}"'
+    if response.cache_control.max_age:
+        return flask.request.full_path
+    return None
+
+
+def init_compression(
+    app: Dash,
+    *,
+    encodings: Sequence[str],
+    min_size: int,
+    content_types: Collection[str],
+) -> None:
+    """Compress the responses of the app, and record their sizes in the metrics.
+
+    Args:
+        app: The app to compress the responses of.
+        encodings: The encodings to use, in order of preference when the
+            browser accepts several. Encodings which aren't available are
+            left out.
+        min_size: Smaller responses are sent as they are, since compressing
+            them saves too little to be worth the time.
+        content_types: Only responses with these media types are compressed.
+            Images and fonts, for example, are already compressed.
+    """
+    available = [encoding for encoding in encodings if encoding in COMPRESSORS]
+    if unavailable := [encoding for encoding in encodings if encoding not in available]:
+        logger.warning("Compression with %s isn't available", ", ".join(unavailable))
+    if not available:
+        return
+    content_types = frozenset(content_types)
+    # Compressed bodies by cache key and encoding, the oldest is dropped when full
+    compressed_bodies: dict[tuple[str, str], bytes] = {}
+    lock = threading.Lock()
+
+    def compress(response: flask.Response, encoding: str) -> bytes:
+        key = _get_cache_key(response)
+        if key is None:
+            return COMPRESSORS[encoding](response.get_data())
+        with lock:
+            body = compressed_bodies.get((key, encoding))
+        if body is None:
+            body = COMPRESSORS[encoding](response.get_data())
+            with lock:
+                if len(compressed_bodies) >= MAX_CACHED_BODIES:
+                    del compressed_bodies[next(iter(compressed_bodies))]
+                compressed_bodies[key, encoding] = body
+        return body
+
+    @app.server.after_request
+    def compress_response(response: flask.Response) -> flask.Response:
+        # Files are streamed from disk, and aren't read into memory here
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        size = response.content_length or 0
+        encoding = None
+        if (
+            size >= min_size
+            and response.mimetype in content_types
+            and response.status_code not in UNCOMPRESSED_STATUSES
+            and "Content-Encoding" not in response.headers
+        ):
+            response.vary.add("Accept-Encoding")
+            encoding = flask.request.accept_encodings.best_match(available)
+        route = _get_route()
+        if encoding is None:
+            RESPONSE_SIZE.observe(size, route, IDENTITY)
+            return response
+
+        # The ETag is left strong, so Dash still answers conditional requests
+        # for component suites with 304
+        response.set_data(compress(response, encoding))
+        response.headers["Content-Encoding"] = encoding
+        RESPONSE_SIZE.observe(size, route, encoding)
+        RESPONSE_COMPRESSED_SIZE.observe(response.content_length or 0, route, encoding)
+        return response
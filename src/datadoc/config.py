@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import datetime
 import os
+import signal
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Literal
 
-from dapla_metadata.datasets import enums
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
-from datadoc.constants import DAPLA_MANUAL_TEXT
-from datadoc.frontend.components.builders import build_link_object
+# dapla_metadata is imported where it is used, so that reading the config
+# doesn't pull it in
+if TYPE_CHECKING:
+    from dapla_metadata.datasets import enums
 
 DOT_ENV_FILE_PATH = Path(__file__).parent.joinpath(".env")
 
@@ -19,13 +24,20 @@ DAPLA_REGION = "DAPLA_REGION"
 DAPLA_SERVICE = "DAPLA_SERVICE"
 
 env_loaded = False
+# The variables set from the .env file, which may be set again when it is reloaded
+_dotenv_variables: set[str] = set()
 
 
-def _load_dotenv_file() -> None:
+def _load_dotenv_file(*, reload: bool = False) -> None:
+    """Set the variables in the .env file which aren't set in the environment."""
     global env_loaded  # noqa: PLW0603
-    if not env_loaded and DOT_ENV_FILE_PATH.exists():
-        load_dotenv(DOT_ENV_FILE_PATH)
-        env_loaded = True
+    if (env_loaded and not reload) or not DOT_ENV_FILE_PATH.exists():
+        return
+    for key, value in dotenv_values(DOT_ENV_FILE_PATH).items():
+        if value is not None and (key in _dotenv_variables or key not in os.environ):
+            os.environ[key] = value
+            _dotenv_variables.add(key)
+    env_loaded = True
 
 
 def _get_config_item(item: str) -> str | None:
@@ -67,12 +79,30 @@ def get_log_formatter() -> Literal["simple", "json"]:
     """Get log formatter configuration."""
     if (
         _get_config_item("DATADOC_ENABLE_JSON_FORMATTING") == "True"
-        or get_dapla_region() is not None
+        # Only whether the region is set, parsing it would import dapla_metadata
+        or _get_config_item(DAPLA_REGION) is not None
     ):
         return "json"
     return "simple"
 
 
+def get_log_queue_enabled() -> bool:
+    """Write logs from a listener thread, so request threads never wait for stdout."""
+    return _get_config_item("DATADOC_LOG_QUEUE_ENABLED") == "True"
+
+
+def get_log_queue_size() -> int:
+    """Get how many log records may wait to be written."""
+    return int(_get_config_item("DATADOC_LOG_QUEUE_SIZE") or 10_000)
+
+
+def get_log_queue_overflow() -> Literal["drop", "block"]:
+    """Get whether to drop new log records or wait for room when the log queue is full."""
+    if _get_config_item("DATADOC_LOG_QUEUE_OVERFLOW") == "block":
+        return "block"
+    return "drop"
+
+
 def get_dash_development_mode() -> bool:
     """Get the development mode for Dash."""
     return _get_config_item("DATADOC_DASH_DEVELOPMENT_MODE") == "True"
@@ -105,6 +135,8 @@ def get_statistical_subject_source_url() -> str | None:
 
 def get_dapla_region() -> enums.DaplaRegion | None:
     """Get the Dapla region we're running on."""
+    from dapla_metadata.datasets import enums
+
     if region := _get_config_item(DAPLA_REGION):
         return enums.DaplaRegion(region)
 
@@ -113,6 +145,8 @@ def get_dapla_region() -> enums.DaplaRegion | None:
 
 def get_dapla_service() -> enums.DaplaService | None:
     """Get the Dapla service we're running on."""
+    from dapla_metadata.datasets import enums
+
     if service := _get_config_item(DAPLA_SERVICE):
         return enums.DaplaService(service)
 
@@ -144,9 +178,249 @@ def get_data_source_code() -> int | None:
     return int(_get_config_item("DATADOC_DATA_SOURCE_CODE") or 712)
 
 
-def get_dapla_manual_naming_standard_url() -> dict | None:
-    """Get the URL to naming standard in the DAPLA manual."""
-    link_href = _get_config_item("DAPLA_MANUAL_NAMING_STANDARD_URL")
-    if link_href is None:
+def get_klass_base_url() -> str:
+    """Get the base URL of the Klass API."""
+    return (
+        _get_config_item("DATADOC_KLASS_BASE_URL")
+        or "https://data.ssb.no/api/klass/v1/"
+    )
+
+
+def get_external_sources_cache_directory() -> Path | None:
+    """Get the directory to cache data from external sources in.
+
+    Defaults to a 'datadoc' directory in the user's cache directory. Set
+    DATADOC_EXTERNAL_SOURCES_CACHE_DIRECTORY to an empty string to disable the cache.
+    """
+    directory = _get_config_item("DATADOC_EXTERNAL_SOURCES_CACHE_DIRECTORY")
+    if directory is None:
+        cache_home = _get_config_item("XDG_CACHE_HOME")
+        return (Path(cache_home) if cache_home else Path.home() / ".cache") / "datadoc"
+    if not directory:
         return None
-    return build_link_object(DAPLA_MANUAL_TEXT, link_href)
+    return Path(directory)
+
+
+def get_external_sources_cache_ttl() -> datetime.timedelta:
+    """Get how long data from external sources is used before it is refreshed."""
+    return datetime.timedelta(
+        seconds=int(
+            _get_config_item("DATADOC_EXTERNAL_SOURCES_CACHE_TTL_SECONDS")
+            or 24 * 60 * 60,
+        ),
+    )
+
+
+def get_external_sources_refresh_interval() -> datetime.timedelta | None:
+    """Get how often data from external sources is refreshed, None to never refresh."""
+    seconds = int(
+        _get_config_item("DATADOC_EXTERNAL_SOURCES_REFRESH_INTERVAL_SECONDS")
+        or 60 * 60,
+    )
+    return datetime.timedelta(seconds=seconds) if seconds > 0 else None
+
+
+def get_readiness_timeout() -> datetime.timedelta:
+    """Get how long the app may warm up before it reports ready in degraded mode."""
+    return datetime.timedelta(
+        seconds=int(_get_config_item("DATADOC_READINESS_TIMEOUT_SECONDS") or 60),
+    )
+
+
+def get_readiness_allow_degraded() -> bool:
+    """Report ready once the readiness timeout has passed, even if warm-up isn't done."""
+    return _get_config_item("DATADOC_READINESS_ALLOW_DEGRADED") != "False"
+
+
+def get_prefetch_external_sources() -> tuple[str, ...]:
+    """Get the external sources to start getting when the app starts.
+
+    Set DATADOC_PREFETCH_EXTERNAL_SOURCES to a comma-separated list of
+    sources, such as "unit_types,organisational_units". Other sources are
+    only got once a dropdown needs them.
+    """
+    names = _get_config_item("DATADOC_PREFETCH_EXTERNAL_SOURCES") or ""
+    return tuple(name.strip() for name in names.split(",") if name.strip())
+
+
+def get_slow_request_threshold() -> datetime.timedelta:
+    """Get how long a request may take before it is logged as slow."""
+    return datetime.timedelta(
+        seconds=float(_get_config_item("DATADOC_SLOW_REQUEST_THRESHOLD_SECONDS") or 1),
+    )
+
+
+def get_compression_encodings() -> list[str]:
+    """Get the encodings to compress responses with, in order of preference.
+
+    Set DATADOC_COMPRESSION_ENCODINGS to a comma-separated list of "br" and
+    "gzip", or to an empty string to disable compression.
+    """
+    encodings = _get_config_item("DATADOC_COMPRESSION_ENCODINGS")
+    if encodings is None:
+        return ["br", "gzip"]
+    return [encoding.strip() for encoding in encodings.split(",") if encoding.strip()]
+
+
+def get_compression_min_bytes() -> int:
+    """Get how large a response must be to be compressed."""
+    return int(_get_config_item("DATADOC_COMPRESSION_MIN_BYTES") or 1024)
+
+
+def get_compression_content_types() -> frozenset[str]:
+    """Get the media types of the responses to compress.
+
+    Set DATADOC_COMPRESSION_CONTENT_TYPES to a comma-separated list of media types.
+    """
+    content_types = (
+        _get_config_item("DATADOC_COMPRESSION_CONTENT_TYPES")
+        or "application/json,text/html,text/css,text/javascript,application/javascript,text/plain,image/svg+xml"
+    )
+    return frozenset(
+        content_type.strip()
+        for content_type in content_types.split(",")
+        if content_type.strip()
+    )
+
+
+def get_profiling_directory() -> Path | None:
+    """Get the directory to write callback profiles to, None if profiling is disabled."""
+    directory = _get_config_item("DATADOC_PROFILING_DIRECTORY")
+    return Path(directory) if directory else None
+
+
+def get_profiling_callbacks() -> frozenset[str]:
+    """Get the names of the callbacks to profile on every call.
+
+    Set DATADOC_PROFILING_CALLBACKS to a comma-separated list of callback function names.
+    """
+    names = _get_config_item("DATADOC_PROFILING_CALLBACKS") or ""
+    return frozenset(name.strip() for name in names.split(",") if name.strip())
+
+
+def get_profiling_sample_rate() -> float:
+    """Get the fraction of callback requests to profile, from 0 to 1."""
+    return float(_get_config_item("DATADOC_PROFILING_SAMPLE_RATE") or 0)
+
+
+def get_profiling_token() -> str | None:
+    """Get the value of the `X-Datadoc-Profile` header which selects a request for profiling.
+
+    Keep it secret, anyone who knows it can make the server profile their requests.
+    """
+    return _get_config_item("DATADOC_PROFILING_TOKEN") or None
+
+
+def get_profiling_max_bytes() -> int:
+    """Get how much space profiles may take up before the oldest are deleted."""
+    megabytes = int(_get_config_item("DATADOC_PROFILING_MAX_MEGABYTES") or 100)
+    return megabytes * 1024 * 1024
+
+
+def get_dapla_manual_naming_standard_url() -> str | None:
+    """Get the URL to naming standard in the DAPLA manual."""
+    return _get_config_item("DAPLA_MANUAL_NAMING_STANDARD_URL")
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """The configuration of the app, read once.
+
+    The getters in this module read the environment on every call, while
+    reading an attribute here doesn't, so the snapshot is what the app uses
+    when serving requests. See the getter of the same name for each attribute.
+    """
+
+    app_name: str
+    port: int
+    jupyterhub_service_prefix: str | None
+    jupyterhub_http_referrer: str | None
+    dash_development_mode: bool
+    datadoc_dataset_path: str | None
+    dapla_manual_naming_standard_url: str | None
+    statistical_subject_source_url: str | None
+    klass_base_url: str
+    unit_code: int | None
+    measurement_unit_code: int | None
+    organisational_unit_code: int | None
+    data_source_code: int | None
+    external_sources_cache_directory: Path | None
+    external_sources_cache_ttl: datetime.timedelta
+    external_sources_refresh_interval: datetime.timedelta | None
+    readiness_timeout: datetime.timedelta
+    readiness_allow_degraded: bool
+    prefetch_external_sources: tuple[str, ...]
+    slow_request_threshold: datetime.timedelta
+    compression_encodings: tuple[str, ...]
+    compression_min_bytes: int
+    compression_content_types: frozenset[str]
+    profiling_directory: Path | None
+    profiling_callbacks: frozenset[str]
+    profiling_sample_rate: float
+    profiling_token: str | None
+    profiling_max_bytes: int
+
+    @classmethod
+    def from_environment(cls) -> ConfigSnapshot:
+        """Read every setting from the environment."""
+        return cls(
+            app_name=get_app_name(),
+            port=get_port(),
+            jupyterhub_service_prefix=get_jupyterhub_service_prefix(),
+            jupyterhub_http_referrer=get_jupyterhub_http_referrer(),
+            dash_development_mode=get_dash_development_mode(),
+            datadoc_dataset_path=get_datadoc_dataset_path(),
+            dapla_manual_naming_standard_url=get_dapla_manual_naming_standard_url(),
+            statistical_subject_source_url=get_statistical_subject_source_url(),
+            klass_base_url=get_klass_base_url(),
+            unit_code=get_unit_code(),
+            measurement_unit_code=get_measurement_unit_code(),
+            organisational_unit_code=get_organisational_unit_code(),
+            data_source_code=get_data_source_code(),
+            external_sources_cache_directory=get_external_sources_cache_directory(),
+            external_sources_cache_ttl=get_external_sources_cache_ttl(),
+            external_sources_refresh_interval=get_external_sources_refresh_interval(),
+            readiness_timeout=get_readiness_timeout(),
+            readiness_allow_degraded=get_readiness_allow_degraded(),
+            prefetch_external_sources=get_prefetch_external_sources(),
+            slow_request_threshold=get_slow_request_threshold(),
+            compression_encodings=tuple(get_compression_encodings()),
+            compression_min_bytes=get_compression_min_bytes(),
+            compression_content_types=get_compression_content_types(),
+            profiling_directory=get_profiling_directory(),
+            profiling_callbacks=get_profiling_callbacks(),
+            profiling_sample_rate=get_profiling_sample_rate(),
+            profiling_token=get_profiling_token(),
+            profiling_max_bytes=get_profiling_max_bytes(),
+        )
+
+
+_snapshot: ConfigSnapshot | None = None
+
+
+def load_config() -> ConfigSnapshot:
+    """Read the configuration again, from the environment and the .env file, and use it from now on.
+
+    Settings which are used when the app is built, like the port, need a
+    restart to take effect.
+    """
+    global _snapshot  # noqa: PLW0603
+    _load_dotenv_file(reload=True)
+    _snapshot = ConfigSnapshot.from_environment()
+    return _snapshot
+
+
+def get_config() -> ConfigSnapshot:
+    """Get the configuration snapshot, loading it on first use."""
+    return _snapshot if _snapshot is not None else load_config()
+
+
+def reload_config_on_sighup() -> None:
+    """Load the configuration again when the process gets SIGHUP.
+
+    Does nothing on platforms without SIGHUP. Must be called from the main
+    thread. Gunicorn handles SIGHUP itself, by starting new workers, which
+    load the configuration when they build the app.
+    """
+    if (sighup := getattr(signal, "SIGHUP", None)) is not None:
+        signal.signal(sighup, lambda *_: load_config())
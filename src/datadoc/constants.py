@@ -3,9 +3,16 @@
 MISSING_METADATA_WARNING = "Advarsel - obligatorisk metadata mangler"
 CHECK_OBLIGATORY_METADATA_DATASET_MESSAGE = "Følgende datasett felt har ikke verdi:"
 CHECK_OBLIGATORY_METADATA_VARIABLES_MESSAGE = "Følgende variabler har felt uten verdi:"
+CHECK_OBLIGATORY_METADATA_VARIABLES_SUMMARY_MESSAGE = (
+    "{num_variables} variabler har felt uten verdi. Antall variabler per felt:"
+)
+SHOW_MORE_VARIABLES_TEXT = "Vis flere variabler"
+INVALID_METADATA_WARNING = "Advarsel - ugyldig metadata"
+INVALID_METADATA_WARNING_MESSAGE = "Følgende metadata er ugyldig:"
 DAPLA_MANUAL_TEXT = "Dapla manual navnestandard"
 
 ILLEGAL_SHORTNAME_WARNING = (
     "Noen av variablene i datasetter følger ikke navnestandard for kortnavn"
 )
+ILLEGAL_SHORTNAME_BADGE = "Følger ikke navnestandard"
 ILLEGAL_SHORTNAME_WARNING_MESSAGE = "Følgende navnestandard er utarbeidet for variabler: Alfanumerisk begrenset til a-z (kun små bokstaver), 0-9 og _ (understrek). Kortnavn som ikke følger standarden:"
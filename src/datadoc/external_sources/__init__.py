@@ -0,0 +1 @@
+"""Access to the external sources Datadoc gets code lists and subjects from."""
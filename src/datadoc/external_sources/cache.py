@@ -0,0 +1,109 @@
+"""Persistent cache for data from external sources."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    import datetime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Data read from the cache.
+
+    Attributes:
+        data: The cached data.
+        fetched_at: When the data was fetched from the external source, as a Unix timestamp.
+        validators: HTTP cache validators for the data, used to make the
+            next request for it conditional.
+    """
+
+    data: Any
+    fetched_at: float
+    validators: dict[str, Any] = field(default_factory=dict)
+
+    def is_stale(self, ttl: datetime.timedelta) -> bool:
+        """Return True if the data is older than the given time to live."""
+        return time.time() - self.fetched_at > ttl.total_seconds()
+
+
+class DiskCache:
+    """Cache JSON serializable data in a local directory.
+
+    Each key is stored in its own file, which is replaced atomically so
+    concurrent readers never see a partially written entry. Entries are
+    never evicted; data older than the time to live is still returned but
+    flagged as stale, so callers can serve it while fetching a fresh copy.
+    """
+
+    def __init__(self, directory: Path, ttl: datetime.timedelta) -> None:
+        """Use the given directory, which is created if it doesn't exist."""
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Get the entry for the given key, or None if there is no usable entry."""
+        try:
+            with self._path(key).open(encoding="utf-8") as f:
+                content = json.load(f)
+            return CacheEntry(
+                content["data"],
+                float(content["fetched_at"]),
+                dict(content.get("validators") or {}),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception("Could not read cache entry %s", key)
+            return None
+
+    def put(
+        self,
+        key: str,
+        data: Any,  # noqa: ANN401
+        validators: dict[str, Any] | None = None,
+    ) -> None:
+        """Store data for the given key, replacing any existing entry.
+
+        Storing the same data again marks it as freshly fetched.
+        """
+        temporary_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.directory,
+                prefix=f".{key}.",
+                delete=False,
+            ) as f:
+                temporary_path = Path(f.name)
+                json.dump(
+                    {
+                        "fetched_at": time.time(),
+                        "validators": validators or {},
+                        "data": data,
+                    },
+                    f,
+                )
+            temporary_path.replace(self._path(key))
+        except (OSError, TypeError, ValueError):
+            logger.exception("Could not write cache entry %s", key)
+            if temporary_path is not None:
+                with contextlib.suppress(OSError):
+                    temporary_path.unlink()
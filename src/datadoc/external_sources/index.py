@@ -0,0 +1,186 @@
+"""Indexes for looking up codes and titles in code lists and the statistical subject structure."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from dapla_metadata.datasets.code_list import CodeList
+    from dapla_metadata.datasets.statistic_subject_mapping import Subject
+
+# The keys of the titles in the statistical subject structure
+SUBJECT_TITLE_LANGUAGES = {
+    "no": SupportedLanguages.NORSK_BOKMÅL,
+    "en": SupportedLanguages.ENGLISH,
+}
+
+
+def _fallback_language(language: SupportedLanguages) -> SupportedLanguages:
+    if language in (SupportedLanguages.NORSK_BOKMÅL, SupportedLanguages.NORSK_NYNORSK):
+        return SupportedLanguages.NORSK_BOKMÅL
+    return SupportedLanguages.ENGLISH
+
+
+@dataclass(frozen=True)
+class IndexedCode:
+    """A code with its titles.
+
+    Attributes:
+        code: The code.
+        titles: The title in each language it is available in.
+        parent: The code of the parent, for codes in a hierarchy such as
+            secondary subjects.
+    """
+
+    code: str
+    titles: Mapping[SupportedLanguages, str]
+    parent: str | None = None
+
+    def get_title(self, language: SupportedLanguages) -> str:
+        """Get the title in the given language.
+
+        Nynorsk falls back to Bokmål and other languages to English, in the
+        same way as the code list items. Returns an empty string if there is
+        no title.
+        """
+        if language in self.titles:
+            return self.titles[language]
+        return self.titles.get(_fallback_language(language), "")
+
+
+class CodeIndex:
+    """Constant time lookups from code to title and from title to code.
+
+    Codes keep the order of the code list. When a code or title appears more
+    than once, the first occurrence is used.
+
+    Example:
+        >>> index = CodeIndex(
+        ...     [
+        ...         IndexedCode("01", {SupportedLanguages.NORSK_BOKMÅL: "Adresse"}),
+        ...         IndexedCode("011", {SupportedLanguages.NORSK_BOKMÅL: "Gate"}, "01"),
+        ...         IndexedCode("02", {SupportedLanguages.NORSK_BOKMÅL: "Bolig"}),
+        ...     ],
+        ... )
+        >>> index.get_title("011", SupportedLanguages.NORSK_NYNORSK)
+        'Gate'
+        >>> index.get_code("Bolig", SupportedLanguages.NORSK_BOKMÅL)
+        '02'
+        >>> [code.code for code in index.with_prefix("01")]
+        ['01', '011']
+    """
+
+    def __init__(self, codes: Iterable[IndexedCode]) -> None:
+        """Build the indexes."""
+        self._by_code: dict[str, IndexedCode] = {}
+        for code in codes:
+            self._by_code.setdefault(code.code, code)
+        self._by_title: dict[SupportedLanguages, dict[str, str]] = {}
+        for language in SupportedLanguages:
+            titles: dict[str, str] = {}
+            for code in self._by_code.values():
+                if title := code.get_title(language):
+                    titles.setdefault(title, code.code)
+            self._by_title[language] = titles
+        self._sorted_codes = sorted(self._by_code)
+
+    def __len__(self) -> int:
+        """The number of codes."""
+        return len(self._by_code)
+
+    def __iter__(self) -> Iterator[IndexedCode]:
+        """Iterate over the codes in the order of the code list."""
+        return iter(self._by_code.values())
+
+    def __contains__(self, code: object) -> bool:
+        """Return True if the code is in the index."""
+        return code in self._by_code
+
+    def get(self, code: str) -> IndexedCode | None:
+        """Get a code, None if it isn't in the index."""
+        return self._by_code.get(code)
+
+    def get_title(self, code: str, language: SupportedLanguages) -> str | None:
+        """Get the title of a code in the given language, None if the code isn't in the index."""
+        if indexed := self._by_code.get(code):
+            return indexed.get_title(language)
+        return None
+
+    def get_code(self, title: str, language: SupportedLanguages) -> str | None:
+        """Get the code with the given title, None if no code has the title."""
+        return self._by_title[language].get(title)
+
+    def with_prefix(self, prefix: str) -> list[IndexedCode]:
+        """Get the codes which start with the given prefix, sorted by code."""
+        start = bisect.bisect_left(self._sorted_codes, prefix)
+        matches = []
+        for code in self._sorted_codes[start:]:
+            if not code.startswith(prefix):
+                break
+            matches.append(self._by_code[code])
+        return matches
+
+
+def _subject_titles(subject: Subject) -> dict[SupportedLanguages, str]:
+    return {
+        SUBJECT_TITLE_LANGUAGES[key]: title
+        for key, title in subject.titles.items()
+        if key in SUBJECT_TITLE_LANGUAGES
+    }
+
+
+def _index_entries(
+    source: CodeList | StatisticSubjectMapping,
+) -> Iterator[IndexedCode]:
+    if isinstance(source, StatisticSubjectMapping):
+        for primary in source.primary_subjects:
+            yield IndexedCode(primary.subject_code, _subject_titles(primary))
+            for secondary in primary.secondary_subjects:
+                yield IndexedCode(
+                    secondary.subject_code,
+                    _subject_titles(secondary),
+                    primary.subject_code,
+                )
+    else:
+        for item in source.classifications:
+            yield IndexedCode(item.code, dict(item.titles))
+
+
+_indexes: weakref.WeakKeyDictionary[
+    CodeList | StatisticSubjectMapping,
+    tuple[object, CodeIndex],
+] = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_code_index(source: CodeList | StatisticSubjectMapping) -> CodeIndex:
+    """Get the index of a code list or the statistical subject structure.
+
+    The index is built once for each version of the source's data, and
+    rebuilt when a refresh swaps in a new version. Secondary subjects have
+    their primary subject as parent.
+
+    Blocks until the source has loaded.
+    """
+    # Read the version first, so data swapped in while building is indexed
+    # under the old version and the index is rebuilt on the next call.
+    version = getattr(source, "version", None)
+    with _indexes_lock:
+        cached = _indexes.get(source)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    index = CodeIndex(_index_entries(source))
+    with _indexes_lock:
+        _indexes[source] = (version, index)
+    return index
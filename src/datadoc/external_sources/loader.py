@@ -0,0 +1,235 @@
+"""Load data from external sources in the background for the lifetime of the app."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import logging
+import threading
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from datadoc import state
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from dapla_metadata.datasets.external_sources.external_sources import (
+        GetExternalSource,
+    )
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 12
+
+# Cleared while lazy sources are held back, see `holding_back_lazy_sources`
+_start_lazy_sources: ContextVar[bool] = ContextVar("start_lazy_sources", default=True)
+
+
+class ExternalSourcesLoader:
+    """Own the executor which loads data from external sources.
+
+    The executor lives as long as the app rather than the block which
+    started it, so the server can accept requests while code lists are
+    still being fetched. Exiting a `with` block around a
+    ThreadPoolExecutor waits for every pending fetch, which is what made
+    startup depend on the slowest external source.
+
+    With a refresh interval the loader also refreshes the external sources
+    periodically, in a background thread, for as long as it is running.
+
+    Example:
+        >>> loader = ExternalSourcesLoader(max_workers=1)
+        >>> loader.started
+        False
+        >>> executor = loader.start()
+        >>> executor.submit(sum, [1, 2]).result()
+        3
+        >>> loader.shutdown()
+        >>> loader.started
+        False
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        refresh_interval: datetime.timedelta | None = None,
+    ) -> None:
+        """Prepare the loader, no threads are started until `start` is called.
+
+        Args:
+            max_workers: The number of threads fetching from external sources.
+            refresh_interval: How often to refresh the external sources, None to never refresh.
+        """
+        self.max_workers = max_workers
+        self.refresh_interval = refresh_interval
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._stop_refreshing = threading.Event()
+
+    @property
+    def started(self) -> bool:
+        """True between `start` and `shutdown`."""
+        return self._executor is not None
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """The executor which runs fetches from external sources.
+
+        Raises:
+            RuntimeError: If the loader hasn't been started.
+        """
+        if self._executor is None:
+            msg = "The external sources loader has not been started"
+            raise RuntimeError(msg)
+        return self._executor
+
+    def start(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Start the executor, if it isn't already running, and return it."""
+        if self._executor is None:
+            logger.debug("Starting external sources loader")
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="external-sources",
+            )
+            if self.refresh_interval:
+                self._stop_refreshing = threading.Event()
+                threading.Thread(
+                    target=self._refresh_periodically,
+                    args=(self.refresh_interval, self._stop_refreshing),
+                    name="external-sources-refresh",
+                    daemon=True,
+                ).start()
+        return self._executor
+
+    @staticmethod
+    def _refresh_periodically(
+        interval: datetime.timedelta,
+        stopped: threading.Event,
+    ) -> None:
+        while not stopped.wait(interval.total_seconds()):
+            refresh_external_sources()
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        """Stop the executor.
+
+        Fetches which haven't started are cancelled. By default this doesn't
+        wait for running fetches, so stopping the app isn't held up by a slow
+        external source.
+
+        Args:
+            wait: Wait for running fetches to finish before returning.
+        """
+        if self._executor is None:
+            return
+        logger.debug("Shutting down external sources loader")
+        self._stop_refreshing.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+
+    def __enter__(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Start the loader and return its executor."""
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Shut down the loader without waiting for running fetches."""
+        self.shutdown()
+
+
+def get_external_sources() -> list[GetExternalSource]:
+    """Get the external sources which have been set up for the app."""
+    return [
+        getattr(state, name)
+        for name in (
+            "statistic_subject_mapping",
+            "unit_types",
+            "organisational_units",
+            "data_sources",
+            "measurement_units",
+        )
+        if hasattr(state, name)
+    ]
+
+
+def is_started(source: GetExternalSource) -> bool:
+    """Return True if getting the source's data has started.
+
+    Lazy sources start when they are first accessed. Other sources start
+    when they are created.
+    """
+    return getattr(source, "started", True)
+
+
+@contextlib.contextmanager
+def holding_back_lazy_sources() -> Iterator[None]:
+    """Keep lazy sources which haven't started from starting when accessed.
+
+    Used when rendering ahead of any user, so that only the sources users
+    actually need are got.
+    """
+    token = _start_lazy_sources.set(False)
+    try:
+        yield
+    finally:
+        _start_lazy_sources.reset(token)
+
+
+def may_access(source: GetExternalSource) -> bool:
+    """Return True unless accessing the source would start a lazy source which is held back."""
+    return _start_lazy_sources.get() or is_started(source)
+
+
+def external_sources_loaded() -> bool:
+    """Return True when every started external source has finished loading its data.
+
+    Lazy sources which haven't been accessed yet are ignored, checking them
+    would start them.
+    """
+    return all(
+        source.check_if_external_data_is_loaded()
+        for source in get_external_sources()
+        if is_started(source)
+    )
+
+
+def prefetch_external_sources(*names: str) -> None:
+    """Hint that the named external sources in the state will be needed soon.
+
+    Lazy sources which haven't started yet start getting their data, so it
+    is more likely to have arrived when it is needed.
+    """
+    for name in names:
+        if start := getattr(getattr(state, name, None), "start", None):
+            start()
+
+
+def refresh_external_sources() -> int:
+    """Refresh the external sources which have started and finished loading.
+
+    Sources which can't be refreshed are skipped, and a failed refresh
+    leaves the source with the data it had.
+
+    Returns:
+        The number of sources which were updated with new data.
+    """
+    refreshed = 0
+    for source in get_external_sources():
+        refresh = getattr(source, "refresh", None)
+        if (
+            refresh is None
+            or not is_started(source)
+            or not source.check_if_external_data_is_loaded()
+        ):
+            continue
+        try:
+            refreshed += bool(refresh())
+        except Exception:
+            logger.exception("Could not refresh %s", type(source).__name__)
+    logger.debug("Refreshed %s external sources", refreshed)
+    return refreshed
@@ -0,0 +1,464 @@
+"""Code lists and the statistic subject mapping, served from a local cache when possible.
+
+On startup the cached data is used straight away. If it is older than the
+cache's time to live it is still used, while a fresh copy is fetched in the
+background and swapped in when it arrives (stale-while-revalidate). Only
+when nothing is cached does startup depend on the external source.
+
+Refreshing makes conditional requests, using the ETag and Last-Modified
+headers of the last response, so data which hasn't changed costs a single
+request answered with 304 Not Modified.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from typing import cast
+
+import requests
+from bs4 import BeautifulSoup
+from dapla_metadata.datasets.code_list import CodeList
+from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pandas as pd
+    from bs4 import ResultSet
+
+    from datadoc.external_sources.cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+KLASS_CODE_COLUMNS = ["code", "name"]
+
+
+@dataclass(frozen=True)
+class Validators:
+    """HTTP cache validators of a response, which make the next request for it conditional.
+
+    Example:
+        >>> Validators(etag='"abc"').to_headers()
+        {'If-None-Match': '"abc"'}
+        >>> Validators.from_dict(Validators(last_modified="x").to_dict())
+        Validators(etag=None, last_modified='x')
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> Validators:
+        """Get the validators of a response."""
+        return cls(response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str | None] | None) -> Validators:
+        """Read validators stored with `to_dict`."""
+        data = data or {}
+        return cls(data.get("etag"), data.get("last_modified"))
+
+    def to_dict(self) -> dict[str, str | None]:
+        """Get the validators in a form which can be stored as JSON."""
+        return {"etag": self.etag, "last_modified": self.last_modified}
+
+    def to_headers(self) -> dict[str, str]:
+        """Get the headers for a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def conditional_get(
+    url: str,
+    validators: Validators | None = None,
+    params: dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+) -> requests.Response | None:
+    """Get a URL, unless it hasn't changed since the response with the given validators.
+
+    Args:
+        url: The URL to get.
+        validators: The validators of the last response, None to always get the URL.
+        params: Query parameters for the request.
+        headers: Headers for the request.
+
+    Returns:
+        The response, or None if the server answered 304 Not Modified.
+
+    Raises:
+        requests.RequestException: If the request failed.
+    """
+    response = requests.get(
+        url,
+        params=params,
+        headers={**(headers or {}), **(validators or Validators()).to_headers()},
+        timeout=REQUEST_TIMEOUT_SECONDS,
+    )
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        return None
+    response.raise_for_status()
+    return response
+
+
+def fetch_klass_codes(
+    base_url: str,
+    classification_id: int,
+    language: SupportedLanguages,
+    validators: Validators | None = None,
+) -> tuple[list[dict[str, str]] | None, Validators]:
+    """Fetch the codes which are valid today for a classification in Klass.
+
+    Args:
+        base_url: The base URL of the Klass API.
+        classification_id: The ID of the classification.
+        language: The language of the code names.
+        validators: The validators of the last fetch, None to always fetch the codes.
+
+    Returns:
+        The code and name of each code in the classification, or None if
+        they haven't changed since the last fetch, and the validators for
+        the next fetch.
+
+    Raises:
+        requests.RequestException: If the codes could not be fetched.
+    """
+    response = conditional_get(
+        f"{base_url.rstrip('/')}/classifications/{classification_id}/codes",
+        validators,
+        params={
+            "from": datetime.datetime.now(tz=datetime.UTC).date().isoformat(),
+            "language": language.value,
+        },
+        headers={"Accept": "application/json"},
+    )
+    if response is None:
+        return None, validators or Validators()
+    codes = [
+        {column: code.get(column) for column in KLASS_CODE_COLUMNS}
+        for code in response.json()["codes"]
+    ]
+    return codes, Validators.from_response(response)
+
+
+def _submit(executor: ThreadPoolExecutor, fn: Callable[[], object]) -> Future | None:
+    try:
+        return executor.submit(fn)
+    except RuntimeError:
+        logger.warning("Executor is shut down, not refreshing external source")
+        return None
+
+
+def _submit_or_run(executor: ThreadPoolExecutor, fn: Callable[[], object]) -> Future:
+    """Submit `fn`, or run it in this thread if the executor has been shut down.
+
+    Getting a source for the first time can't be skipped like a refresh,
+    otherwise it would never finish loading.
+    """
+    try:
+        return executor.submit(fn)
+    except RuntimeError:
+        logger.warning("Executor is shut down, getting external source in this thread")
+    future: Future = Future()
+    try:
+        future.set_result(fn())
+    except Exception as e:  # noqa: BLE001
+        future.set_exception(e)
+    return future
+
+
+class _DeferredExecutor:
+    """Stands in for the executor while a lazy source is created, so nothing is fetched yet."""
+
+    def submit(self, *args: object, **kwargs: object) -> None:
+        """Don't run anything."""
+
+
+class CachedCodeList(CodeList):
+    """A Klass code list which is cached on disk and can be refreshed.
+
+    A lazy code list isn't fetched when it is created, but the first time
+    it is accessed or `start` is called. Until then it takes no memory and
+    makes no requests, so code lists a session never uses are never fetched.
+
+    Attributes:
+        refresh_future: Completes when a background refresh of stale data is
+            done, None if no refresh was needed.
+        version: Incremented each time a new version of the code list is
+            swapped in by a refresh.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        classification_id: int | None,
+        cache: DiskCache | None,
+        base_url: str,
+        *,
+        lazy: bool = False,
+    ) -> None:
+        """Get the code list from the cache, or from Klass if it isn't cached.
+
+        Args:
+            executor: Runs fetching and refreshing the code list.
+            classification_id: The ID of the classification in Klass.
+            cache: The cache to use, None to always fetch from Klass.
+            base_url: The base URL of the Klass API.
+            lazy: Wait until the code list is first accessed before getting it.
+        """
+        self._executor = executor
+        self._start_lock = threading.Lock()
+        self._cache = cache
+        self._base_url = base_url
+        self._refresh_lock = threading.Lock()
+        # The codes and validators of the last fetch, for conditional requests
+        self._records: dict[str, list[dict[str, str]]] = {}
+        self._validators: dict[str, Validators] = {}
+        self.refresh_future: Future | None = None
+        self.version = 0
+        super().__init__(
+            cast("ThreadPoolExecutor", _DeferredExecutor()) if lazy else executor,
+            classification_id,
+        )
+
+    @property
+    def cache_key(self) -> str:
+        """The key the code list is cached under."""
+        return f"klass_codes_{self.classification_id}"
+
+    @property
+    def started(self) -> bool:
+        """True once getting the code list has started."""
+        return self.future is not None
+
+    def start(self) -> None:
+        """Start getting the code list, if that hasn't started already.
+
+        Call this as a hint when the code list will probably be needed soon.
+        """
+        with self._start_lock:
+            if not self.started:
+                self.future = _submit_or_run(
+                    self._executor,
+                    self._fetch_data_from_external_source,
+                )
+
+    def check_if_external_data_is_loaded(self) -> bool:
+        """Check if the code list has loaded, starting to get it if it is lazy."""
+        self.start()
+        return super().check_if_external_data_is_loaded()
+
+    def wait_for_external_result(self) -> None:
+        """Wait for the code list to load, starting to get it if it is lazy."""
+        self.start()
+        super().wait_for_external_result()
+
+    def retrieve_external_data(self) -> dict[SupportedLanguages, pd.DataFrame] | None:
+        """Get the code list, waiting for it to load and starting to get it if it is lazy."""
+        self.start()
+        return super().retrieve_external_data()
+
+    def _fetch_data_from_external_source(
+        self,
+    ) -> dict[SupportedLanguages, pd.DataFrame] | None:
+        if self.classification_id is None:
+            logger.debug("No classification ID supplied")
+            return None
+        entry = self._cache.get(self.cache_key) if self._cache else None
+        if entry is None:
+            if not self._fetch():
+                return None
+            return _dataframes_from_records(self._records)
+        self._records = entry.data
+        self._validators = {
+            language: Validators.from_dict(validators)
+            for language, validators in entry.validators.items()
+        }
+        if self._cache and entry.is_stale(self._cache.ttl):
+            logger.debug("Refreshing stale code list %s", self.classification_id)
+            self.refresh_future = _submit(self._executor, self.refresh)
+        return _dataframes_from_records(entry.data)
+
+    def _fetch(self) -> bool:
+        """Fetch the code list, conditionally for languages fetched before.
+
+        Returns:
+            True if the code list has changed since the last fetch.
+        """
+        try:
+            fetched = {
+                language.value: fetch_klass_codes(
+                    self._base_url,
+                    int(str(self.classification_id)),
+                    language,
+                    (
+                        self._validators.get(language.value)
+                        if language.value in self._records
+                        else None
+                    ),
+                )
+                for language in self.supported_languages
+            }
+        except (requests.RequestException, KeyError, ValueError):
+            logger.exception("Exception while getting classifications from Klass")
+            return False
+        changed = any(codes is not None for codes, _ in fetched.values())
+        self._records = {
+            language: self._records[language] if codes is None else codes
+            for language, (codes, _) in fetched.items()
+        }
+        self._validators = {
+            language: validators for language, (_, validators) in fetched.items()
+        }
+        if self._cache:
+            # Also store unchanged data, to mark it as freshly fetched
+            self._cache.put(
+                self.cache_key,
+                self._records,
+                {
+                    language: validators.to_dict()
+                    for language, validators in self._validators.items()
+                },
+            )
+        return changed
+
+    def refresh(self) -> bool:
+        """Fetch the code list again, and swap it in if it has changed.
+
+        Returns:
+            True if a new version of the code list was swapped in.
+        """
+        with self._refresh_lock:
+            if not self._fetch():
+                logger.debug("Code list %s is unchanged", self.classification_id)
+                return False
+            dataframes = _dataframes_from_records(self._records)
+            # Assigning the new list replaces the old one in a single step,
+            # so readers see either the old or the new code list.
+            self.classifications_dataframes = dataframes
+            self._classifications = self._create_code_list_from_dataframe(dataframes)
+            self.version += 1
+            logger.info(
+                "Refreshed code list %s, now version %s",
+                self.classification_id,
+                self.version,
+            )
+            return True
+
+
+def _dataframes_from_records(
+    records: dict[str, list[dict[str, str]]],
+) -> dict[SupportedLanguages, pd.DataFrame]:
+    # Only needed once a code list arrives, not to start the app
+    import pandas as pd
+
+    return {
+        SupportedLanguages(language): pd.DataFrame.from_records(
+            codes,
+            columns=KLASS_CODE_COLUMNS,
+        )
+        for language, codes in records.items()
+    }
+
+
+class CachedStatisticSubjectMapping(StatisticSubjectMapping):
+    """The statistic subject mapping, with the statistical structure document cached on disk.
+
+    Attributes:
+        refresh_future: Completes when a background refresh of stale data is
+            done, None if no refresh was needed.
+        version: Incremented each time a new version of the mapping is
+            swapped in by a refresh.
+    """
+
+    cache_key = "statistical_subject_structure"
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        source_url: str | None,
+        cache: DiskCache | None,
+    ) -> None:
+        """Get the statistical structure document from the cache, or from `source_url`.
+
+        Args:
+            executor: Runs fetching and refreshing the document.
+            source_url: The URL from which to fetch the statistical structure document.
+            cache: The cache to use, None to always fetch from `source_url`.
+        """
+        self._executor = executor
+        self._cache = cache
+        self._refresh_lock = threading.Lock()
+        self._validators: Validators | None = None
+        self.refresh_future: Future | None = None
+        self.version = 0
+        super().__init__(executor, source_url)
+
+    def _fetch_data_from_external_source(self) -> ResultSet | None:
+        if not self.source_url:
+            logger.debug("No statistic subject url supplied")
+            return None
+        entry = self._cache.get(self.cache_key) if self._cache else None
+        if entry is None:
+            return self._fetch()
+        self._validators = Validators.from_dict(entry.validators.get("document"))
+        if self._cache and entry.is_stale(self._cache.ttl):
+            logger.debug("Refreshing stale statistical structure")
+            self.refresh_future = _submit(self._executor, self.refresh)
+        return _parse_subject_structure(entry.data)
+
+    def _fetch(self) -> ResultSet | None:
+        """Fetch the document, None if it failed or hasn't changed since the last fetch."""
+        try:
+            response = conditional_get(str(self.source_url), self._validators)
+        except requests.exceptions.RequestException:
+            logger.exception("Exception while fetching statistical structure")
+            return None
+        if response is None:
+            if self._cache and (entry := self._cache.get(self.cache_key)):
+                self._cache.put(self.cache_key, entry.data, entry.validators)
+            return None
+        response.encoding = "utf-8"
+        self._validators = Validators.from_response(response)
+        if self._cache:
+            self._cache.put(
+                self.cache_key,
+                response.text,
+                {"document": self._validators.to_dict()},
+            )
+        return _parse_subject_structure(response.text)
+
+    def refresh(self) -> bool:
+        """Fetch the document again, and swap in the mapping if it has changed.
+
+        Returns:
+            True if a new version of the mapping was swapped in.
+        """
+        with self._refresh_lock:
+            subject_structure = self._fetch()
+            if subject_structure is None:
+                logger.debug("Statistical structure is unchanged")
+                return False
+            self._primary_subjects = self._parse_statistic_subject_structure_xml(
+                subject_structure,
+            )
+            self.version += 1
+            logger.info("Refreshed statistical structure, now version %s", self.version)
+            return True
+
+
+def _parse_subject_structure(document: str) -> ResultSet:
+    return BeautifulSoup(document, features="xml").find_all("hovedemne")
@@ -13,6 +13,8 @@ from dash import no_update
 
 from datadoc import config
 from datadoc import state
+from datadoc.constants import DAPLA_MANUAL_TEXT
+from datadoc.external_sources.loader import prefetch_external_sources
 from datadoc.frontend.callbacks.utils import VALIDATION_ERROR
 from datadoc.frontend.callbacks.utils import MetadataInputTypes
 from datadoc.frontend.callbacks.utils import find_existing_language_string
@@ -28,23 +30,34 @@ from datadoc.frontend.callbacks.variables import (
     set_variables_values_inherit_dataset_values,
 )
 from datadoc.frontend.components.builders import AlertTypes
+from datadoc.frontend.components.builders import build_dataset_edit_section
+from datadoc.frontend.components.builders import build_dataset_machine_section
+from datadoc.frontend.components.builders import build_link_object
 from datadoc.frontend.components.builders import build_ssb_alert
-from datadoc.frontend.constants import INVALID_DATE_ORDER
 from datadoc.frontend.constants import INVALID_VALUE
-from datadoc.frontend.fields.display_dataset import DISPLAY_DATASET
 from datadoc.frontend.fields.display_dataset import (
     DROPDOWN_DATASET_METADATA_IDENTIFIERS,
 )
+from datadoc.frontend.fields.display_dataset import EDITABLE_DATASET_METADATA_LEFT
+from datadoc.frontend.fields.display_dataset import EDITABLE_DATASET_METADATA_RIGHT
 from datadoc.frontend.fields.display_dataset import (
     MULTIPLE_LANGUAGE_DATASET_IDENTIFIERS,
 )
+from datadoc.frontend.fields.display_dataset import NON_EDITABLE_DATASET_METADATA
 from datadoc.frontend.fields.display_dataset import TIMEZONE_AWARE_METADATA_IDENTIFIERS
 from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+from datadoc.frontend.fields.display_variables import VARIABLES_EXTERNAL_SOURCES
+from datadoc.logging_configuration.edit_log import record_dataset_edit
 from datadoc.utils import METADATA_DOCUMENT_FILE_SUFFIX
+from datadoc.validation.completeness import CompletenessTracker
+from datadoc.validation.engine import DATASET_DATE_ORDER_RULE
+from datadoc.validation.engine import ValidationEngine
+from datadoc.validation.engine import get_default_rules
 
 if TYPE_CHECKING:
     import dash_bootstrap_components as dbc
     from dapla_metadata.datasets import model
+    from dash import html
 
 logger = logging.getLogger(__name__)
 
@@ -73,11 +86,18 @@ def open_dataset_handling(
     dataset_opened_counter: int,
 ) -> tuple[dbc.Alert, int]:
     """Handle errors and other logic around opening a dataset file."""
+    # The variables workspace is likely to be opened next
+    prefetch_external_sources(*VARIABLES_EXTERNAL_SOURCES)
     if file_path:
         file_path = file_path.strip()
     try:
         state.metadata = open_file(file_path)
         set_variables_values_inherit_dataset_derived_date_values()
+        state.completeness = CompletenessTracker(state.metadata)
+        state.validation = ValidationEngine(
+            get_default_rules(state.short_name_validator),
+            state.metadata,
+        )
     except FileNotFoundError:
         logger.exception("File %s not found", str(file_path))
         return (
@@ -102,12 +122,17 @@ def open_dataset_handling(
     if n_clicks and n_clicks > 0:
         dapla_dataset_path_info = DaplaDatasetPathInfo(file_path)
         if not dapla_dataset_path_info.path_complies_with_naming_standard():
+            naming_standard_url = config.get_config().dapla_manual_naming_standard_url
             return (
                 build_ssb_alert(
                     AlertTypes.WARNING,
                     "Filen følger ikke navnestandard",
                     message="Vennligst se mer informasjon her:",
-                    link=config.get_dapla_manual_naming_standard_url(),
+                    link=(
+                        build_link_object(DAPLA_MANUAL_TEXT, naming_standard_url)
+                        if naming_standard_url
+                        else None
+                    ),
                 ),
                 dataset_opened_counter,
             )
@@ -120,6 +145,35 @@ def open_dataset_handling(
     )
 
 
+def populate_dataset_workspace(
+    dataset: model.Dataset,
+    dataset_opened_counter: int,
+) -> list[html.Section]:
+    """Create dataset workspace with sections."""
+    return [
+        build_dataset_edit_section(
+            [
+                EDITABLE_DATASET_METADATA_LEFT,
+                EDITABLE_DATASET_METADATA_RIGHT,
+            ],
+            dataset,
+            {
+                "type": "dataset-edit-section",
+                "id": f"obligatory-{dataset_opened_counter}",
+            },
+        ),
+        build_dataset_machine_section(
+            "Maskingenerert",
+            NON_EDITABLE_DATASET_METADATA,
+            dataset,
+            {
+                "type": "dataset-machine-section",
+                "id": f"machine-{dataset_opened_counter}",
+            },
+        ),
+    ]
+
+
 def process_keyword(value: str) -> list[str]:
     """Convert a comma separated string to a list of strings.
 
@@ -199,6 +253,8 @@ def accept_dataset_metadata_input(
             metadata_identifier,
             value,
         )
+        state.completeness.update_dataset_field(metadata_identifier, value)
+        state.validation.update_dataset_field(metadata_identifier)
         set_variables_values_inherit_dataset_values(value, metadata_identifier)
     except ValueError:
         show_error = True
@@ -207,7 +263,8 @@ def accept_dataset_metadata_input(
     else:
         show_error = False
         error_explanation = ""
-        logger.info(
+        record_dataset_edit(metadata_identifier)
+        logger.debug(
             "Updated dataset %s with value %s",
             metadata_identifier,
             value,
@@ -245,6 +302,15 @@ def accept_dataset_metadata_date_input(
             state.metadata.dataset.contains_data_from = parsed_contains_data_from
         if parsed_contains_data_until:
             state.metadata.dataset.contains_data_until = parsed_contains_data_until
+        for identifier in (
+            DatasetIdentifiers.CONTAINS_DATA_FROM,
+            DatasetIdentifiers.CONTAINS_DATA_UNTIL,
+        ):
+            state.completeness.update_dataset_field(
+                identifier.value,
+                getattr(state.metadata.dataset, identifier.value),
+            )
+            state.validation.update_dataset_field(identifier.value)
     except ValueError as e:
         logger.exception(
             "Validation failed for %s, %s, %s: %s, %s",
@@ -256,6 +322,10 @@ def accept_dataset_metadata_date_input(
         )
         message = str(e)
     else:
+        if parsed_contains_data_from:
+            record_dataset_edit(DatasetIdentifiers.CONTAINS_DATA_FROM.value)
+        if parsed_contains_data_until:
+            record_dataset_edit(DatasetIdentifiers.CONTAINS_DATA_UNTIL.value)
         logger.debug(
             "Successfully updated %s, %s, %s: %s, %s",
             dataset_identifier,
@@ -270,17 +340,7 @@ def accept_dataset_metadata_date_input(
         # No error to display.
         return no_error + no_error
 
-    error = (
-        True,
-        INVALID_DATE_ORDER.format(
-            contains_data_from_display_name=DISPLAY_DATASET[
-                DatasetIdentifiers.CONTAINS_DATA_FROM
-            ].display_name,
-            contains_data_until_display_name=DISPLAY_DATASET[
-                DatasetIdentifiers.CONTAINS_DATA_UNTIL
-            ].display_name,
-        ),
-    )
+    error = (True, DATASET_DATE_ORDER_RULE.message)
     return (
         error + no_error
         if dataset_identifier == DatasetIdentifiers.CONTAINS_DATA_FROM
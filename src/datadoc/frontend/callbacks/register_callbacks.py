@@ -8,10 +8,12 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from dash import ALL
 from dash import MATCH
 from dash import Dash
 from dash import Input
 from dash import Output
+from dash import Patch
 from dash import State
 from dash import ctx
 from dash import html
@@ -21,15 +23,30 @@ from datadoc import state
 from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_date_input
 from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_input
 from datadoc.frontend.callbacks.dataset import open_dataset_handling
+from datadoc.frontend.callbacks.dataset import populate_dataset_workspace
+from datadoc.frontend.callbacks.utils import check_external_sources_loaded
 from datadoc.frontend.callbacks.utils import render_tabs
 from datadoc.frontend.callbacks.utils import save_metadata_and_generate_alerts
+from datadoc.frontend.callbacks.utils import sends_metadata_version
+from datadoc.frontend.callbacks.utils import show_more_missing_variables
+from datadoc.frontend.callbacks.utils import update_completeness_indicators
 from datadoc.frontend.callbacks.variables import accept_variable_metadata_date_input
 from datadoc.frontend.callbacks.variables import accept_variable_metadata_input
 from datadoc.frontend.callbacks.variables import populate_variables_workspace
-from datadoc.frontend.components.builders import build_dataset_edit_section
-from datadoc.frontend.components.builders import build_dataset_machine_section
 from datadoc.frontend.components.identifiers import ACCORDION_WRAPPER_ID
+from datadoc.frontend.components.identifiers import (
+    COMPLETENESS_DISPLAYED_VERSION_STORE_ID,
+)
+from datadoc.frontend.components.identifiers import COMPLETENESS_PROGRESS_ID
+from datadoc.frontend.components.identifiers import COMPLETENESS_VERSION_STORE_ID
+from datadoc.frontend.components.identifiers import EXTERNAL_SOURCES_INTERVAL_ID
+from datadoc.frontend.components.identifiers import EXTERNAL_SOURCES_LOADED_STORE_ID
+from datadoc.frontend.components.identifiers import JUMP_TO_VARIABLE_STORE_ID
+from datadoc.frontend.components.identifiers import LOADING_OPTIONS_SHOWN_STORE
+from datadoc.frontend.components.identifiers import MISSING_VARIABLES_LIST_ID
+from datadoc.frontend.components.identifiers import MISSING_VARIABLES_SHOW_MORE_ID
 from datadoc.frontend.components.identifiers import SECTION_WRAPPER_ID
+from datadoc.frontend.components.identifiers import VARIABLE_JUMP_LINK
 from datadoc.frontend.components.identifiers import VARIABLES_INFORMATION_ID
 from datadoc.frontend.fields.display_base import DATASET_METADATA_DATE_INPUT
 from datadoc.frontend.fields.display_base import DATASET_METADATA_INPUT
@@ -37,9 +54,7 @@ from datadoc.frontend.fields.display_base import DATASET_METADATA_MULTILANGUAGE_
 from datadoc.frontend.fields.display_base import VARIABLES_METADATA_DATE_INPUT
 from datadoc.frontend.fields.display_base import VARIABLES_METADATA_INPUT
 from datadoc.frontend.fields.display_base import VARIABLES_METADATA_MULTILANGUAGE_INPUT
-from datadoc.frontend.fields.display_dataset import EDITABLE_DATASET_METADATA_LEFT
-from datadoc.frontend.fields.display_dataset import EDITABLE_DATASET_METADATA_RIGHT
-from datadoc.frontend.fields.display_dataset import NON_EDITABLE_DATASET_METADATA
+from datadoc.frontend.fields.display_base import track_loading_options
 from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
 from datadoc.frontend.fields.display_variables import VariableIdentifiers
 
@@ -76,6 +91,62 @@ def register_callbacks(app: Dash) -> None:
 
         return no_update
 
+    @app.callback(
+        Output(MISSING_VARIABLES_LIST_ID, "children"),
+        Output(MISSING_VARIABLES_SHOW_MORE_ID, "disabled"),
+        Input(MISSING_VARIABLES_SHOW_MORE_ID, "n_clicks"),
+        prevent_initial_call=True,
+    )
+    def callback_show_more_missing_variables(
+        n_clicks: int,
+    ) -> tuple[Patch, bool]:
+        """Append the next page of variables to the missing metadata alert."""
+        if not n_clicks:
+            return no_update, no_update
+        return show_more_missing_variables(
+            state.missing_variables_fields,
+            n_clicks,
+        )
+
+    @app.callback(
+        Output("tabs", "value"),
+        Output(JUMP_TO_VARIABLE_STORE_ID, "data"),
+        Input({"type": VARIABLE_JUMP_LINK, "variable_short_name": ALL}, "n_clicks"),
+        prevent_initial_call=True,
+    )
+    def callback_jump_to_variable(
+        n_clicks: list[int],  # noqa: ARG001 argument required by Dash
+    ) -> tuple[str, str]:
+        """Open the variables tab and request a scroll to the clicked variable."""
+        if not ctx.triggered_id or not ctx.triggered[0]["value"]:
+            # Links being added to the page also trigger this callback
+            return no_update, no_update
+        return "variables", ctx.triggered_id["variable_short_name"]
+
+    app.clientside_callback(
+        """
+        function(children, shortName) {
+            if (!shortName) {
+                return window.dash_clientside.no_update;
+            }
+            const selector = '[id$=\'"type":"variables-accordion"}\']';
+            for (const element of document.querySelectorAll(selector)) {
+                const id = JSON.parse(element.id).id;
+                if (id.slice(0, id.lastIndexOf("-")) === shortName) {
+                    element.scrollIntoView({behavior: "smooth", block: "start"});
+                    return null;
+                }
+            }
+            // Not rendered yet, try again when the accordions are populated
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output(JUMP_TO_VARIABLE_STORE_ID, "data", allow_duplicate=True),
+        Input(ACCORDION_WRAPPER_ID, "children"),
+        Input(JUMP_TO_VARIABLE_STORE_ID, "data"),
+        prevent_initial_call=True,
+    )
+
     @app.callback(
         Output(
             {"type": DATASET_METADATA_INPUT, "id": MATCH},
@@ -91,6 +162,7 @@ def register_callbacks(app: Dash) -> None:
         ),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_accept_dataset_metadata_input(
         value: MetadataInputTypes,  # noqa: ARG001 argument required by Dash
     ) -> tuple[bool, str]:
@@ -130,6 +202,7 @@ def register_callbacks(app: Dash) -> None:
         ),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_accept_dataset_metadata_multilanguage_input(
         value: MetadataInputTypes,  # noqa: ARG001 argument required by Dash
     ) -> tuple[bool, str]:
@@ -152,6 +225,7 @@ def register_callbacks(app: Dash) -> None:
         State("dataset-opened-counter", "data"),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_open_dataset(
         n_clicks: int,
         dataset_path: str,
@@ -187,57 +261,90 @@ def register_callbacks(app: Dash) -> None:
 
         return "Åpne et datasett for å liste variablene."
 
+    @app.callback(
+        Output(EXTERNAL_SOURCES_LOADED_STORE_ID, "data"),
+        Output(EXTERNAL_SOURCES_INTERVAL_ID, "disabled"),
+        Input(EXTERNAL_SOURCES_INTERVAL_ID, "n_intervals"),
+        # An Input rather than State, so a render which finishes after
+        # polling stopped still gets hydrated
+        Input({"type": LOADING_OPTIONS_SHOWN_STORE, "workspace": ALL}, "data"),
+        State(EXTERNAL_SOURCES_LOADED_STORE_ID, "data"),
+    )
+    def callback_check_external_sources_loaded(
+        n_intervals: int,  # noqa: ARG001 Dash requires arguments for all Inputs
+        loading_options_shown: list[bool | None],
+        hydrations: int,
+    ) -> tuple:
+        """Hydrate the dropdowns once the external sources have loaded."""
+        hydrate, loaded = check_external_sources_loaded(loading_options_shown)
+        if not loaded:
+            return no_update, no_update
+        # A count, so every hydration changes the store and triggers the workspaces
+        return (hydrations + 1 if hydrate else no_update), True
+
     @app.callback(
         Output(ACCORDION_WRAPPER_ID, "children"),
+        Output({"type": LOADING_OPTIONS_SHOWN_STORE, "workspace": "variables"}, "data"),
         Input("dataset-opened-counter", "data"),
         Input("search-variables", "value"),
+        Input(EXTERNAL_SOURCES_LOADED_STORE_ID, "data"),
     )
     def callback_populate_variables_workspace(
         dataset_opened_counter: int,  # Dash requires arguments for all Inputs
         search_query: str,
-    ) -> list:
+        external_sources_hydrations: int,  # noqa: ARG001 Dash requires arguments for all Inputs
+    ) -> tuple[list, bool]:
         """Create variable workspace with accordions for variables.
 
         Allows for filtering which variables are displayed via the search box.
         """
         logger.debug("Populating variables workspace. Search query: %s", search_query)
-        return populate_variables_workspace(
-            state.metadata.variables,
-            search_query,
-            dataset_opened_counter,
+        return track_loading_options(
+            lambda: populate_variables_workspace(
+                state.metadata.variables,
+                search_query,
+                dataset_opened_counter,
+            ),
+        )
+
+    @app.callback(
+        Output(COMPLETENESS_PROGRESS_ID, "value"),
+        Output(COMPLETENESS_PROGRESS_ID, "label"),
+        Output({"type": "variables-accordion", "id": ALL}, "subHeader"),
+        Output(COMPLETENESS_DISPLAYED_VERSION_STORE_ID, "data"),
+        Input(COMPLETENESS_VERSION_STORE_ID, "data"),
+        State(COMPLETENESS_DISPLAYED_VERSION_STORE_ID, "data"),
+    )
+    def callback_update_completeness(
+        completeness_version: int,  # noqa: ARG001 Dash requires arguments for all Inputs
+        displayed_version: int | None,
+    ) -> tuple:
+        """Show how much of the obligatory metadata is filled in."""
+        return update_completeness_indicators(
+            state.completeness,
+            state.validation,
+            displayed_version,
+            [output["id"] for output in ctx.outputs_list[2]],
         )
 
     @app.callback(
         Output(SECTION_WRAPPER_ID, "children"),
+        Output({"type": LOADING_OPTIONS_SHOWN_STORE, "workspace": "dataset"}, "data"),
         Input("dataset-opened-counter", "data"),
+        Input(EXTERNAL_SOURCES_LOADED_STORE_ID, "data"),
     )
     def callback_populate_dataset_workspace(
         dataset_opened_counter: int,  # Dash requires arguments for all Inputs
-    ) -> list:
+        external_sources_hydrations: int,  # noqa: ARG001 Dash requires arguments for all Inputs
+    ) -> tuple[list, bool]:
         """Create dataset workspace with sections."""
         logger.debug("Populating dataset workspace")
-        return [
-            build_dataset_edit_section(
-                [
-                    EDITABLE_DATASET_METADATA_LEFT,
-                    EDITABLE_DATASET_METADATA_RIGHT,
-                ],
+        return track_loading_options(
+            lambda: populate_dataset_workspace(
                 state.metadata.dataset,
-                {
-                    "type": "dataset-edit-section",
-                    "id": f"obligatory-{dataset_opened_counter}",
-                },
+                dataset_opened_counter,
             ),
-            build_dataset_machine_section(
-                "Maskingenerert",
-                NON_EDITABLE_DATASET_METADATA,
-                state.metadata.dataset,
-                {
-                    "type": "dataset-machine-section",
-                    "id": f"machine-{dataset_opened_counter}",
-                },
-            ),
-        ]
+        )
 
     @app.callback(
         Output(
@@ -266,6 +373,7 @@ def register_callbacks(app: Dash) -> None:
         ),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_accept_variable_metadata_input(
         value: MetadataInputTypes,  # noqa: ARG001 argument required by Dash
     ) -> dbc.Alert:
@@ -311,6 +419,7 @@ def register_callbacks(app: Dash) -> None:
         ),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_accept_variable_metadata_multilanguage_input(
         value: MetadataInputTypes,  # noqa: ARG001 argument required by Dash
     ) -> dbc.Alert:
@@ -378,6 +487,7 @@ def register_callbacks(app: Dash) -> None:
         ),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_accept_variable_metadata_date_input(
         contains_data_from: str,
         contains_data_until: str,
@@ -435,6 +545,7 @@ def register_callbacks(app: Dash) -> None:
         ),
         prevent_initial_call=True,
     )
+    @sends_metadata_version
     def callback_accept_dataset_metadata_date_input(
         contains_data_from: str,
         contains_data_until: str,
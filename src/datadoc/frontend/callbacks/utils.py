@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import datetime
-import json
+import functools
+import itertools
 import logging
-import re
 import warnings
+from collections import Counter
 from typing import TYPE_CHECKING
 from typing import TypeAlias
+from typing import TypeVar
 
 import arrow
 import ssb_dash_components as ssb
@@ -16,38 +18,63 @@ from dapla_metadata.datasets import Datadoc
 from dapla_metadata.datasets import ObligatoryDatasetWarning
 from dapla_metadata.datasets import ObligatoryVariableWarning
 from dapla_metadata.datasets import model
+from dash import Patch
 from dash import html
+from dash import no_update
+from dash import set_props
 
 from datadoc import config
 from datadoc import state
 from datadoc.constants import CHECK_OBLIGATORY_METADATA_DATASET_MESSAGE
 from datadoc.constants import CHECK_OBLIGATORY_METADATA_VARIABLES_MESSAGE
+from datadoc.constants import CHECK_OBLIGATORY_METADATA_VARIABLES_SUMMARY_MESSAGE
 from datadoc.constants import ILLEGAL_SHORTNAME_WARNING
 from datadoc.constants import ILLEGAL_SHORTNAME_WARNING_MESSAGE
+from datadoc.constants import INVALID_METADATA_WARNING
+from datadoc.constants import INVALID_METADATA_WARNING_MESSAGE
 from datadoc.constants import MISSING_METADATA_WARNING
+from datadoc.constants import SHOW_MORE_VARIABLES_TEXT
+from datadoc.external_sources.loader import external_sources_loaded
 from datadoc.frontend.components.builders import AlertTypes
 from datadoc.frontend.components.builders import build_ssb_alert
+from datadoc.frontend.components.builders import build_ssb_summary_alert
+from datadoc.frontend.components.builders import build_variable_jump_link
 from datadoc.frontend.components.identifiers import ACCORDION_WRAPPER_ID
+from datadoc.frontend.components.identifiers import COMPLETENESS_VERSION_STORE_ID
 from datadoc.frontend.components.identifiers import SECTION_WRAPPER_ID
 from datadoc.frontend.components.identifiers import VARIABLES_INFORMATION_ID
+from datadoc.frontend.constants import MISSING_OBLIGATORY_FIELDS
 from datadoc.frontend.fields.display_dataset import (
     OBLIGATORY_DATASET_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
 )
 from datadoc.frontend.fields.display_variables import (
     OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
 )
+from datadoc.frontend.fields.display_variables import VariableIdentifiers
+from datadoc.validation.engine import date_order_is_valid
 
 if TYPE_CHECKING:
     import pathlib
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Sequence
 
     import dash_bootstrap_components as dbc
     import pydantic
     from cloudpathlib import CloudPath
 
+    from datadoc.validation.completeness import CompletenessTracker
+    from datadoc.validation.engine import ValidationEngine
+
 
 logger = logging.getLogger(__name__)
 
 
+# Variables listed per page in a summarized missing metadata alert
+MISSING_VARIABLES_PAGE_SIZE = 10
+
+T = TypeVar("T")
+
 MetadataInputTypes: TypeAlias = (
     str | list[str] | int | float | bool | datetime.date | None
 )
@@ -133,7 +160,7 @@ def get_dataset_path() -> pathlib.Path | CloudPath | str:
     """Extract the path to the dataset from the potential sources."""
     if state.metadata.dataset_path is not None:
         return state.metadata.dataset_path
-    path_from_env = config.get_datadoc_dataset_path()
+    path_from_env = config.get_config().datadoc_dataset_path
     if path_from_env:
         logger.info(
             "Dataset path from env var: '%s'",
@@ -193,14 +220,15 @@ def parse_and_validate_dates(
     except arrow.parser.ParserError as e:
         raise ValueError(VALIDATION_ERROR + str(e)) from e
 
-    if parsed_start and parsed_end and (parsed_start > parsed_end):
-        raise ValueError(DATE_VALIDATION_MESSAGE)
-
     start_output = (
         parsed_start.astimezone(tz=datetime.timezone.utc) if parsed_start else None
     )
     end_output = parsed_end.astimezone(tz=datetime.timezone.utc) if parsed_end else None
 
+    # The same check as the date order rules in the validation engine
+    if not date_order_is_valid(start_output, end_output):
+        raise ValueError(DATE_VALIDATION_MESSAGE)
+
     return start_output, end_output
 
 
@@ -248,21 +276,146 @@ def render_tabs(tab: str) -> html.Article | None:
     return None
 
 
-def _has_exact_word(word: str, text: str) -> bool:
-    """Return True if excact word matches text."""
-    return bool(re.search(rf"\b{word}\b", text))
+def check_external_sources_loaded(
+    loading_options_shown: Iterable[bool | None],
+) -> tuple[bool, bool]:
+    """Find out whether the workspaces must be rendered again with loaded dropdown options.
+
+    Dropdowns rendered before their external source finished loading only
+    have a placeholder option. Once every source has loaded, and only if a
+    placeholder was shown, the workspaces are rendered again.
+
+    Args:
+        loading_options_shown: For each workspace in the session, whether
+            its last render showed a placeholder.
+
+    Returns:
+        Whether to render the workspaces again, and whether polling can stop.
+    """
+    if not external_sources_loaded():
+        return False, False
+    return any(loading_options_shown), True
+
+
+def get_missing_obligatory_fields_text(num_missing: int) -> str:
+    """Describe how many obligatory fields a variable is missing.
+
+    Examples:
+    >>> get_missing_obligatory_fields_text(0)
+    ''
+    >>> get_missing_obligatory_fields_text(2)
+    'Mangler 2 obligatoriske felt'
+    """
+    if num_missing == 0:
+        return ""
+    return MISSING_OBLIGATORY_FIELDS.format(count=num_missing)
+
+
+def get_variable_sub_header(badges: list[str], num_missing: int) -> str:
+    """Build the accordion sub header for a variable.
+
+    Examples:
+    >>> get_variable_sub_header([], 0)
+    ''
+    >>> get_variable_sub_header(["Følger ikke navnestandard"], 2)
+    'Følger ikke navnestandard · Mangler 2 obligatoriske felt'
+    """
+    parts = [*badges, get_missing_obligatory_fields_text(num_missing)]
+    return " · ".join(p for p in parts if p)
+
+
+def get_metadata_version(
+    tracker: CompletenessTracker,
+    engine: ValidationEngine,
+) -> int:
+    """Get a version number which changes whenever the completeness or validity of the metadata does."""
+    return max(tracker.version, engine.version)
+
+
+def sends_metadata_version(callback: Callable[..., T]) -> Callable[..., T]:
+    """Send the version of the open metadata to the browser after the callback has run.
+
+    Used on the callbacks which change the metadata, so the completeness
+    indicators are updated after an edit instead of by polling the server.
+    """
+
+    @functools.wraps(callback)
+    def wrapper(*args: object, **kwargs: object) -> T:
+        result = callback(*args, **kwargs)
+        set_props(
+            COMPLETENESS_VERSION_STORE_ID,
+            {"data": get_metadata_version(state.completeness, state.validation)},
+        )
+        return result
+
+    return wrapper
+
+
+def update_completeness_indicators(
+    tracker: CompletenessTracker,
+    engine: ValidationEngine,
+    last_version: int | None,
+    accordion_ids: list[dict],
+) -> tuple:
+    """Update the progress bar and the variable accordions from the completeness tracker.
+
+    Only called once `sends_metadata_version` has sent a new version, since
+    the browser sends the IDs of every accordion displayed. Nothing is sent back unless
+    the tracker or the validation engine has changed since `last_version`,
+    and only accordions for variables which have changed are updated.
+
+    Args:
+        tracker: The completeness tracker for the open dataset.
+        engine: The validation engine for the open dataset, which supplies
+            the badges for the variables.
+        last_version: The version last displayed in the browser.
+        accordion_ids: The IDs of the variable accordions currently displayed.
+
+    Returns:
+        The progress bar value and label, sub headers for the accordions and
+        the tracker version now displayed.
+    """
+    version = get_metadata_version(tracker, engine)
+    if version == last_version:
+        return no_update, no_update, no_update, no_update
+
+    sub_headers = []
+    for accordion_id in accordion_ids:
+        # The accordion ID is on the form "<short_name>-<dataset_opened_counter>"
+        short_name = accordion_id["id"].rsplit("-", 1)[0]
+        if tracker.variable_changed_since(
+            short_name,
+            last_version or 0,
+        ) or engine.variable_changed_since(short_name, last_version or 0):
+            sub_headers.append(
+                get_variable_sub_header(
+                    [v.message for v in engine.get_variable_violations(short_name)],
+                    tracker.num_missing_variable_fields(short_name),
+                ),
+            )
+        else:
+            sub_headers.append(no_update)
+
+    percent_complete = tracker.percent_complete
+    return percent_complete, f"{percent_complete} %", sub_headers, version
 
 
-def dataset_control(error_message: str | None) -> dbc.Alert | None:
+DATASET_DISPLAY_NAMES: dict[str, str] = dict(
+    OBLIGATORY_DATASET_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
+)
+VARIABLES_DISPLAY_NAMES: dict[str, str] = dict(
+    OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
+)
+
+
+def dataset_control(missing_fields: list[str]) -> dbc.Alert | None:
     """Check obligatory metadata values for dataset.
 
     Args:
-        error_message(str): A message generated by ObligatoryDatasetWarning containing names of fields missing value.
+        missing_fields: The identifiers of obligatory dataset fields missing a value.
     """
     missing_metadata = [
-        f[1]
-        for f in OBLIGATORY_DATASET_METADATA_IDENTIFIERS_AND_DISPLAY_NAME
-        if (error_message and _has_exact_word(f[0], error_message))
+        DATASET_DISPLAY_NAMES[f] for f in missing_fields if f in DATASET_DISPLAY_NAMES
     ]
     if not missing_metadata:
         return None
@@ -275,86 +428,70 @@ def dataset_control(error_message: str | None) -> dbc.Alert | None:
     )
 
 
-def _parse_error_message(message: str) -> list | None:
-    """Parse a string containing an error message into Python objects.
-
-    This function processes an error message by removing predefined text and
-    attempting to parse the remaining string into a list of Python objects.
-
-    Args:
-        message (str): The error message string to be parsed.
-
-    Returns:
-        A list of parsed objects if the string can be successfully parsed.
-        returns None if the string is empty after processing and a empty list
-        if the string cannot be parsed into JSON.
-    """
-    parsed_string = message.replace("Obligatory metadata is missing: ", "").strip()
-    parsed_string = parsed_string.replace("'", '"')
-    if not parsed_string:
-        return None
-    try:
-        # Attempt to parse the JSON string
-        return json.loads(parsed_string)
-    except json.JSONDecodeError:
-        logger.exception("Error parsing JSON {e}")
-        return []
-
+def _format_missing_variable_fields(fields: list[str]) -> str:
+    """Join the display names of the given obligatory variable fields."""
+    return ", ".join(
+        VARIABLES_DISPLAY_NAMES[f] for f in fields if f in VARIABLES_DISPLAY_NAMES
+    )
 
-def _get_dict_by_key(
-    metadata_list: list[dict[str, list[str]]],
-    key: str,
-) -> dict[str, list[str]] | None:
-    """Return the first dictionary containing the specified key.
 
-    This function searches through a list of dictionaries and returns the first
-    dictionary that contains the specified key.
+def build_missing_variables_items(
+    missing_fields: Iterable[tuple[str, list[str]]],
+) -> list[list]:
+    """Build alert list items, with a link to each variable, for missing variable fields.
 
     Args:
-        metadata_list: A list of dictionaries to search.
-        key: The key to search for in each dictionary.
-
-    Returns:
-        The first dictionary containing the specified key,
-        or None if no such dictionary is found.
-
+        missing_fields: Pairs of variable short name and the identifiers of the
+            obligatory fields it is missing.
     """
-    return next((item for item in metadata_list if key in item), None)
+    return [
+        [
+            build_variable_jump_link(short_name, short_name),
+            f": {_format_missing_variable_fields(fields)}",
+        ]
+        for short_name, fields in missing_fields
+    ]
 
 
-def variables_control(error_message: str | None, variables: list) -> dbc.Alert | None:
+def variables_control(missing_fields: dict[str, list[str]]) -> dbc.Alert | None:
     """Check obligatory metadata for variables and return an alert if any metadata is missing.
 
-    This function parses an error message to identify missing obligatory metadata
-    fields for variables. If missing metadata is found, it generates an alert.
+    When more than `MISSING_VARIABLES_PAGE_SIZE` variables are missing metadata
+    the alert is summarized: it counts the variables missing each field and only
+    lists the first page of variables. Further pages are loaded on demand, see
+    `show_more_missing_variables`.
 
     Args:
-        error_message: A message generated by ObligatoryVariableWarning
-            containing the variable short name and a list of field names with missing values.
-        variables: list of datadoc variables
+        missing_fields: The identifiers of obligatory fields missing a value,
+            keyed by variable short name.
 
     Returns:
         An alert object if there are missing metadata fields, otherwise None.
     """
-    missing_metadata: list = []
-    error_message_parsed = _parse_error_message(str(error_message))
-    # for variable in state.metadata.variables:
-    for variable in variables:
-        if error_message_parsed:
-            fields_by_variable = _get_dict_by_key(
-                error_message_parsed,
-                variable.short_name,
-            )
-            if fields_by_variable is not None:
-                missing_metadata_field = [
-                    f[1]
-                    for f in OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS_AND_DISPLAY_NAME
-                    if error_message and f[0] in fields_by_variable[variable.short_name]
-                ]
-                missing_metadata_fields_to_string = ", ".join(missing_metadata_field)
-                missing_metadata.append(
-                    f"{variable.short_name}: {missing_metadata_fields_to_string}",
-                )
+    if len(missing_fields) > MISSING_VARIABLES_PAGE_SIZE:
+        field_counts = Counter(f for fields in missing_fields.values() for f in fields)
+        return build_ssb_summary_alert(
+            AlertTypes.WARNING,
+            MISSING_METADATA_WARNING,
+            message=CHECK_OBLIGATORY_METADATA_VARIABLES_SUMMARY_MESSAGE.format(
+                num_variables=len(missing_fields),
+            ),
+            summary_list=[
+                f"{display_name}: {field_counts[identifier]}"
+                for identifier, display_name in VARIABLES_DISPLAY_NAMES.items()
+                if field_counts[identifier]
+            ],
+            alert_list=build_missing_variables_items(
+                itertools.islice(missing_fields.items(), MISSING_VARIABLES_PAGE_SIZE),
+            ),
+            show_more_text=SHOW_MORE_VARIABLES_TEXT,
+        )
+
+    missing_metadata = []
+    for short_name, fields in missing_fields.items():
+        display_names = _format_missing_variable_fields(fields)
+        if display_names:
+            missing_metadata.append(f"{short_name}: {display_names}")
     if not missing_metadata:
         return None
     return build_ssb_alert(
@@ -366,19 +503,48 @@ def variables_control(error_message: str | None, variables: list) -> dbc.Alert |
     )
 
 
-def check_variable_names(
-    variables: list,
-) -> dbc.Alert | None:
+def show_more_missing_variables(
+    missing_fields: Sequence[tuple[str, list[str]]],
+    page: int,
+) -> tuple[Patch, bool]:
+    """Get the next page of variables for a summarized missing metadata alert.
+
+    Only the requested page is built, and it is appended to the list already
+    displayed, so each click sends one page rather than the whole list.
+
+    Args:
+        missing_fields: Pairs of variable short name and the identifiers of the
+            obligatory fields it is missing, as listed when the alert was built.
+        page: The page to get. Page 0 is displayed when the alert is built.
+
+    Returns:
+        A patch appending the page to the alert list, and whether the
+        'show more' button should be disabled because there are no more pages.
+    """
+    start = page * MISSING_VARIABLES_PAGE_SIZE
+    end = start + MISSING_VARIABLES_PAGE_SIZE
+    patched_list = Patch()
+    for item in build_missing_variables_items(missing_fields[start:end]):
+        patched_list.append(html.Li(item, className="alert_list_item"))
+    return patched_list, end >= len(missing_fields)
+
+
+def check_variable_names(engine: ValidationEngine) -> dbc.Alert | None:
     """Checks if a variable shortname complies with the naming standard.
 
+    The violations of the short name rules are read from the validation engine.
+
     Returns:
         An ssb alert with a message saying that what names dont comply with the naming standard.
     """
-    illegal_names: list = [
-        v.short_name
-        for v in variables
-        if not re.match(r"^[a-z0-9_]{3,}$", v.short_name)
-    ]
+    illegal_names = list(
+        dict.fromkeys(
+            v.short_name
+            for v in engine.violations
+            if v.short_name is not None
+            and VariableIdentifiers.SHORT_NAME.value in v.rule.depends_on
+        ),
+    )
 
     if not illegal_names:
         return None
@@ -391,15 +557,40 @@ def check_variable_names(
     )
 
 
+def validation_control(engine: ValidationEngine) -> dbc.Alert | None:
+    """Return an alert listing the violated validation rules which aren't about short names.
+
+    Short names are reported separately, see `check_variable_names`.
+    """
+    invalid_metadata = [
+        f"{v.short_name}: {v.message}" if v.short_name is not None else v.message
+        for v in engine.violations
+        if VariableIdentifiers.SHORT_NAME.value not in v.rule.depends_on
+    ]
+    if not invalid_metadata:
+        return None
+    return build_ssb_alert(
+        AlertTypes.WARNING,
+        INVALID_METADATA_WARNING,
+        INVALID_METADATA_WARNING_MESSAGE,
+        None,
+        invalid_metadata,
+    )
+
+
 def save_metadata_and_generate_alerts(metadata: Datadoc) -> list:
     """Save the metadata document to disk and check obligatory metadata.
 
+    The missing obligatory metadata and the violated validation rules are
+    read from the completeness tracker and the validation engine, which are
+    kept up to date as the metadata is edited.
+
     Returns:
         List of alerts including obligatory metadata warnings if missing,
         and success alert if metadata is saved correctly.
     """
-    missing_obligatory_dataset = ""
-    missing_obligatory_variables = ""
+    missing_obligatory_dataset: list[str] = []
+    missing_obligatory_variables: dict[str, list[str]] = {}
 
     with warnings.catch_warnings(record=True) as w:
         warnings.simplefilter("always")
@@ -409,12 +600,16 @@ def save_metadata_and_generate_alerts(metadata: Datadoc) -> list:
                 AlertTypes.SUCCESS,
                 "Lagret metadata",
             )
+            missing_obligatory_dataset = state.completeness.get_missing_dataset_fields()
+            missing_obligatory_variables = dict(
+                state.completeness.iter_missing_variables_fields(),
+            )
             for warning in w:
-                if issubclass(warning.category, ObligatoryDatasetWarning):
-                    missing_obligatory_dataset = str(warning.message)
-                elif issubclass(warning.category, ObligatoryVariableWarning):
-                    missing_obligatory_variables = str(warning.message)
-                else:
+                # Obligatory metadata is tracked as it is edited, see above
+                if not issubclass(
+                    warning.category,
+                    (ObligatoryDatasetWarning, ObligatoryVariableWarning),
+                ):
                     logger.warning(
                         "An unexpected warning was caught: %s",
                         warning.message,
@@ -432,9 +627,12 @@ def save_metadata_and_generate_alerts(metadata: Datadoc) -> list:
                 "Kunne ikke lagre metadata",
             )
 
+    # Further pages of the alert are taken from this list, see `show_more_missing_variables`
+    state.missing_variables_fields = list(missing_obligatory_variables.items())
     return [
         success_alert,
         dataset_control(missing_obligatory_dataset),
-        variables_control(missing_obligatory_variables, metadata.variables),
-        check_variable_names(metadata.variables),
+        variables_control(missing_obligatory_variables),
+        validation_control(state.validation),
+        check_variable_names(state.validation),
     ]
@@ -9,13 +9,12 @@ from typing import TYPE_CHECKING
 from datadoc import state
 from datadoc.frontend.callbacks.utils import MetadataInputTypes
 from datadoc.frontend.callbacks.utils import find_existing_language_string
+from datadoc.frontend.callbacks.utils import get_variable_sub_header
 from datadoc.frontend.callbacks.utils import parse_and_validate_dates
 from datadoc.frontend.components.builders import build_edit_section
 from datadoc.frontend.components.builders import build_ssb_accordion
 from datadoc.frontend.components.builders import build_variables_machine_section
-from datadoc.frontend.constants import INVALID_DATE_ORDER
 from datadoc.frontend.constants import INVALID_VALUE
-from datadoc.frontend.fields.display_variables import DISPLAY_VARIABLES
 from datadoc.frontend.fields.display_variables import (
     MULTIPLE_LANGUAGE_VARIABLES_METADATA,
 )
@@ -23,6 +22,8 @@ from datadoc.frontend.fields.display_variables import NON_EDITABLE_VARIABLES_MET
 from datadoc.frontend.fields.display_variables import VARIABLES_METADATA_LEFT
 from datadoc.frontend.fields.display_variables import VARIABLES_METADATA_RIGHT
 from datadoc.frontend.fields.display_variables import VariableIdentifiers
+from datadoc.logging_configuration.edit_log import record_variable_edits
+from datadoc.validation.engine import VARIABLE_DATE_ORDER_RULE
 
 if TYPE_CHECKING:
     from dapla_metadata.datasets import model
@@ -48,6 +49,17 @@ def populate_variables_workspace(
                 "id": f"{variable.short_name}-{dataset_opened_counter}",  # Insert language into the ID to invalidate browser caches
             },
             variable.short_name or "",
+            sub_header=get_variable_sub_header(
+                [
+                    v.message
+                    for v in state.validation.get_variable_violations(
+                        variable.short_name,
+                    )
+                ],
+                state.completeness.num_missing_variable_fields(
+                    variable.short_name or "",
+                ),
+            ),
             children=[
                 build_edit_section(
                     [VARIABLES_METADATA_LEFT, VARIABLES_METADATA_RIGHT],  # type: ignore [list-item]
@@ -128,11 +140,18 @@ def accept_variable_metadata_input(
             new_value = value
 
         # Write the value to the variables structure
+        short_name = urllib.parse.unquote(variable_short_name)
         setattr(
-            state.metadata.variables_lookup[urllib.parse.unquote(variable_short_name)],
+            state.metadata.variables_lookup[short_name],
+            metadata_field,
+            new_value,
+        )
+        state.completeness.update_variable_field(
+            short_name,
             metadata_field,
             new_value,
         )
+        state.validation.update_variable_field(short_name, metadata_field)
     except ValueError:
         logger.exception(
             "Validation failed for %s, %s, %s:",
@@ -144,7 +163,8 @@ def accept_variable_metadata_input(
     else:
         if value == "":
             value = None
-        logger.info(
+        record_variable_edits(metadata_field, (short_name,))
+        logger.debug(
             "Updated %s: %s with value '%s'",
             variable_short_name,
             metadata_field,
@@ -182,12 +202,16 @@ def accept_variable_metadata_date_input(
         )
 
         # Save both values to the model if they pass validation.
-        state.metadata.variables_lookup[
-            variable_short_name
-        ].contains_data_from = parsed_contains_data_from
-        state.metadata.variables_lookup[
-            variable_short_name
-        ].contains_data_until = parsed_contains_data_until
+        state.metadata.variables_lookup[variable_short_name].contains_data_from = (
+            parsed_contains_data_from
+        )
+        state.metadata.variables_lookup[variable_short_name].contains_data_until = (
+            parsed_contains_data_until
+        )
+        state.validation.update_variable_field(
+            variable_short_name,
+            variable_identifier,
+        )
     except ValueError as e:
         logger.exception(
             "Validation failed for %s, %s, %s: %s, %s: %s",
@@ -200,6 +224,11 @@ def accept_variable_metadata_date_input(
         )
         message = str(e)
     else:
+        for identifier in (
+            VariableIdentifiers.CONTAINS_DATA_FROM,
+            VariableIdentifiers.CONTAINS_DATA_UNTIL,
+        ):
+            record_variable_edits(identifier.value, (variable_short_name,))
         logger.debug(
             "Successfully updated %s, %s, %s: %s, %s: %s",
             variable_identifier,
@@ -215,17 +244,7 @@ def accept_variable_metadata_date_input(
         # No error to display.
         return no_error + no_error
 
-    error = (
-        True,
-        INVALID_DATE_ORDER.format(
-            contains_data_from_display_name=DISPLAY_VARIABLES[
-                VariableIdentifiers.CONTAINS_DATA_FROM
-            ].display_name,
-            contains_data_until_display_name=DISPLAY_VARIABLES[
-                VariableIdentifiers.CONTAINS_DATA_UNTIL
-            ].display_name,
-        ),
-    )
+    error = (True, VARIABLE_DATE_ORDER_RULE.message)
     return (
         error + no_error
         if variable_identifier == VariableIdentifiers.CONTAINS_DATA_FROM
@@ -269,6 +288,15 @@ def set_variables_values_inherit_dataset_values(
                 variable,
                 value,
             )
+            state.completeness.update_variable_field(val.short_name, variable, value)
+            state.validation.update_variable_field(val.short_name, variable)
+        record_variable_edits(variable, state.metadata.variables_lookup.keys())
+        logger.debug(
+            "Inherited %s from the dataset on %d variables with value %s",
+            variable,
+            len(state.metadata.variables),
+            value,
+        )
 
 
 def set_variables_value_multilanguage_inherit_dataset_values(
@@ -291,6 +319,19 @@ def set_variables_value_multilanguage_inherit_dataset_values(
                 variable,
                 update_value,
             )
+            state.completeness.update_variable_field(
+                val.short_name,
+                variable,
+                update_value,
+            )
+            state.validation.update_variable_field(val.short_name, variable)
+        record_variable_edits(variable, state.metadata.variables_lookup.keys())
+        logger.debug(
+            "Inherited %s from the dataset on %d variables with value %s",
+            variable,
+            len(state.metadata.variables),
+            value,
+        )
 
 
 def set_variables_values_inherit_dataset_derived_date_values() -> None:
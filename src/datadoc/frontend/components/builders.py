@@ -11,6 +11,9 @@ import dash_bootstrap_components as dbc
 import ssb_dash_components as ssb
 from dash import html
 
+from datadoc.frontend.components.identifiers import MISSING_VARIABLES_LIST_ID
+from datadoc.frontend.components.identifiers import MISSING_VARIABLES_SHOW_MORE_ID
+from datadoc.frontend.components.identifiers import VARIABLE_JUMP_LINK
 from datadoc.frontend.fields.display_base import DATASET_METADATA_INPUT
 from datadoc.frontend.fields.display_base import VARIABLES_METADATA_INPUT
 from datadoc.frontend.fields.display_base import FieldTypes
@@ -96,6 +99,63 @@ def build_ssb_alert(
     )
 
 
+def build_ssb_summary_alert(  # noqa: PLR0913
+    alert_type: AlertTypes,
+    title: str,
+    *,
+    message: str,
+    summary_list: list,
+    alert_list: list,
+    show_more_text: str,
+) -> dbc.Alert:
+    """Make a Dash Alert which summarizes a list too long to display in full.
+
+    The alert list may be extended by the button, see `MISSING_VARIABLES_SHOW_MORE_ID`.
+    """
+    alert = AlertType.get_type(alert_type)
+    return dbc.Alert(
+        is_open=True,
+        dismissable=True,
+        fade=True,
+        color=alert.color,
+        children=[
+            html.H5(
+                title,
+            ),
+            html.P(
+                children=message,
+                className="alert_message",
+            ),
+            html.Ul(
+                [html.Li(i, className="alert_list_item") for i in summary_list],
+                className="alert_list alert_summary_list",
+            ),
+            html.Ul(
+                [html.Li(i, className="alert_list_item") for i in alert_list],
+                id=MISSING_VARIABLES_LIST_ID,
+                className="alert_list",
+            ),
+            ssb.Button(
+                children=[show_more_text],
+                id=MISSING_VARIABLES_SHOW_MORE_ID,
+                n_clicks=0,
+                className="alert_show_more_button",
+            ),
+        ],
+        class_name="ssb-alert",
+    )
+
+
+def build_variable_jump_link(variable_short_name: str, text: str) -> html.A:
+    """Build a link which opens the variables tab and scrolls to the given variable."""
+    return html.A(
+        text,
+        id={"type": VARIABLE_JUMP_LINK, "variable_short_name": variable_short_name},
+        n_clicks=0,
+        className="alert_link variable-jump-link",
+    )
+
+
 def build_input_field_section(
     metadata_fields: list[FieldTypes],
     side: str,
@@ -161,10 +221,12 @@ def build_ssb_accordion(
     key: dict,
     variable_short_name: str,
     children: list,
+    sub_header: str | None = None,
 ) -> ssb.Accordion:
     """Build Accordion for one variable in variable workspace."""
     return ssb.Accordion(
         header=header,
+        subHeader=sub_header,
         id=key,
         children=[
             html.Section(
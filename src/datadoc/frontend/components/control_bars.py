@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import dash_bootstrap_components as dbc
 import ssb_dash_components as ssb
+from dash import dcc
 from dash import html
 
 from datadoc.frontend.callbacks.utils import get_dataset_path
+from datadoc.frontend.components.identifiers import (
+    COMPLETENESS_DISPLAYED_VERSION_STORE_ID,
+)
+from datadoc.frontend.components.identifiers import COMPLETENESS_PROGRESS_ID
+from datadoc.frontend.components.identifiers import COMPLETENESS_VERSION_STORE_ID
 from datadoc.utils import get_app_version
 
 header = ssb.Header(
@@ -34,6 +41,33 @@ def build_footer_control_bar() -> html.Aside:
     )
 
 
+def build_completeness_progress() -> html.Section:
+    """Build the progress bar showing how much obligatory metadata is filled in.
+
+    The callbacks which change the metadata store the version number of the
+    completeness tracker and the validation engine. The progress bar and the
+    variable accordions are only updated when the version has changed since
+    it was last displayed.
+    """
+    return html.Section(
+        [
+            ssb.Paragraph(
+                "Obligatoriske metadata utfylt",
+                className="completeness-progress-title",
+            ),
+            dbc.Progress(
+                id=COMPLETENESS_PROGRESS_ID,
+                value=0,
+                label="0 %",
+                className="completeness-progress",
+            ),
+            dcc.Store(id=COMPLETENESS_VERSION_STORE_ID),
+            dcc.Store(id=COMPLETENESS_DISPLAYED_VERSION_STORE_ID),
+        ],
+        className="completeness-progress-section",
+    )
+
+
 def build_controls_bar() -> html.Section:
     """Build the Controls Bar.
 
@@ -46,7 +80,8 @@ def build_controls_bar() -> html.Section:
         [
             ssb.Input(
                 label="Filsti",
-                value=get_dataset_path(),
+                # Path objects aren't JSON serializable
+                value=str(get_dataset_path()),
                 className="file-path-input",
                 id="dataset-path-input",
             ),
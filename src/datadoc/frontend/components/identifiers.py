@@ -2,3 +2,14 @@ SECTION_WRAPPER_ID = "section-wrapper-id"
 
 VARIABLES_INFORMATION_ID = "variables-information"
 ACCORDION_WRAPPER_ID = "accordion-wrapper"
+
+COMPLETENESS_PROGRESS_ID = "completeness-progress"
+COMPLETENESS_VERSION_STORE_ID = "completeness-version"
+COMPLETENESS_DISPLAYED_VERSION_STORE_ID = "completeness-displayed-version"
+MISSING_VARIABLES_LIST_ID = "missing-variables-list"
+MISSING_VARIABLES_SHOW_MORE_ID = "missing-variables-show-more"
+JUMP_TO_VARIABLE_STORE_ID = "jump-to-variable"
+VARIABLE_JUMP_LINK = "variable-jump-link"
+EXTERNAL_SOURCES_INTERVAL_ID = "external-sources-interval"
+EXTERNAL_SOURCES_LOADED_STORE_ID = "external-sources-loaded"
+LOADING_OPTIONS_SHOWN_STORE = "loading-options-shown"
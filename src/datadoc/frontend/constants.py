@@ -2,3 +2,5 @@
 
 INVALID_VALUE = "Ugyldig verdi angitt!"
 INVALID_DATE_ORDER = "Verdien for {contains_data_from_display_name} må være en lik eller tidligere dato som {contains_data_until_display_name}"
+MISSING_OBLIGATORY_FIELDS = "Mangler {count} obligatoriske felt"
+MISSING_OBLIGATORY_FIELD = "Mangler verdi for {display_name}"
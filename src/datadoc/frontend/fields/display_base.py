@@ -2,32 +2,49 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import urllib
 from abc import ABC
 from abc import abstractmethod
+from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import TypeAlias
+from typing import TypeVar
 
 import ssb_dash_components as ssb
 from dapla_metadata.datasets import enums
 from dash import html
 
 from datadoc import state
+from datadoc.external_sources.index import get_code_index
+from datadoc.external_sources.loader import may_access
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from dapla_metadata.datasets import model
+    from dapla_metadata.datasets.code_list import CodeList
+    from dapla_metadata.datasets.external_sources.external_sources import (
+        GetExternalSource,
+    )
+    from dapla_metadata.datasets.statistic_subject_mapping import (
+        StatisticSubjectMapping,
+    )
     from dash.development.base_component import Component
     from pydantic import BaseModel
 
     from datadoc.enums import LanguageStringsEnum
     from datadoc.frontend.callbacks.utils import MetadataInputTypes
 
+    OptionsGetter: TypeAlias = Callable[[], list[dict[str, str]]]
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 DATASET_METADATA_INPUT = "dataset-metadata-input"
 DATASET_METADATA_DATE_INPUT = "dataset-metadata-date-input"
 DATASET_METADATA_MULTILANGUAGE_INPUT = "dataset-metadata-multilanguage-input"
@@ -37,6 +54,15 @@ VARIABLES_METADATA_DATE_INPUT = "variables-metadata-date-input"
 VARIABLES_METADATA_MULTILANGUAGE_INPUT = "dataset-metadata-multilanguage-input"
 
 DROPDOWN_DESELECT_OPTION = "-- Velg --"
+DROPDOWN_LOADING_OPTION = "Laster inn valg ..."
+
+# Set when a dropdown has been rendered before its external source finished
+# loading. Dash runs each callback in its own context, so this only covers
+# the render it happens in, and one session can't see another's.
+_loading_options_served: ContextVar[bool] = ContextVar(
+    "loading_options_served",
+    default=False,
+)
 
 METADATA_LANGUAGES = [
     {
@@ -73,6 +99,70 @@ def get_enum_options(
     return dropdown_options
 
 
+def get_loading_options() -> list[dict[str, str]]:
+    """Options for a dropdown whose external source is still loading.
+
+    Getting the options from a source which hasn't finished loading would
+    block the callback until it has, so this is shown instead.
+    """
+    _loading_options_served.set(True)
+    return [{"title": DROPDOWN_LOADING_OPTION, "id": ""}]
+
+
+def track_loading_options(render: Callable[[], T]) -> tuple[T, bool]:
+    """Render, and find out whether any dropdown got the loading placeholder.
+
+    The result is kept in the browser, so each session knows whether its
+    own workspaces must be rendered again once the external sources have
+    loaded.
+
+    Returns:
+        The rendered result, and whether a placeholder was shown in it.
+    """
+    token = _loading_options_served.set(False)
+    try:
+        return render(), _loading_options_served.get()
+    finally:
+        _loading_options_served.reset(token)
+
+
+def external_source_options(
+    get_source: Callable[[], GetExternalSource],
+) -> Callable[[OptionsGetter], OptionsGetter]:
+    """Decorate an options getter for a dropdown whose options come from an external source.
+
+    While the source is loading the dropdown gets a placeholder option.
+    Once it has loaded, the options are built once for each version of the
+    source's data rather than for every dropdown rendered. A refresh which
+    swaps in new data increments the source's version, which invalidates
+    the options.
+
+    Args:
+        get_source: Gets the external source the options are built from.
+    """
+
+    def decorator(build_options: OptionsGetter) -> OptionsGetter:
+        # The source, its version and the options built from it
+        cached: list[tuple[GetExternalSource, object, list[dict[str, str]]]] = []
+
+        @functools.wraps(build_options)
+        def wrapper() -> list[dict[str, str]]:
+            source = get_source()
+            if not may_access(source) or not source.check_if_external_data_is_loaded():
+                return get_loading_options()
+            version = getattr(source, "version", None)
+            if not cached or cached[0][0] is not source or cached[0][1] != version:
+                # Replacing the whole entry means concurrent readers never
+                # see options paired with the wrong version
+                cached[:] = [(source, version, build_options())]
+            return list(cached[0][2])
+
+        return wrapper
+
+    return decorator
+
+
+@external_source_options(lambda: state.data_sources)
 def get_data_source_options() -> list[dict[str, str]]:
     """Collect the unit type options."""
     dropdown_options = [
@@ -80,12 +170,35 @@ def get_data_source_options() -> list[dict[str, str]]:
             "title": data_sources.get_title(enums.SupportedLanguages.NORSK_BOKMÅL),
             "id": data_sources.code,
         }
-        for data_sources in state.data_sources.classifications
+        for data_sources in get_code_index(state.data_sources)
     ]
     dropdown_options.insert(0, {"title": DROPDOWN_DESELECT_OPTION, "id": ""})
     return dropdown_options
 
 
+def get_stored_code_option(
+    get_source: Callable[[], CodeList | StatisticSubjectMapping],
+    code: str | None,
+) -> dict[str, str] | None:
+    """An option for a stored code which isn't in its external source.
+
+    Codes removed from a code list, or stored by an older version of the
+    app, are then still shown in the dropdown rather than left blank.
+
+    Returns:
+        The option, None if the code is in the source, or the source hasn't
+        loaded yet.
+    """
+    if not code:
+        return None
+    source = get_source()
+    if not may_access(source) or not source.check_if_external_data_is_loaded():
+        return None
+    if code in get_code_index(source):
+        return None
+    return {"title": code, "id": code}
+
+
 def get_standard_metadata(metadata: BaseModel, identifier: str) -> MetadataInputTypes:
     """Get a metadata value from the model."""
     return getattr(metadata, identifier)
@@ -191,6 +304,8 @@ class MetadataDropdownField(DisplayMetadata):
     """Controls how a Dropdown should be displayed."""
 
     options_getter: Callable[[], list[dict[str, str]]] = list
+    # The external source the options come from, if any
+    code_source: Callable[[], CodeList | StatisticSubjectMapping] | None = None
 
     def render(
         self,
@@ -199,12 +314,18 @@ class MetadataDropdownField(DisplayMetadata):
     ) -> ssb.Dropdown:
         """Build Dropdown component."""
         self.url_encode_shortname_ids(component_id)
+        items = self.options_getter()
+        value = get_metadata_and_stringify(metadata, self.identifier)
+        if self.code_source and (
+            option := get_stored_code_option(self.code_source, value)
+        ):
+            items.append(option)
         return ssb.Dropdown(
             header=self.display_name,
             id=component_id,
-            items=self.options_getter(),
+            items=items,
             placeholder=DROPDOWN_DESELECT_OPTION,
-            value=get_metadata_and_stringify(metadata, self.identifier),
+            value=value,
             className="dropdown-component",
             showDescription=True,
             description=self.description,
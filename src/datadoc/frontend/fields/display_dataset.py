@@ -14,6 +14,7 @@ from datadoc.enums import DataSetState
 from datadoc.enums import DataSetStatus
 from datadoc.enums import TemporalityTypeType
 from datadoc.enums import UseRestriction
+from datadoc.external_sources.index import get_code_index
 from datadoc.frontend.fields.display_base import DATASET_METADATA_DATE_INPUT
 from datadoc.frontend.fields.display_base import DATASET_METADATA_MULTILANGUAGE_INPUT
 from datadoc.frontend.fields.display_base import DROPDOWN_DESELECT_OPTION
@@ -24,6 +25,7 @@ from datadoc.frontend.fields.display_base import MetadataDropdownField
 from datadoc.frontend.fields.display_base import MetadataInputField
 from datadoc.frontend.fields.display_base import MetadataMultiLanguageField
 from datadoc.frontend.fields.display_base import MetadataPeriodField
+from datadoc.frontend.fields.display_base import external_source_options
 from datadoc.frontend.fields.display_base import get_comma_separated_string
 from datadoc.frontend.fields.display_base import get_data_source_options
 from datadoc.frontend.fields.display_base import get_enum_options
@@ -31,20 +33,23 @@ from datadoc.frontend.fields.display_base import get_enum_options
 logger = logging.getLogger(__name__)
 
 
+@external_source_options(lambda: state.statistic_subject_mapping)
 def get_statistical_subject_options() -> list[dict[str, str]]:
     """Generate the list of options for statistical subject."""
+    index = get_code_index(state.statistic_subject_mapping)
     dropdown_options = [
         {
-            "title": f"{primary.get_title(enums.SupportedLanguages.NORSK_BOKMÅL)} - {secondary.get_title(enums.SupportedLanguages.NORSK_BOKMÅL)}",
-            "id": secondary.subject_code,
+            "title": f"{index.get_title(subject.parent, enums.SupportedLanguages.NORSK_BOKMÅL)} - {subject.get_title(enums.SupportedLanguages.NORSK_BOKMÅL)}",
+            "id": subject.code,
         }
-        for primary in state.statistic_subject_mapping.primary_subjects
-        for secondary in primary.secondary_subjects
+        for subject in index
+        if subject.parent is not None
     ]
     dropdown_options.insert(0, {"title": DROPDOWN_DESELECT_OPTION, "id": ""})
     return dropdown_options
 
 
+@external_source_options(lambda: state.unit_types)
 def get_unit_type_options() -> list[dict[str, str]]:
     """Collect the unit type options."""
     dropdown_options = [
@@ -52,12 +57,13 @@ def get_unit_type_options() -> list[dict[str, str]]:
             "title": unit_type.get_title(enums.SupportedLanguages.NORSK_BOKMÅL),
             "id": unit_type.code,
         }
-        for unit_type in state.unit_types.classifications
+        for unit_type in get_code_index(state.unit_types)
     ]
     dropdown_options.insert(0, {"title": DROPDOWN_DESELECT_OPTION, "id": ""})
     return dropdown_options
 
 
+@external_source_options(lambda: state.organisational_units)
 def get_owner_options() -> list[dict[str, str]]:
     """Collect the owner options."""
     dropdown_options = [
@@ -65,7 +71,7 @@ def get_owner_options() -> list[dict[str, str]]:
             "title": f"{option.code} - {option.get_title(enums.SupportedLanguages.NORSK_BOKMÅL)}",
             "id": option.code,
         }
-        for option in state.organisational_units.classifications
+        for option in get_code_index(state.organisational_units)
     ]
     dropdown_options.insert(0, {"title": DROPDOWN_DESELECT_OPTION, "id": ""})
     return dropdown_options
@@ -183,6 +189,7 @@ DISPLAY_DATASET: dict[
         display_name="Enhetstype",
         description="Den eller de enhetstypen(e) datasettet inneholder informasjon om. Eksempler på enhetstyper er person, foretak og eiendom.",
         options_getter=get_unit_type_options,
+        code_source=lambda: state.unit_types,
         obligatory=True,
     ),
     DatasetIdentifiers.CONTAINS_DATA_FROM: MetadataPeriodField(
@@ -207,6 +214,7 @@ DISPLAY_DATASET: dict[
         description="Oppgi kilden til datasettet (på etat-/organisasjonsnivå). Dersom flere variabler i datasettet har ulik datakilde, kan disse dokumenteres på variabelnivå.",
         obligatory=True,
         options_getter=get_data_source_options,
+        code_source=lambda: state.data_sources,
     ),
     DatasetIdentifiers.TEMPORALITY_TYPE: MetadataDropdownField(
         identifier=DatasetIdentifiers.TEMPORALITY_TYPE.value,
@@ -224,6 +232,7 @@ DISPLAY_DATASET: dict[
         description="Oppgi det primære statistikkområdet som datasettet tilhører.",
         obligatory=True,
         options_getter=get_statistical_subject_options,
+        code_source=lambda: state.statistic_subject_mapping,
     ),
     DatasetIdentifiers.KEYWORD: MetadataInputField(
         identifier=DatasetIdentifiers.KEYWORD.value,
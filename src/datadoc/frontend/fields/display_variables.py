@@ -12,6 +12,7 @@ from datadoc.enums import DataType
 from datadoc.enums import IsPersonalData
 from datadoc.enums import TemporalityTypeType
 from datadoc.enums import VariableRole
+from datadoc.external_sources.index import get_code_index
 from datadoc.frontend.fields.display_base import VARIABLES_METADATA_DATE_INPUT
 from datadoc.frontend.fields.display_base import VARIABLES_METADATA_MULTILANGUAGE_INPUT
 from datadoc.frontend.fields.display_base import FieldTypes
@@ -19,10 +20,15 @@ from datadoc.frontend.fields.display_base import MetadataDropdownField
 from datadoc.frontend.fields.display_base import MetadataInputField
 from datadoc.frontend.fields.display_base import MetadataMultiLanguageField
 from datadoc.frontend.fields.display_base import MetadataPeriodField
+from datadoc.frontend.fields.display_base import external_source_options
 from datadoc.frontend.fields.display_base import get_data_source_options
 from datadoc.frontend.fields.display_base import get_enum_options
 
+# The external sources the variables dropdowns get their options from
+VARIABLES_EXTERNAL_SOURCES = ("measurement_units", "data_sources")
 
+
+@external_source_options(lambda: state.measurement_units)
 def get_measurement_unit_options() -> list[dict[str, str]]:
     """Collect the unit type options."""
     dropdown_options = [
@@ -30,7 +36,7 @@ def get_measurement_unit_options() -> list[dict[str, str]]:
             "title": measurement_unit.get_title(enums.SupportedLanguages.NORSK_BOKMÅL),
             "id": measurement_unit.code,
         }
-        for measurement_unit in state.measurement_units.classifications
+        for measurement_unit in get_code_index(state.measurement_units)
     ]
     dropdown_options.insert(0, {"title": "", "id": ""})
     return dropdown_options
@@ -104,6 +110,7 @@ DISPLAY_VARIABLES: dict[
         display_name="Måleenhet",
         description="Dersom variabelen er kvantitativ, skal den ha en måleenhet, f.eks. kilo eller kroner.",
         options_getter=get_measurement_unit_options,
+        code_source=lambda: state.measurement_units,
     ),
     VariableIdentifiers.INVALID_VALUE_DESCRIPTION: MetadataMultiLanguageField(
         identifier=VariableIdentifiers.INVALID_VALUE_DESCRIPTION.value,
@@ -137,6 +144,7 @@ DISPLAY_VARIABLES: dict[
         display_name="Datakilde",
         description="Oppgi datakilden til variabelen (på etat-/organisasjonsnivå) dersom denne ikke allerede er satt på  datasettnivå. Brukes hovedsakelig når variabler i et datasett har ulike datakilder.",
         options_getter=get_data_source_options,
+        code_source=lambda: state.data_sources,
     ),
     VariableIdentifiers.TEMPORALITY_TYPE: MetadataDropdownField(
         identifier=VariableIdentifiers.TEMPORALITY_TYPE.value,
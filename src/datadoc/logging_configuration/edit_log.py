@@ -0,0 +1,103 @@
+"""Log the metadata edits of a request as one summary line.
+
+Bulk edits, and values inherited from the dataset by every variable, can
+update thousands of fields in one request. Each edit is logged at DEBUG
+where it is made, and the edits are counted here and logged at INFO as one
+line when the request finishes.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+logger = logging.getLogger(__name__)
+
+# How many of the edited field names are included in the summary
+MAX_FIELD_NAMES = 5
+
+
+@dataclass
+class EditSummary:
+    """The metadata fields edited in a request.
+
+    Attributes:
+        dataset_fields: How many dataset fields were updated.
+        variable_fields: How many variable fields were updated.
+        variables: The short names of the updated variables.
+        field_names: The names of the updated fields.
+    """
+
+    dataset_fields: int = 0
+    variable_fields: int = 0
+    variables: set[str] = field(default_factory=set)
+    field_names: set[str] = field(default_factory=set)
+
+    @property
+    def fields(self) -> int:
+        """How many fields were updated in total."""
+        return self.dataset_fields + self.variable_fields
+
+    def describe(self, elapsed_ms: float) -> str:
+        """Describe the edits, for example 'Updated 4,312 fields on 4,312 variables in 180 ms'."""
+        targets = []
+        if self.dataset_fields:
+            targets.append("the dataset")
+        if self.variables:
+            targets.append(_plural(len(self.variables), "variable"))
+        names = sorted(self.field_names)
+        if len(names) > MAX_FIELD_NAMES:
+            names[MAX_FIELD_NAMES:] = ["..."]
+        return (
+            f"Updated {_plural(self.fields, 'field')} on {' and '.join(targets)} "
+            f"in {elapsed_ms:.0f} ms: {', '.join(names)}"
+        )
+
+
+def _plural(count: int, noun: str) -> str:
+    return f"{count:,} {noun}" if count == 1 else f"{count:,} {noun}s"
+
+
+_current_edits: contextvars.ContextVar[EditSummary | None] = contextvars.ContextVar(
+    "datadoc_edit_summary",
+    default=None,
+)
+
+
+def start_edit_summary() -> None:
+    """Start counting the edits of a new request."""
+    _current_edits.set(EditSummary())
+
+
+def get_edit_summary() -> EditSummary | None:
+    """Get the edits of the request being handled, None outside of requests."""
+    return _current_edits.get()
+
+
+def record_dataset_edit(field_name: str) -> None:
+    """Count an update of a dataset field. Does nothing outside of requests."""
+    if (summary := _current_edits.get()) is not None:
+        summary.dataset_fields += 1
+        summary.field_names.add(field_name)
+
+
+def record_variable_edits(field_name: str, short_names: Collection[str]) -> None:
+    """Count an update of a field on each of the variables. Does nothing outside of requests."""
+    if (summary := _current_edits.get()) is not None:
+        summary.variables.update(short_names)
+        summary.variable_fields += len(short_names)
+        summary.field_names.add(field_name)
+
+
+def finish_edit_summary(elapsed_ms: float) -> None:
+    """Log the edits of the request, if there were any, and stop counting."""
+    summary = _current_edits.get()
+    _current_edits.set(None)
+    if summary is not None and summary.fields:
+        logger.info(summary.describe(elapsed_ms))
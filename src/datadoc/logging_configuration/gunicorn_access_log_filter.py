@@ -1,6 +1,6 @@
 import logging
 
-EXCLUDED_PATHS = ["/healthz", "/_dash-", "/assets"]
+EXCLUDED_PATHS = ["/healthz", "/_dash-", "/assets", "/_datadoc-assets"]
 
 
 class GunicornAccessLoggerHealthProbeFilter(logging.Filter):
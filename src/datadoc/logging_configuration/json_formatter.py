@@ -4,6 +4,29 @@ import datetime as dt
 import json
 import logging
 from typing import Any
+from typing import Literal
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    ORJSON_AVAILABLE = False
+
+# Fields which are computed for every record, rather than read from it
+ALWAYS_FIELDS = frozenset({"message", "timestamp", "exc_info", "stack_info"})
+
+
+def _dumps_json(message: dict[str, Any]) -> str:
+    return json.dumps(message, default=str, separators=(",", ":"))
+
+
+def _dumps_orjson(message: dict[str, Any]) -> str:
+    try:
+        return orjson.dumps(message, default=str).decode()
+    except TypeError:
+        # orjson is stricter, for example about integers larger than 64 bits
+        return _dumps_json(message)
 
 
 class DatadocJSONFormatter(logging.Formatter):
@@ -13,23 +36,61 @@ class DatadocJSONFormatter(logging.Formatter):
         self,
         *,
         fmt_keys: dict[str, str] | None = None,
+        backend: Literal["auto", "orjson", "json"] = "auto",
     ) -> None:
-        """Initializer for the json formatter."""
+        """Initializer for the json formatter.
+
+        Args:
+            fmt_keys: The keys in the JSON structure, and the record attribute for each.
+            backend: The JSON serializer. By default orjson is used when it
+                is installed, and the standard library otherwise.
+
+        Raises:
+            ValueError: If orjson is asked for but isn't installed.
+        """
         super().__init__()
         self.fmt_keys = fmt_keys if fmt_keys is not None else {}
+        # Decide once for each key where its value comes from
+        self._keys = tuple(
+            (key, val, val in ALWAYS_FIELDS) for key, val in self.fmt_keys.items()
+        )
+        if backend == "orjson" and not ORJSON_AVAILABLE:
+            msg = "The orjson backend needs orjson to be installed"
+            raise ValueError(msg)
+        use_orjson = backend == "orjson" or (backend == "auto" and ORJSON_AVAILABLE)
+        self._dumps = _dumps_orjson if use_orjson else _dumps_json
+        self._timestamp_cache: tuple[int, str] = (-1, "")
 
     def format(self, record: logging.LogRecord) -> str:
         """Method that creates the json structure from a message created by the _prepare_log_dict method."""
         message = self._prepare_log_dict(record)
-        return json.dumps(message, default=str)
+        return self._dumps(message)
+
+    def format_timestamp(self, created: float) -> str:
+        """Format the time of a record as ISO 8601 in UTC.
+
+        Gives the same as `datetime.isoformat`, but only formats the date
+        and time once a second.
+        """
+        seconds = int(created)
+        microseconds = round((created - seconds) * 1_000_000)
+        if microseconds >= 1_000_000:  # noqa: PLR2004
+            seconds += 1
+            microseconds -= 1_000_000
+        cached_seconds, prefix = self._timestamp_cache
+        if cached_seconds != seconds:
+            prefix = dt.datetime.fromtimestamp(seconds, tz=dt.timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%S",
+            )
+            self._timestamp_cache = (seconds, prefix)
+        if microseconds:
+            return f"{prefix}.{microseconds:06d}+00:00"
+        return f"{prefix}+00:00"
 
     def _prepare_log_dict(self, record: logging.LogRecord) -> dict[str, str | Any]:
         always_fields = {
             "message": record.getMessage(),
-            "timestamp": dt.datetime.fromtimestamp(
-                record.created,
-                tz=dt.timezone.utc,
-            ).isoformat(),
+            "timestamp": self.format_timestamp(record.created),
         }
         if record.exc_info is not None:
             always_fields["exc_info"] = self.formatException(record.exc_info)
@@ -37,13 +98,15 @@ class DatadocJSONFormatter(logging.Formatter):
         if record.stack_info is not None:
             always_fields["stack_info"] = self.formatStack(record.stack_info)
 
+        # Every attribute of a record is in its __dict__, which is faster than getattr
+        attributes = record.__dict__
         message = {
             key: (
-                msg_val
-                if (msg_val := always_fields.pop(val, None)) is not None
-                else getattr(record, val)
+                always_fields.pop(val)
+                if computed and val in always_fields
+                else attributes.get(val)
             )
-            for key, val in self.fmt_keys.items()
+            for key, val, computed in self._keys
         }
         message.update(always_fields)
 
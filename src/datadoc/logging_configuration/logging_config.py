@@ -4,6 +4,9 @@ from typing import Any
 
 from datadoc.config import get_log_formatter
 from datadoc.config import get_log_level
+from datadoc.config import get_log_queue_enabled
+from datadoc.config import get_log_queue_overflow
+from datadoc.config import get_log_queue_size
 from datadoc.logging_configuration.gunicorn_access_log_filter import (
     GunicornAccessLoggerHealthProbeFilter,
 )
@@ -31,17 +34,21 @@ def get_log_config() -> dict[str, Any]:
                     "function": "funcName",
                     "line": "lineno",
                     "thread_name": "threadName",
+                    "request_id": "request_id",
+                    "session_id": "session_id",
+                    "callback": "callback",
+                    "elapsed_ms": "elapsed_ms",
                 },
             },
         },
-        "handlers": {
-            "stdout": {
-                "class": "logging.StreamHandler",
-                "level": get_log_level(),
-                "formatter": get_log_formatter(),
-                "stream": "ext://sys.stdout",
+        "filters": {
+            "request_context": {
+                "()": "datadoc.logging_configuration.request_context.RequestContextFilter",
             },
         },
+        "handlers": {
+            "stdout": get_stdout_handler_config(),
+        },
         "loggers": {
             "gunicorn": {
                 "handlers": ["stdout"],
@@ -67,3 +74,21 @@ def get_log_config() -> dict[str, Any]:
             ],
         },
     }
+
+
+def get_stdout_handler_config() -> dict[str, Any]:
+    """Configure the handler which writes to stdout, through a queue if enabled."""
+    handler = {
+        "level": get_log_level(),
+        "formatter": get_log_formatter(),
+        "filters": ["request_context"],
+        "stream": "ext://sys.stdout",
+    }
+    if get_log_queue_enabled():
+        return {
+            "()": "datadoc.logging_configuration.queue_handler.QueueStreamHandler",
+            "queue_size": get_log_queue_size(),
+            "overflow": get_log_queue_overflow(),
+            **handler,
+        }
+    return {"class": "logging.StreamHandler", **handler}
@@ -0,0 +1,140 @@
+"""Write log records to a stream from a listener thread."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import weakref
+from typing import IO
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        """Wait for room for the sentinel, rather than failing when the queue is full."""
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+class QueueStreamHandler(logging.handlers.QueueHandler):
+    """Put log records on a bounded queue, and write them to a stream from a listener thread.
+
+    Request threads then never wait for a slow stream. When the queue is
+    full, new records are dropped and counted, and a warning with the count
+    is logged once there is room again. With the "block" overflow policy,
+    the logging thread waits for room instead.
+
+    Filters and the level are applied in the logging thread, and formatting
+    is done by the listener.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str] | None = None,
+        *,
+        queue_size: int = 10_000,
+        overflow: Literal["drop", "block"] = "drop",
+    ) -> None:
+        """Start the listener thread.
+
+        Args:
+            stream: The stream to write to, stderr by default.
+            queue_size: How many records may wait to be written.
+            overflow: What to do with new records when the queue is full,
+                "drop" them or "block" until there is room.
+
+        Raises:
+            ValueError: If the overflow policy is unknown.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            msg = f"Unknown log queue overflow policy {overflow!r}, must be one of {OVERFLOW_POLICIES}"
+            raise ValueError(msg)
+        self._queue: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+        super().__init__(self._queue)
+        self.overflow = overflow
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._closed = False
+        self.listener = self._start_listener()
+
+        # Threads don't survive a fork, as when Gunicorn starts its workers
+        restart = weakref.WeakMethod(self._restart_after_fork)
+        os.register_at_fork(after_in_child=lambda: (method := restart()) and method())
+
+    def _start_listener(self) -> _QueueListener:
+        listener = _QueueListener(self._queue, self.target)
+        listener.start()
+        return listener
+
+    def _restart_after_fork(self) -> None:
+        if self._closed:
+            return
+        # Records queued before the fork are written by the parent
+        self._queue = self.queue = queue.Queue(self._queue.maxsize)
+        self._dropped_lock = threading.Lock()
+        self.listener = self._start_listener()
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:  # noqa: N802
+        """Set the formatter the listener formats records with."""
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message, so the record is formatted as it was logged."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, following the overflow policy when it is full."""
+        if self.overflow == "block":
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        if self.dropped:
+            self._report_dropped()
+
+    def _report_dropped(self) -> None:
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            record = logger.makeRecord(
+                logger.name,
+                logging.WARNING,
+                __file__,
+                0,
+                "Dropped %d log records, the log queue was full",
+                (dropped,),
+                None,
+            )
+            try:
+                self._queue.put_nowait(self.prepare(record))
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += dropped
+
+    def flush(self) -> None:
+        """Wait for the queued records to be written, and flush the stream."""
+        self._queue.join()
+        self.target.flush()
+
+    def close(self) -> None:
+        """Write the queued records, and stop the listener thread."""
+        if not self._closed:
+            self._closed = True
+            self.listener.stop()
+            self.target.close()
+        super().close()
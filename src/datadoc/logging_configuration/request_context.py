@@ -0,0 +1,144 @@
+"""Request-scoped context for log records, and logging of slow requests.
+
+Every log record gets the ID of the request it was logged in, the ID of the
+browser session, the name of the callback being run and the milliseconds
+since the request started. They are None outside of requests. The metadata
+edits made in a request are logged as one line when it finishes.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import flask
+
+from datadoc.logging_configuration.edit_log import finish_edit_summary
+from datadoc.logging_configuration.edit_log import start_edit_summary
+
+if TYPE_CHECKING:
+    import datetime
+
+    from dash import Dash
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+SESSION_COOKIE = "datadoc_session"
+DASH_UPDATE_COMPONENT_PATH = "/_dash-update-component"
+CONTEXT_FIELDS = ("request_id", "session_id", "callback", "elapsed_ms")
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """The context of the request being handled.
+
+    Attributes:
+        request_id: From the X-Request-ID header if the proxy sets one,
+            otherwise generated.
+        session_id: Identifies the browser session, kept in a cookie.
+        callback: The name of the callback function, None if the request
+            isn't for a callback.
+        started: When the request started, from `time.perf_counter`.
+    """
+
+    request_id: str
+    session_id: str
+    callback: str | None
+    started: float
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the request started."""
+        return (time.perf_counter() - self.started) * 1000
+
+
+_current_request: contextvars.ContextVar[RequestContext | None] = (
+    contextvars.ContextVar("datadoc_request_context", default=None)
+)
+
+
+def get_request_context() -> RequestContext | None:
+    """Get the context of the request being handled, None outside of requests."""
+    return _current_request.get()
+
+
+class RequestContextFilter(logging.Filter):
+    """Add the context of the current request to log records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Set the request fields on the record. Never filters anything out."""
+        context = _current_request.get()
+        if context is None:
+            record.request_id = record.session_id = None
+            record.callback = record.elapsed_ms = None
+        else:
+            record.request_id = context.request_id
+            record.session_id = context.session_id
+            record.callback = context.callback
+            record.elapsed_ms = round(context.elapsed_ms, 1)
+        return True
+
+
+def init_request_context(app: Dash, slow_request_threshold: datetime.timedelta) -> None:
+    """Track the context of each request, and log requests slower than the threshold.
+
+    The metadata edits made in each request are logged as one summary line.
+
+    Args:
+        app: The app to track the requests of.
+        slow_request_threshold: Requests which take longer are logged as a warning.
+    """
+    threshold_ms = slow_request_threshold.total_seconds() * 1000
+
+    def get_callback_name(request: flask.Request) -> str | None:
+        if not request.path.endswith(DASH_UPDATE_COMPONENT_PATH):
+            return None
+        # Flask caches the parsed body, so Dash doesn't parse it again
+        body = request.get_json(silent=True) or {}
+        callback = app.callback_map.get(body.get("output"), {}).get("callback")
+        return callback.__name__ if callback else None
+
+    @app.server.before_request
+    def start_request() -> None:
+        request = flask.request
+        _current_request.set(
+            RequestContext(
+                request_id=request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex,
+                session_id=request.cookies.get(SESSION_COOKIE) or uuid.uuid4().hex,
+                callback=get_callback_name(request),
+                started=time.perf_counter(),
+            ),
+        )
+        start_edit_summary()
+
+    @app.server.after_request
+    def finish_request(response: flask.Response) -> flask.Response:
+        context = _current_request.get()
+        if context is None:
+            return response
+        response.headers[REQUEST_ID_HEADER] = context.request_id
+        if SESSION_COOKIE not in flask.request.cookies:
+            response.set_cookie(
+                SESSION_COOKIE,
+                context.session_id,
+                httponly=True,
+                samesite="Lax",
+            )
+        finish_edit_summary(context.elapsed_ms)
+        if context.elapsed_ms > threshold_ms:
+            logger.warning(
+                "Slow request %s %s took %.0f ms",
+                flask.request.method,
+                flask.request.path,
+                context.elapsed_ms,
+            )
+        return response
+
+    @app.server.teardown_request
+    def end_request(_: BaseException | None) -> None:
+        _current_request.set(None)
@@ -0,0 +1,249 @@
+"""Callback metrics, exposed in the Prometheus text format on /metrics.
+
+Every callback is timed, and the sizes of its request and serialized
+response are recorded, labelled by the name of the callback and the outcome.
+Recording a call takes a few microseconds, so it is always on. The sizes of
+responses before and after compression are recorded by `datadoc.compression`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import flask
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    from dash import Dash
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# From a few hundred bytes to the tens of megabytes of a very wide dataset
+SIZE_BUCKETS = tuple(256 * 4**exponent for exponent in range(10))
+
+CALLBACK_LABELS = ("callback", "outcome")
+RESPONSE_LABELS = ("route", "encoding")
+SUCCESS = "success"
+PREVENTED = "prevented"
+ERROR = "error"
+
+
+class _Series:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, num_buckets: int) -> None:
+        self.counts = [0] * num_buckets
+        self.total = 0.0
+
+
+class Histogram:
+    """Count observations in buckets, for each combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        """Create an empty histogram.
+
+        Args:
+            name: The name of the metric.
+            documentation: Describes the metric.
+            label_names: The names of the labels, in the order their values
+                are given to `observe`.
+            buckets: The upper bounds of the buckets, in increasing order. A
+                bucket for everything larger is added.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record an observation for the given label values."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = _Series(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.total += value
+
+    def count(self, *label_values: str) -> int:
+        """Get the number of observations for the given label values."""
+        with self._lock:
+            series = self._series.get(label_values)
+            return sum(series.counts) if series else 0
+
+    def collect(self) -> Iterator[str]:
+        """Get the lines of the histogram in the Prometheus text format."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [
+                (label_values, list(series.counts), series.total)
+                for label_values, series in sorted(self._series.items())
+            ]
+        for label_values, counts, total in snapshot:
+            labels = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.label_names, label_values, strict=True)
+            )
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f"{self.name}_sum{{{labels}}} {total}"
+            yield f"{self.name}_count{{{labels}}} {cumulative}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+class Registry:
+    """The metrics exposed by the app."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: list[Histogram] = []
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float],
+    ) -> Histogram:
+        """Create a histogram and add it to the registry."""
+        histogram = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(histogram)
+        return histogram
+
+    def exposition(self) -> str:
+        """Get every metric in the Prometheus text format."""
+        return "".join(
+            f"{line}\n" for metric in self._metrics for line in metric.collect()
+        )
+
+
+REGISTRY = Registry()
+
+CALLBACK_DURATION = REGISTRY.histogram(
+    "datadoc_callback_duration_seconds",
+    "Wall time spent in callbacks, including serializing the response.",
+    CALLBACK_LABELS,
+    DURATION_BUCKETS,
+)
+CALLBACK_CPU = REGISTRY.histogram(
+    "datadoc_callback_cpu_seconds",
+    "CPU time spent in callbacks by the request thread.",
+    CALLBACK_LABELS,
+    DURATION_BUCKETS,
+)
+CALLBACK_INPUT_SIZE = REGISTRY.histogram(
+    "datadoc_callback_input_bytes",
+    "Size of callback requests.",
+    CALLBACK_LABELS,
+    SIZE_BUCKETS,
+)
+CALLBACK_OUTPUT_SIZE = REGISTRY.histogram(
+    "datadoc_callback_output_bytes",
+    "Size of serialized callback responses, 0 when nothing was updated.",
+    CALLBACK_LABELS,
+    SIZE_BUCKETS,
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "datadoc_response_bytes",
+    "Size of response bodies before compression, the encoding is identity when not compressed.",
+    RESPONSE_LABELS,
+    SIZE_BUCKETS,
+)
+RESPONSE_COMPRESSED_SIZE = REGISTRY.histogram(
+    "datadoc_response_compressed_bytes",
+    "Size of compressed response bodies, as sent.",
+    RESPONSE_LABELS,
+    SIZE_BUCKETS,
+)
+
+
+def instrument_callback(name: str, func: Callable[..., str]) -> Callable[..., str]:
+    """Record metrics for every call of a callback, as registered by Dash.
+
+    Args:
+        name: The name to label the metrics with.
+        func: The callback function in Dash's callback map, which returns
+            the serialized response.
+
+    Returns:
+        The instrumented callback function.
+    """
+    # Only needed once there are callbacks, importing it imports all of dash
+    from dash.exceptions import PreventUpdate
+
+    @functools.wraps(func)
+    def instrumented(*args: object, **kwargs: object) -> str:
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        outcome = ERROR
+        try:
+            output = func(*args, **kwargs)
+        except PreventUpdate:
+            outcome = PREVENTED
+            raise
+        else:
+            outcome = SUCCESS
+            return output
+        finally:
+            CALLBACK_DURATION.observe(time.perf_counter() - started, name, outcome)
+            CALLBACK_CPU.observe(time.thread_time() - cpu_started, name, outcome)
+            if flask.has_request_context():
+                CALLBACK_INPUT_SIZE.observe(
+                    flask.request.content_length or 0,
+                    name,
+                    outcome,
+                )
+                if outcome == SUCCESS:
+                    _record_output_size(name, outcome)
+                else:
+                    CALLBACK_OUTPUT_SIZE.observe(0, name, outcome)
+
+    return instrumented
+
+
+def _record_output_size(name: str, outcome: str) -> None:
+    # Werkzeug has already encoded the body to get its length, so this costs
+    # nothing for each byte. Functions registered for this request run before
+    # the app's own, which means before the response is compressed.
+    @flask.after_this_request
+    def record(response: flask.Response) -> flask.Response:
+        CALLBACK_OUTPUT_SIZE.observe(response.content_length or 0, name, outcome)
+        return response
+
+
+def instrument_callbacks(app: Dash) -> None:
+    """Record metrics for every callback registered on the app.
+
+    Callbacks are labelled with the name of the decorated function.
+    Clientside callbacks run in the browser, and aren't recorded.
+    """
+    for callback in app.callback_map.values():
+        if func := callback.get("callback"):
+            callback["callback"] = instrument_callback(func.__name__, func)
+
+
+def metrics_endpoint() -> flask.Response:
+    """Serve the metrics to Prometheus."""
+    return flask.Response(REGISTRY.exposition(), content_type=CONTENT_TYPE)
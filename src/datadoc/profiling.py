@@ -0,0 +1,157 @@
+"""Profile callbacks on demand, to diagnose slowness in production after the fact.
+
+Profiling is enabled by setting DATADOC_PROFILING_DIRECTORY. A callback is
+then run under cProfile when it is named in DATADOC_PROFILING_CALLBACKS, when
+the request's `X-Datadoc-Profile` header matches DATADOC_PROFILING_TOKEN, or
+when the request is picked at the DATADOC_PROFILING_SAMPLE_RATE. Without a
+token the header is ignored, so clients can't make the server profile.
+
+Each profile is written to a pstats file in the directory, which can be read
+with `python -m pstats` or snakeviz. The oldest files are deleted once they
+take up more than DATADOC_PROFILING_MAX_MEGABYTES.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import datetime
+import functools
+import hmac
+import logging
+import random
+import threading
+import uuid
+from typing import TYPE_CHECKING
+
+import flask
+
+from datadoc import config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Collection
+    from pathlib import Path
+
+    from dash import Dash
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Datadoc-Profile"
+PROFILE_SUFFIX = ".pstats"
+
+
+class CallbackProfiler:
+    """Profile selected callbacks, and keep the profiles within a size limit."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        directory: Path,
+        *,
+        callbacks: Collection[str] = (),
+        sample_rate: float = 0,
+        token: str | None = None,
+        max_bytes: int = 100 * 1024 * 1024,
+        sample: Callable[[], float] = random.random,
+    ) -> None:
+        """Create the directory for the profiles.
+
+        Args:
+            directory: The directory to write the profiles to.
+            callbacks: The names of the callbacks to profile on every call.
+            sample_rate: The fraction of all callback requests to profile.
+            token: Requests with this value in the `X-Datadoc-Profile` header
+                are profiled, None to ignore the header.
+            max_bytes: How much space the profiles may take up.
+            sample: Random numbers from 0 to 1 for sampling, replaceable for testing.
+        """
+        self.directory = directory
+        self.callbacks = frozenset(callbacks)
+        self.sample_rate = sample_rate
+        self.token = token
+        self.max_bytes = max_bytes
+        self._sample = sample
+        self._rotate_lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def should_profile(self, name: str) -> bool:
+        """Check whether to profile this call of the callback."""
+        return (
+            name in self.callbacks
+            or self._has_token()
+            or (self.sample_rate > 0 and self._sample() < self.sample_rate)
+        )
+
+    def _has_token(self) -> bool:
+        if not self.token or not flask.has_request_context():
+            return False
+        header = flask.request.headers.get(PROFILE_HEADER)
+        return header is not None and hmac.compare_digest(
+            header.encode(),
+            self.token.encode(),
+        )
+
+    def wrap(self, name: str, func: Callable[..., str]) -> Callable[..., str]:
+        """Profile calls of the callback when they are selected for profiling."""
+
+        @functools.wraps(func)
+        def profiled(*args: object, **kwargs: object) -> str:
+            if not self.should_profile(name):
+                return func(*args, **kwargs)
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is already running in this thread
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._save(name, profile)
+
+        return profiled
+
+    def _save(self, name: str, profile: cProfile.Profile) -> None:
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        path = self.directory / (
+            f"{timestamp:%Y%m%dT%H%M%S%f}-{name}-{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}"
+        )
+        try:
+            profile.dump_stats(path)
+            self._rotate()
+        except OSError:
+            logger.exception("Could not save the profile of %s", name)
+        else:
+            logger.info("Saved the profile of %s to %s", name, path)
+
+    def _rotate(self) -> None:
+        """Delete the oldest profiles until they fit within the size limit."""
+        with self._rotate_lock:
+            # The names start with a timestamp, so they sort oldest first
+            profiles = sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"))
+            sizes = [path.stat().st_size for path in profiles]
+            total = sum(sizes)
+            for path, size in zip(profiles, sizes, strict=True):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+def profile_callbacks(app: Dash) -> None:
+    """Profile the callbacks registered on the app, if profiling is enabled."""
+    settings = config.get_config()
+    directory = settings.profiling_directory
+    if directory is None:
+        return
+    profiler = CallbackProfiler(
+        directory,
+        callbacks=settings.profiling_callbacks,
+        sample_rate=settings.profiling_sample_rate,
+        token=settings.profiling_token,
+        max_bytes=settings.profiling_max_bytes,
+    )
+    for callback in app.callback_map.values():
+        if func := callback.get("callback"):
+            callback["callback"] = profiler.wrap(func.__name__, func)
+    logger.info("Profiling callbacks to %s", directory)
@@ -0,0 +1,170 @@
+"""Readiness of the app to serve traffic, reported on /healthz/ready."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from flask_healthz import HealthError
+
+from datadoc.external_sources.loader import external_sources_loaded
+from datadoc.external_sources.loader import get_external_sources
+from datadoc.external_sources.loader import holding_back_lazy_sources
+from datadoc.external_sources.loader import is_started
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Track whether the app has warmed up.
+
+    The app is ready once the layout is built, every external source has
+    loaded and the dataset workspace has been rendered once, so the first
+    user request doesn't pay for any of it.
+
+    If warm-up takes longer than the timeout the app reports ready in
+    degraded mode, where dropdowns show a placeholder until their data
+    arrives. With degraded mode disabled the app isn't ready until warm-up
+    is done, however long that takes.
+    """
+
+    def __init__(
+        self,
+        timeout: datetime.timedelta,
+        *,
+        allow_degraded: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Start the readiness timeout.
+
+        Args:
+            timeout: How long warm-up may take before the app is ready in degraded mode.
+            allow_degraded: Report ready in degraded mode once the timeout has passed.
+            clock: Monotonic clock in seconds, replaceable for testing.
+        """
+        self.timeout = timeout
+        self.allow_degraded = allow_degraded
+        self._clock = clock
+        self._started_at = clock()
+        self._layout_built = threading.Event()
+        self._warmed_up = threading.Event()
+        self._degraded_reported = False
+
+    @property
+    def warmed_up(self) -> bool:
+        """True once the warm-up routine has finished."""
+        return self._warmed_up.is_set()
+
+    def wait_until_warmed_up(self, timeout: float | None = None) -> bool:
+        """Block until the warm-up routine has finished.
+
+        Args:
+            timeout: The maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            True if warm-up has finished, False if the timeout passed first.
+        """
+        return self._warmed_up.wait(timeout)
+
+    def mark_layout_built(self) -> None:
+        """Record that the app layout has been built."""
+        self._layout_built.set()
+
+    def get_remaining_seconds(self) -> float:
+        """Get the seconds left before the readiness timeout passes."""
+        elapsed = self._clock() - self._started_at
+        return max(self.timeout.total_seconds() - elapsed, 0)
+
+    def get_pending(self) -> list[str]:
+        """Get what the app is still waiting for, empty when it is fully warmed up."""
+        pending = []
+        if not self._layout_built.is_set():
+            pending.append("layout")
+        if not external_sources_loaded():
+            pending.append("external sources")
+        if not self.warmed_up:
+            pending.append("warm-up")
+        return pending
+
+    @property
+    def degraded(self) -> bool:
+        """True if the app is ready only because the readiness timeout passed."""
+        return (
+            self.allow_degraded
+            and self.get_remaining_seconds() == 0
+            and bool(self.get_pending())
+        )
+
+    def check(self) -> None:
+        """Check whether the app is ready, for use as a flask_healthz check.
+
+        Raises:
+            HealthError: If the app is still warming up.
+        """
+        pending = self.get_pending()
+        if not pending:
+            return
+        if self.allow_degraded and self.get_remaining_seconds() == 0:
+            if not self._degraded_reported:
+                self._degraded_reported = True
+                logger.warning(
+                    "Ready in degraded mode after %s, still waiting for %s",
+                    self.timeout,
+                    ", ".join(pending),
+                )
+            return
+        msg = f"Waiting for {', '.join(pending)}"
+        raise HealthError(msg)
+
+    def warm_up(
+        self,
+        render: Callable[[], object],
+        prefetch: Callable[[], object] | None = None,
+    ) -> None:
+        """Wait for the external sources, then render once to warm up the app.
+
+        Only the first call does anything, so it is safe to call this once
+        for every app built in the process. Waiting for the external sources
+        stops when the readiness timeout passes, and the render goes ahead
+        without them. Lazy sources are not started by the render, only by
+        the prefetch, so readiness doesn't depend on sources nobody needs.
+
+        Args:
+            render: Renders the part of the app to warm up.
+            prefetch: Starts the lazy external sources to wait for.
+        """
+        if self.warmed_up:
+            return
+        if prefetch:
+            prefetch()
+        _, not_done = concurrent.futures.wait(
+            [
+                source.future
+                for source in get_external_sources()
+                if is_started(source) and source.future
+            ],
+            timeout=self.get_remaining_seconds(),
+        )
+        if not_done:
+            logger.warning(
+                "%d external sources did not load within %s, warming up without them",
+                len(not_done),
+                self.timeout,
+            )
+        started = time.perf_counter()
+        try:
+            with holding_back_lazy_sources():
+                render()
+        except Exception:
+            logger.warning("Warm-up render failed", exc_info=True)
+        else:
+            logger.info("Warmed up in %.3f seconds", time.perf_counter() - started)
+        finally:
+            self._warmed_up.set()
@@ -19,10 +19,21 @@ if TYPE_CHECKING:
         StatisticSubjectMapping,
     )
 
+    from datadoc.readiness import Readiness
+    from datadoc.validation.completeness import CompletenessTracker
+    from datadoc.validation.engine import ValidationEngine
+    from datadoc.validation.naming import ShortNameValidator
+
 
 # Global metadata container
 metadata: Datadoc
 
+completeness: CompletenessTracker
+
+short_name_validator: ShortNameValidator
+
+validation: ValidationEngine
+
 statistic_subject_mapping: StatisticSubjectMapping
 
 unit_types: CodeList
@@ -32,3 +43,9 @@ organisational_units: CodeList
 data_sources: CodeList
 
 measurement_units: CodeList
+
+readiness: Readiness
+
+# The variables missing obligatory metadata, in the order listed when the
+# alert was built, so every page of the alert comes from the same list
+missing_variables_fields: list[tuple[str, list[str]]] = []
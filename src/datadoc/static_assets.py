@@ -0,0 +1,181 @@
+"""Serve the assets under content-hash fingerprints, so browsers cache them for good.
+
+Dash links the CSS and JavaScript in the assets folder with the time they
+were modified in the query string, and browsers revalidate every one of
+them on each page load. Through the JupyterHub proxy each of those round
+trips is slow.
+
+Instead every asset is served under a name with a hash of its content, with
+headers which let the browser use its copy without asking again, and runs
+of small CSS files are bundled into one file. References from the CSS to
+other assets, such as the icon fonts, are rewritten to their fingerprinted
+names.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import flask
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from dash import Dash
+
+ROUTE = "_datadoc-assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPONENT_SUITES_ROUTE = "/_dash-component-suites/"
+# Pass to Dash, so it doesn't link these files itself
+ASSETS_IGNORE = r"\.(css|js)$"
+# Larger CSS files, like Bootstrap, are kept apart so they stay cached when the app's CSS changes
+BUNDLE_MAX_BYTES = 16 * 1024
+FINGERPRINT_LENGTH = 12
+
+CSS_URL = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+EXTERNAL_URL_PREFIXES = ("data:", "http:", "https:", "//", "/", "#")
+
+
+@dataclass(frozen=True)
+class Asset:
+    """The content of an asset, as served."""
+
+    content: bytes
+    mimetype: str
+    etag: str
+
+
+class StaticAssets:
+    """The fingerprinted assets of the app, read once when the app starts.
+
+    Attributes:
+        assets: The assets by fingerprinted name.
+        stylesheets: The URLs of the CSS files and bundles, in the order
+            Dash would have linked the files.
+        scripts: The URLs of the JavaScript files, in the order Dash would
+            have linked them.
+    """
+
+    def __init__(self, folder: Path, url_prefix: str) -> None:
+        """Fingerprint the assets in the folder, and bundle the CSS.
+
+        Args:
+            folder: The assets folder of the app.
+            url_prefix: The URL the assets are served under, including the
+                requests pathname prefix of the app.
+        """
+        self.url_prefix = url_prefix
+        self.assets: dict[str, Asset] = {}
+        self.stylesheets: list[str] = []
+        self.scripts: list[str] = []
+
+        names: dict[Path, str] = {}
+        css_files = []
+        for path in _walk(folder):
+            if path.suffix == ".css":
+                css_files.append(path)
+                continue
+            name = self._add(path.relative_to(folder), path.read_bytes())
+            names[path.resolve()] = name
+            if path.suffix == ".js":
+                self.scripts.append(url_prefix + name)
+
+        # The CSS refers to the other assets, so it is fingerprinted last
+        for group in _group_small_files(css_files):
+            content = "\n".join(
+                f"/* {path.relative_to(folder).as_posix()} */\n"
+                + self._rewrite_urls(path, names)
+                for path in group
+            )
+            relative = (
+                group[0].relative_to(folder) if len(group) == 1 else Path("bundle.css")
+            )
+            name = self._add(relative, content.encode())
+            self.stylesheets.append(url_prefix + name)
+
+    def _add(self, relative: Path, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        name = relative.with_name(
+            f"{relative.stem}.{digest[:FINGERPRINT_LENGTH]}{relative.suffix}",
+        ).as_posix()
+        mimetype = mimetypes.guess_type(relative.name)[0] or "application/octet-stream"
+        self.assets[name] = Asset(content, mimetype, digest)
+        return name
+
+    def _rewrite_urls(self, path: Path, names: dict[Path, str]) -> str:
+        def replace(match: re.Match[str]) -> str:
+            url = match.group(2).strip()
+            if url.startswith(EXTERNAL_URL_PREFIXES):
+                return match.group(0)
+            # Any query string is an earlier fingerprint, and is replaced
+            relative, _, fragment = url.partition("#")
+            name = names.get((path.parent / relative.partition("?")[0]).resolve())
+            if name is None:
+                return match.group(0)
+            fragment = f"#{fragment}" if fragment else ""
+            return f'url("{self.url_prefix}{name}{fragment}")'
+
+        return CSS_URL.sub(replace, path.read_text(encoding="utf-8"))
+
+    def serve(self, name: str) -> flask.Response:
+        """Serve an asset by its fingerprinted name."""
+        asset = self.assets.get(name)
+        if asset is None:
+            flask.abort(404)
+        response = flask.Response(asset.content, mimetype=asset.mimetype)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        # Lets the compressed body be reused, see datadoc.compression
+        response.set_etag(asset.etag)
+        return response
+
+    def init_app(self, app: Dash) -> None:
+        """Serve the assets from the app.
+
+        Dash's own component suites are already fingerprinted, and are also
+        marked as immutable so browsers don't revalidate them on reload.
+        """
+        app.server.add_url_rule(
+            f"{app.config.routes_pathname_prefix}{ROUTE}<path:name>",
+            endpoint="datadoc_assets",
+            view_func=self.serve,
+        )
+
+        @app.server.after_request
+        def mark_component_suites_immutable(
+            response: flask.Response,
+        ) -> flask.Response:
+            if (
+                COMPONENT_SUITES_ROUTE in flask.request.path
+                and response.cache_control.max_age is not None
+            ):
+                response.cache_control.public = True
+                response.cache_control.immutable = True
+            return response
+
+
+def _walk(folder: Path) -> Iterator[Path]:
+    """Find the files in the folder, in the order Dash links them."""
+    for current, _, files in sorted(os.walk(folder)):
+        for file in sorted(files):
+            yield Path(current, file)
+
+
+def _group_small_files(paths: list[Path]) -> Iterator[list[Path]]:
+    """Group runs of small files, keeping the order so the CSS cascade is unchanged."""
+    group: list[Path] = []
+    for path in paths:
+        if path.stat().st_size <= BUNDLE_MAX_BYTES:
+            group.append(path)
+            continue
+        if group:
+            yield group
+            group = []
+        yield [path]
+    if group:
+        yield group
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import importlib
 
 METADATA_DOCUMENT_FILE_SUFFIX = "__DOC.json"
@@ -38,6 +39,10 @@ def get_timestamp_now() -> datetime.datetime:
     return datetime.datetime.now(tz=datetime.timezone.utc)
 
 
+@functools.cache
 def get_app_version() -> str:
-    """Get the version of the Datadoc package."""
+    """Get the version of the Datadoc package.
+
+    Cached, since finding the distribution scans the installed packages.
+    """
     return importlib.metadata.distribution("ssb-datadoc").version
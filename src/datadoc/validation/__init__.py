@@ -0,0 +1,5 @@
+"""Validation of the metadata being edited in Datadoc.
+
+Functionality in this package works directly on the metadata model, so that
+the frontend can show the state of the metadata without saving it first.
+"""
@@ -0,0 +1,267 @@
+"""Live tracking of obligatory metadata which is missing a value.
+
+Each obligatory field is checked by a validation rule. The tracker keeps the
+results of those rules materialized, along with the counts shown in the
+completeness indicators.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from dapla_metadata.datasets import model
+
+from datadoc.frontend.constants import MISSING_OBLIGATORY_FIELD
+from datadoc.frontend.fields.display_dataset import (
+    OBLIGATORY_DATASET_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
+)
+from datadoc.frontend.fields.display_variables import (
+    OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
+)
+from datadoc.validation.engine import RuleScope
+from datadoc.validation.engine import ValidationRule
+from datadoc.validation.engine import next_version
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from dapla_metadata.datasets import Datadoc
+
+logger = logging.getLogger(__name__)
+
+
+def is_missing_value(value: object) -> bool:
+    """Return True if the value does not count as filled in for obligatory metadata.
+
+    Mirrors the rules used when saving the metadata document: `None` is missing,
+    as is a multi-language value without text in any language.
+
+    Examples:
+    >>> is_missing_value(None)
+    True
+    >>> is_missing_value("STATUS")
+    False
+    >>> is_missing_value(model.LanguageStringType([model.LanguageStringTypeItem(languageCode="nb", languageText="")]))
+    True
+    """
+    if value is None:
+        return True
+    if isinstance(value, model.LanguageStringType):
+        return not any(item.languageText for item in value.root or [])
+    return False
+
+
+def _has_value(identifier: str) -> Callable[[object], bool]:
+    def is_valid(metadata: object) -> bool:
+        return not is_missing_value(getattr(metadata, identifier, None))
+
+    return is_valid
+
+
+def _get_obligatory_rules(
+    scope: RuleScope,
+    identifiers_and_display_names: Iterable[tuple[str, str]],
+) -> dict[str, ValidationRule]:
+    return {
+        identifier: ValidationRule(
+            name=f"obligatory_{scope.value}_{identifier}",
+            scope=scope,
+            depends_on=frozenset({identifier}),
+            message=MISSING_OBLIGATORY_FIELD.format(display_name=display_name),
+            is_valid=_has_value(identifier),
+        )
+        for identifier, display_name in identifiers_and_display_names
+    }
+
+
+# The rule checking each obligatory field, in display order
+OBLIGATORY_DATASET_RULES = _get_obligatory_rules(
+    RuleScope.DATASET,
+    OBLIGATORY_DATASET_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
+)
+OBLIGATORY_VARIABLES_RULES = _get_obligatory_rules(
+    RuleScope.VARIABLE,
+    OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS_AND_DISPLAY_NAME,
+)
+
+OBLIGATORY_DATASET_IDENTIFIERS: tuple[str, ...] = tuple(OBLIGATORY_DATASET_RULES)
+OBLIGATORY_VARIABLES_IDENTIFIERS: tuple[str, ...] = tuple(OBLIGATORY_VARIABLES_RULES)
+
+
+def get_missing_obligatory_dataset_fields(dataset: model.Dataset | None) -> list[str]:
+    """Get the obligatory dataset fields which are missing a value, in display order."""
+    return [
+        identifier
+        for identifier, rule in OBLIGATORY_DATASET_RULES.items()
+        if not rule.is_valid(dataset)
+    ]
+
+
+def get_missing_obligatory_variable_fields(variable: model.Variable) -> list[str]:
+    """Get the obligatory fields which are missing a value for one variable, in display order."""
+    return [
+        identifier
+        for identifier, rule in OBLIGATORY_VARIABLES_RULES.items()
+        if not rule.is_valid(variable)
+    ]
+
+
+def get_missing_obligatory_variables_fields(
+    variables: Iterable[model.Variable],
+) -> dict[str, list[str]]:
+    """Get the obligatory fields which are missing a value for each variable.
+
+    Only variables which are missing at least one field are included.
+
+    Returns:
+        A dictionary with the variable short name as key and a list of the
+        missing fields, in display order, as value.
+    """
+    missing_fields: dict[str, list[str]] = {}
+    for variable in variables:
+        if missing := get_missing_obligatory_variable_fields(variable):
+            missing_fields[str(variable.short_name)] = missing
+    return missing_fields
+
+
+class CompletenessTracker:
+    """Keep track of which obligatory metadata fields are missing a value.
+
+    The full metadata document is only examined once, when it is loaded.
+    After that the tracker is kept up to date by reporting each accepted
+    edit, which costs O(1). The version number changes whenever the result
+    changes, which lets the frontend skip updates when nothing has happened.
+    """
+
+    def __init__(self, metadata: Datadoc | None = None) -> None:
+        """Create a tracker, optionally loading the given metadata."""
+        self._missing_dataset_fields: set[str] = set()
+        self._missing_variables_fields: dict[str, set[str]] = {}
+        self._num_missing_variables_fields = 0
+        self._variable_versions: dict[str, int] = {}
+        self._num_obligatory_dataset_fields = 0
+        self.version = next_version()
+        if metadata is not None:
+            self.load(metadata)
+
+    def load(self, metadata: Datadoc) -> None:
+        """Examine all obligatory fields in the given metadata."""
+        self._num_obligatory_dataset_fields = len(OBLIGATORY_DATASET_IDENTIFIERS)
+        self._missing_dataset_fields = set(
+            get_missing_obligatory_dataset_fields(metadata.dataset),
+        )
+        self._missing_variables_fields = {
+            variable.short_name: set(get_missing_obligatory_variable_fields(variable))
+            for variable in metadata.variables
+        }
+        self._num_missing_variables_fields = sum(
+            len(missing) for missing in self._missing_variables_fields.values()
+        )
+        self.version = next_version()
+        self._variable_versions = dict.fromkeys(
+            self._missing_variables_fields,
+            self.version,
+        )
+        logger.debug(
+            "Loaded completeness for %s variables, %s percent complete",
+            len(self._missing_variables_fields),
+            self.percent_complete,
+        )
+
+    def update_dataset_field(self, identifier: str, value: object) -> None:
+        """Register a new value for a dataset field."""
+        if identifier not in OBLIGATORY_DATASET_IDENTIFIERS:
+            return
+        was_missing = identifier in self._missing_dataset_fields
+        if is_missing_value(value) == was_missing:
+            return
+        if was_missing:
+            self._missing_dataset_fields.discard(identifier)
+        else:
+            self._missing_dataset_fields.add(identifier)
+        self.version = next_version()
+
+    def update_variable_field(
+        self,
+        short_name: str,
+        identifier: str,
+        value: object,
+    ) -> None:
+        """Register a new value for a field on the given variable."""
+        if identifier not in OBLIGATORY_VARIABLES_IDENTIFIERS:
+            return
+        missing = self._missing_variables_fields.get(short_name)
+        if missing is None:
+            logger.debug("Variable %s is not tracked", short_name)
+            return
+        was_missing = identifier in missing
+        if is_missing_value(value) == was_missing:
+            return
+        if was_missing:
+            missing.discard(identifier)
+            self._num_missing_variables_fields -= 1
+        else:
+            missing.add(identifier)
+            self._num_missing_variables_fields += 1
+        self.version = next_version()
+        self._variable_versions[short_name] = self.version
+
+    @property
+    def num_obligatory_fields(self) -> int:
+        """The total number of obligatory fields in the metadata document."""
+        return self._num_obligatory_dataset_fields + len(
+            OBLIGATORY_VARIABLES_IDENTIFIERS,
+        ) * len(self._missing_variables_fields)
+
+    @property
+    def num_missing_fields(self) -> int:
+        """The number of obligatory fields which are missing a value."""
+        return len(self._missing_dataset_fields) + self._num_missing_variables_fields
+
+    @property
+    def percent_complete(self) -> int:
+        """The percentage of obligatory fields which have a value."""
+        if self.num_obligatory_fields == 0:
+            return 0
+        return round(
+            (self.num_obligatory_fields - self.num_missing_fields)
+            / self.num_obligatory_fields
+            * 100,
+        )
+
+    def get_missing_dataset_fields(self) -> list[str]:
+        """Get the obligatory dataset fields which are missing, in display order."""
+        return [
+            i
+            for i in OBLIGATORY_DATASET_IDENTIFIERS
+            if i in self._missing_dataset_fields
+        ]
+
+    def get_missing_variable_fields(self, short_name: str) -> list[str]:
+        """Get the obligatory fields missing for one variable, in display order."""
+        missing = self._missing_variables_fields.get(short_name, set())
+        return [i for i in OBLIGATORY_VARIABLES_IDENTIFIERS if i in missing]
+
+    def iter_missing_variables_fields(self) -> Iterator[tuple[str, list[str]]]:
+        """Iterate over the variables which are missing obligatory fields.
+
+        Yields:
+            The short name and the missing fields, in display order, of each
+            variable which is missing any obligatory fields.
+        """
+        for short_name, missing in self._missing_variables_fields.items():
+            if missing:
+                yield short_name, [
+                    i for i in OBLIGATORY_VARIABLES_IDENTIFIERS if i in missing
+                ]
+
+    def num_missing_variable_fields(self, short_name: str) -> int:
+        """Count the obligatory fields missing for one variable."""
+        return len(self._missing_variables_fields.get(short_name, ()))
+
+    def variable_changed_since(self, short_name: str, version: int) -> bool:
+        """Return True if the variable has changed after the given version."""
+        return self._variable_versions.get(short_name, 0) > version
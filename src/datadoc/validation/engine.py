@@ -0,0 +1,355 @@
+"""Incremental validation of dataset and variable metadata.
+
+Each rule declares the identifiers it depends on. When a field is edited
+only the rules depending on that field are evaluated, and only against the
+variable which was edited. The violations are kept in a materialized set
+which is read both when displaying the metadata and when saving it.
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+from typing import Any
+
+from datadoc.frontend.constants import INVALID_DATE_ORDER
+from datadoc.frontend.fields.display_dataset import DISPLAY_DATASET
+from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+from datadoc.frontend.fields.display_variables import DISPLAY_VARIABLES
+from datadoc.frontend.fields.display_variables import VariableIdentifiers
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+    from dapla_metadata.datasets import Datadoc
+    from dapla_metadata.datasets import model
+
+    from datadoc.validation.naming import NamingRule
+    from datadoc.validation.naming import ShortNameValidator
+
+logger = logging.getLogger(__name__)
+
+# Shared between the validation engine and all completeness trackers, so
+# that a version number is never reused, even when a new engine or tracker
+# is created for a newly opened dataset.
+_versions = itertools.count(1)
+
+
+def next_version() -> int:
+    """Get a version number which is higher than any handed out before."""
+    return next(_versions)
+
+
+class RuleScope(Enum):
+    """What a validation rule is evaluated against."""
+
+    DATASET = "dataset"
+    VARIABLE = "variable"
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """A rule which dataset or variable metadata should comply with.
+
+    Attributes:
+        name: Identifies the rule.
+        scope: Whether the rule is evaluated against the dataset or each variable.
+        depends_on: The identifiers of the fields the rule reads.
+        message: Describes the problem to the user.
+        is_valid: Returns True if the given dataset or variable complies with the rule.
+    """
+
+    name: str
+    scope: RuleScope
+    depends_on: frozenset[str]
+    message: str
+    is_valid: Callable[[Any], bool]
+
+
+@dataclass(frozen=True)
+class Violation:
+    """A rule which is broken by the dataset, or by the variable with the given short name."""
+
+    rule: ValidationRule
+    short_name: str | None = None
+
+    @property
+    def message(self) -> str:
+        """Describes the problem to the user."""
+        return self.rule.message
+
+
+def _as_date(value: datetime.date | None) -> datetime.date | None:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+def date_order_is_valid(
+    contains_data_from: datetime.date | None,
+    contains_data_until: datetime.date | None,
+) -> bool:
+    """Check that data isn't contained until a date before it is contained from.
+
+    Examples:
+    >>> date_order_is_valid(datetime.date(2020, 1, 1), datetime.date(2021, 1, 1))
+    True
+    >>> date_order_is_valid(datetime.date(2021, 1, 1), datetime.date(2020, 1, 1))
+    False
+    >>> date_order_is_valid(None, datetime.date(2020, 1, 1))
+    True
+    """
+    contains_data_from = _as_date(contains_data_from)
+    contains_data_until = _as_date(contains_data_until)
+    return (
+        contains_data_from is None
+        or contains_data_until is None
+        or contains_data_from <= contains_data_until
+    )
+
+
+def dates_in_order(metadata: model.Dataset | model.Variable) -> bool:
+    """Check that the metadata doesn't contain data until before it contains data from."""
+    return date_order_is_valid(
+        metadata.contains_data_from,
+        metadata.contains_data_until,
+    )
+
+
+DATASET_DATE_ORDER_RULE = ValidationRule(
+    name="dataset_date_order",
+    scope=RuleScope.DATASET,
+    depends_on=frozenset(
+        {
+            DatasetIdentifiers.CONTAINS_DATA_FROM.value,
+            DatasetIdentifiers.CONTAINS_DATA_UNTIL.value,
+        },
+    ),
+    message=INVALID_DATE_ORDER.format(
+        contains_data_from_display_name=DISPLAY_DATASET[
+            DatasetIdentifiers.CONTAINS_DATA_FROM
+        ].display_name,
+        contains_data_until_display_name=DISPLAY_DATASET[
+            DatasetIdentifiers.CONTAINS_DATA_UNTIL
+        ].display_name,
+    ),
+    is_valid=dates_in_order,
+)
+
+VARIABLE_DATE_ORDER_RULE = ValidationRule(
+    name="variable_date_order",
+    scope=RuleScope.VARIABLE,
+    depends_on=frozenset(
+        {
+            VariableIdentifiers.CONTAINS_DATA_FROM.value,
+            VariableIdentifiers.CONTAINS_DATA_UNTIL.value,
+        },
+    ),
+    message=INVALID_DATE_ORDER.format(
+        contains_data_from_display_name=DISPLAY_VARIABLES[
+            VariableIdentifiers.CONTAINS_DATA_FROM
+        ].display_name,
+        contains_data_until_display_name=DISPLAY_VARIABLES[
+            VariableIdentifiers.CONTAINS_DATA_UNTIL
+        ].display_name,
+    ),
+    is_valid=dates_in_order,
+)
+
+
+def _complies_with_naming_rule(
+    validator: ShortNameValidator,
+    naming_rule: NamingRule,
+) -> Callable[[model.Variable], bool]:
+    def is_valid(variable: model.Variable) -> bool:
+        return naming_rule not in validator.get_violations(variable.short_name)
+
+    return is_valid
+
+
+def get_short_name_rules(validator: ShortNameValidator) -> list[ValidationRule]:
+    """Make validation rules from the naming rules of the given validator.
+
+    The rules look up the validator's cache, so each short name is only
+    checked against the naming rules once.
+    """
+    return [
+        ValidationRule(
+            name=naming_rule.name,
+            scope=RuleScope.VARIABLE,
+            depends_on=frozenset({VariableIdentifiers.SHORT_NAME.value}),
+            message=naming_rule.badge,
+            is_valid=_complies_with_naming_rule(validator, naming_rule),
+        )
+        for naming_rule in validator.rules
+    ]
+
+
+def get_default_rules(validator: ShortNameValidator) -> list[ValidationRule]:
+    """Get the rules Datadoc validates metadata against.
+
+    The obligatory fields are checked by rules of their own, which the
+    completeness tracker evaluates, see `datadoc.validation.completeness`.
+    """
+    return [
+        DATASET_DATE_ORDER_RULE,
+        VARIABLE_DATE_ORDER_RULE,
+        *get_short_name_rules(validator),
+    ]
+
+
+class ValidationEngine:
+    """Keep a materialized set of the validation rules broken by a metadata document.
+
+    All rules are evaluated when the metadata is loaded. After that each
+    accepted edit is reported, and only the rules which depend on the edited
+    field are evaluated again. The version number changes whenever the
+    violations change.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[ValidationRule],
+        metadata: Datadoc | None = None,
+    ) -> None:
+        """Create an engine for the given rules, optionally loading the given metadata."""
+        self.rules = tuple(rules)
+        self._rules_by_identifier: dict[RuleScope, dict[str, list[ValidationRule]]] = {
+            scope: defaultdict(list) for scope in RuleScope
+        }
+        for rule in self.rules:
+            for identifier in rule.depends_on:
+                self._rules_by_identifier[rule.scope][identifier].append(rule)
+        self._metadata: Datadoc | None = None
+        self._dataset_violations: dict[str, Violation] = {}
+        self._variable_violations: dict[str, dict[str, Violation]] = {}
+        self._variable_versions: dict[str, int] = {}
+        self.version = next_version()
+        if metadata is not None:
+            self.load(metadata)
+
+    def load(self, metadata: Datadoc) -> None:
+        """Evaluate all rules against the given metadata."""
+        self._metadata = metadata
+        self._dataset_violations = {}
+        self._variable_violations = {}
+        dataset_rules = [r for r in self.rules if r.scope == RuleScope.DATASET]
+        variable_rules = [r for r in self.rules if r.scope == RuleScope.VARIABLE]
+        if metadata.dataset is not None:
+            self._evaluate_dataset(dataset_rules)
+        for variable in metadata.variables:
+            self._variable_violations[str(variable.short_name)] = {}
+            self._evaluate_variable(variable, variable_rules)
+        self.version = next_version()
+        self._variable_versions = dict.fromkeys(
+            self._variable_violations,
+            self.version,
+        )
+        logger.debug(
+            "Loaded validation for %s variables, %s violations",
+            len(self._variable_violations),
+            len(self.violations),
+        )
+
+    def update_dataset_field(self, identifier: str) -> None:
+        """Evaluate the dataset rules which depend on the given field."""
+        rules = self._rules_by_identifier[RuleScope.DATASET].get(identifier)
+        if not rules or self._metadata is None or self._metadata.dataset is None:
+            return
+        if self._evaluate_dataset(rules):
+            self.version = next_version()
+
+    def update_variable_field(self, short_name: str, identifier: str) -> None:
+        """Evaluate the rules which depend on the given field for one variable."""
+        rules = self._rules_by_identifier[RuleScope.VARIABLE].get(identifier)
+        if not rules or self._metadata is None:
+            return
+        variable = self._metadata.variables_lookup.get(short_name)
+        if variable is None or short_name not in self._variable_violations:
+            logger.debug("Variable %s is not validated", short_name)
+            return
+        if self._evaluate_variable(variable, rules):
+            self.version = next_version()
+            self._variable_versions[short_name] = self.version
+
+    def _evaluate_dataset(self, rules: Iterable[ValidationRule]) -> bool:
+        """Evaluate the rules against the dataset, returning True if the violations changed."""
+        return _evaluate(
+            rules,
+            self._metadata.dataset if self._metadata else None,
+            self._dataset_violations,
+            None,
+        )
+
+    def _evaluate_variable(
+        self,
+        variable: model.Variable,
+        rules: Iterable[ValidationRule],
+    ) -> bool:
+        """Evaluate the rules against a variable, returning True if the violations changed."""
+        short_name = str(variable.short_name)
+        return _evaluate(
+            rules,
+            variable,
+            self._variable_violations[short_name],
+            short_name,
+        )
+
+    @property
+    def violations(self) -> list[Violation]:
+        """All the rules broken by the metadata document."""
+        return [
+            *self._dataset_violations.values(),
+            *(
+                violation
+                for violations in self._variable_violations.values()
+                for violation in violations.values()
+            ),
+        ]
+
+    def get_dataset_violations(self) -> list[Violation]:
+        """Get the rules broken by the dataset."""
+        return list(self._dataset_violations.values())
+
+    def get_variable_violations(self, short_name: str | None) -> list[Violation]:
+        """Get the rules broken by one variable."""
+        return list(self._variable_violations.get(str(short_name), {}).values())
+
+    def variable_changed_since(self, short_name: str, version: int) -> bool:
+        """Return True if the variable's violations have changed after the given version."""
+        return self._variable_versions.get(short_name, 0) > version
+
+
+def _evaluate(
+    rules: Iterable[ValidationRule],
+    target: object,
+    violations: dict[str, Violation],
+    short_name: str | None,
+) -> bool:
+    """Evaluate the rules against the target and update its violations in place.
+
+    Returns:
+        True if the violations changed.
+    """
+    changed = False
+    for rule in rules:
+        try:
+            is_violated = not rule.is_valid(target)
+        except Exception:
+            # A broken rule must not prevent editing the metadata
+            logger.exception("Could not evaluate rule %s for %s", rule.name, short_name)
+            is_violated = False
+        if is_violated == (rule.name in violations):
+            continue
+        if is_violated:
+            violations[rule.name] = Violation(rule, short_name)
+        else:
+            del violations[rule.name]
+        changed = True
+    return changed
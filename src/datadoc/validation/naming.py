@@ -0,0 +1,103 @@
+"""Validation of variable short names against naming rules."""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from datadoc.constants import ILLEGAL_SHORTNAME_BADGE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+SHORT_NAME_PATTERN = re.compile(r"^[a-z0-9_]{3,}$")
+
+
+@dataclass(frozen=True)
+class NamingRule:
+    """A rule which variable short names should comply with.
+
+    Attributes:
+        name: Identifies the rule.
+        badge: Short text displayed on variables which break the rule.
+        is_valid: Returns True if the given short name complies with the rule.
+    """
+
+    name: str
+    badge: str
+    is_valid: Callable[[str], bool]
+
+
+NAMING_STANDARD_RULE = NamingRule(
+    name="naming_standard",
+    badge=ILLEGAL_SHORTNAME_BADGE,
+    is_valid=lambda short_name: SHORT_NAME_PATTERN.match(short_name) is not None,
+)
+
+DEFAULT_NAMING_RULES: tuple[NamingRule, ...] = (NAMING_STANDARD_RULE,)
+
+
+class ShortNameValidator:
+    """Check short names against a set of naming rules, caching the result per name.
+
+    The result for a short name only depends on the rules, so each name is
+    checked once however many times it is displayed or saved. Adding a rule
+    clears the cache.
+
+    Examples:
+    >>> validator = ShortNameValidator()
+    >>> validator.get_violations("pers_id")
+    ()
+    >>> [r.name for r in validator.get_violations("PersId")]
+    ['naming_standard']
+    """
+
+    def __init__(self, rules: Iterable[NamingRule] = DEFAULT_NAMING_RULES) -> None:
+        """Initialize the validator with the given rules."""
+        self._rules: list[NamingRule] = list(rules)
+        self._violations: dict[str, tuple[NamingRule, ...]] = {}
+
+    @property
+    def rules(self) -> tuple[NamingRule, ...]:
+        """The rules short names are checked against."""
+        return tuple(self._rules)
+
+    def add_rule(self, rule: NamingRule) -> None:
+        """Check short names against an additional rule."""
+        self._rules.append(rule)
+        self._violations.clear()
+
+    def validate(self, short_names: Iterable[str | None]) -> None:
+        """Check all the given short names, so later lookups hit the cache."""
+        for short_name in short_names:
+            self.get_violations(short_name)
+
+    def get_violations(self, short_name: str | None) -> tuple[NamingRule, ...]:
+        """Get the rules the given short name breaks."""
+        short_name = short_name or ""
+        try:
+            return self._violations[short_name]
+        except KeyError:
+            violations = tuple(r for r in self._rules if not r.is_valid(short_name))
+            self._violations[short_name] = violations
+            return violations
+
+    def get_badges(self, short_name: str | None) -> list[str]:
+        """Get the badges to display for the given short name."""
+        return [r.badge for r in self.get_violations(short_name)]
+
+    def get_invalid_short_names(
+        self,
+        short_names: Iterable[str | None],
+    ) -> list[str]:
+        """Get the short names which break any of the rules."""
+        return [
+            short_name
+            for short_name in short_names
+            if short_name is not None and self.get_violations(short_name)
+        ]
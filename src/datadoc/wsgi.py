@@ -1,9 +1,17 @@
 """Entrypoint for Gunicorn."""
 
-import concurrent
+import atexit
 
+from . import config
 from .app import get_app
+from .external_sources.loader import ExternalSourcesLoader
 
-with concurrent.futures.ThreadPoolExecutor(max_workers=12) as executor:
-    datadoc_app, _ = get_app(executor)
-    server = datadoc_app.server
+# The loader must outlive this module, otherwise importing it waits for every
+# external source before Gunicorn gets the server.
+external_sources_loader = ExternalSourcesLoader(
+    refresh_interval=config.get_config().external_sources_refresh_interval,
+)
+atexit.register(external_sources_loader.shutdown)
+
+datadoc_app, _ = get_app(external_sources_loader.start())
+server = datadoc_app.server
@@ -0,0 +1 @@
+"""Benchmarks of startup and the paths which scale with the size of the dataset."""
@@ -0,0 +1,75 @@
+"""Synthetic datasets and app setup for the benchmarks."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from datadoc import state
+from datadoc.frontend.callbacks.dataset import open_file
+from datadoc.validation.completeness import CompletenessTracker
+from datadoc.validation.engine import ValidationEngine
+from datadoc.validation.engine import get_default_rules
+from tests.synthetic_datasets import generate_dataset
+
+if TYPE_CHECKING:
+    import pathlib
+
+    from dapla_metadata.datasets import Datadoc
+
+    from tests.stand_in_server import ExternalSourcesStandIn
+
+# Typical, large and very large datasets
+VARIABLE_COUNTS = [10, 1_000, 10_000]
+
+
+@pytest.fixture(scope="session", params=VARIABLE_COUNTS, ids=lambda n: f"{n}vars")
+def synthetic_dataset_path(
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> pathlib.Path:
+    """A dataset with the given number of variables, with half its metadata filled in."""
+    num_variables = request.param
+    return generate_dataset(
+        tmp_path_factory.mktemp(f"{num_variables}vars"),
+        num_variables=num_variables,
+        fill_ratio=0.5,
+    ).path
+
+
+@pytest.fixture
+def external_sources(
+    monkeypatch: pytest.MonkeyPatch,
+    external_sources_stand_in: ExternalSourcesStandIn,
+) -> ExternalSourcesStandIn:
+    """Point the app at the stand-in for the external sources."""
+    monkeypatch.setenv(
+        "DATADOC_KLASS_BASE_URL",
+        external_sources_stand_in.klass_base_url,
+    )
+    monkeypatch.setenv(
+        "DATADOC_STATISTICAL_SUBJECT_SOURCE_URL",
+        external_sources_stand_in.subject_structure_url,
+    )
+    return external_sources_stand_in
+
+
+@pytest.fixture
+def _subject_mapping(subject_mapping_fake_statistical_structure) -> None:
+    state.statistic_subject_mapping = subject_mapping_fake_statistical_structure
+
+
+@pytest.fixture
+def synthetic_metadata(
+    _subject_mapping: None,
+    synthetic_dataset_path: pathlib.Path,
+) -> Datadoc:
+    """Open the synthetic dataset into the state, as when opened in the app."""
+    state.metadata = open_file(str(synthetic_dataset_path))
+    state.completeness = CompletenessTracker(state.metadata)
+    state.validation = ValidationEngine(
+        get_default_rules(state.short_name_validator),
+        state.metadata,
+    )
+    return state.metadata
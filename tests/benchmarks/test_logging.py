@@ -0,0 +1,46 @@
+"""Benchmarks of formatting log records, in records per second (OPS)."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+from typing import Literal
+
+import pytest
+
+from datadoc.logging_configuration.json_formatter import DatadocJSONFormatter
+from datadoc.logging_configuration.logging_config import get_log_config
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+@pytest.fixture
+def record() -> logging.LogRecord:
+    """A typical record of a field edit, with the request context."""
+    record = logging.LogRecord(
+        "datadoc.frontend.callbacks.variables",
+        logging.INFO,
+        __file__,
+        1,
+        "Updated %s: %s with value %s",
+        ("var_0", "definition_uri", "https://www.ssb.no/a/metadata/definisjoner"),
+        None,
+    )
+    record.request_id = record.session_id = "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4"
+    record.callback = "callback_variables_metadata_input"
+    record.elapsed_ms = 12.3
+    return record
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_format_json(
+    benchmark: BenchmarkFixture,
+    record: logging.LogRecord,
+    backend: Literal["json", "orjson"],
+):
+    formatter = DatadocJSONFormatter(
+        fmt_keys=get_log_config()["formatters"]["json"]["fmt_keys"],
+        backend=backend,
+    )
+    benchmark(formatter.format, record)
@@ -0,0 +1,53 @@
+"""Benchmarks of starting the app and opening datasets."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from plotly.io.json import to_json_plotly
+
+from datadoc.app import get_app
+from datadoc.external_sources.loader import ExternalSourcesLoader
+from datadoc.frontend.callbacks.dataset import open_file
+
+if TYPE_CHECKING:
+    import concurrent.futures
+    import pathlib
+    from collections.abc import Iterator
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+@pytest.fixture
+def executor() -> Iterator[concurrent.futures.ThreadPoolExecutor]:
+    with ExternalSourcesLoader() as executor:
+        yield executor
+
+
+@pytest.mark.usefixtures("external_sources")
+def test_get_app(
+    benchmark: BenchmarkFixture,
+    executor: concurrent.futures.ThreadPoolExecutor,
+    synthetic_dataset_path: pathlib.Path,
+):
+    app, _ = benchmark(get_app, executor, str(synthetic_dataset_path))
+    assert app.layout is not None
+
+
+@pytest.mark.usefixtures("_subject_mapping")
+def test_open_file(
+    benchmark: BenchmarkFixture,
+    synthetic_dataset_path: pathlib.Path,
+):
+    metadata = benchmark(open_file, str(synthetic_dataset_path))
+    assert metadata.variables
+
+
+@pytest.mark.usefixtures("external_sources")
+def test_serialize_layout(
+    benchmark: BenchmarkFixture,
+    executor: concurrent.futures.ThreadPoolExecutor,
+):
+    app, _ = get_app(executor)
+    assert benchmark(to_json_plotly, app.layout)
@@ -0,0 +1,88 @@
+"""Benchmarks of the callbacks which scale with the number of variables."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from plotly.io.json import to_json_plotly
+
+from datadoc.frontend.callbacks.utils import save_metadata_and_generate_alerts
+from datadoc.frontend.callbacks.variables import populate_variables_workspace
+from datadoc.frontend.callbacks.variables import (
+    set_variables_value_multilanguage_inherit_dataset_values,
+)
+from datadoc.frontend.callbacks.variables import (
+    set_variables_values_inherit_dataset_derived_date_values,
+)
+from datadoc.frontend.callbacks.variables import (
+    set_variables_values_inherit_dataset_values,
+)
+from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+
+if TYPE_CHECKING:
+    from dapla_metadata.datasets import Datadoc
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+def test_populate_variables_workspace(
+    benchmark: BenchmarkFixture,
+    synthetic_metadata: Datadoc,
+):
+    workspace = benchmark(
+        populate_variables_workspace,
+        synthetic_metadata.variables,
+        "",
+        0,
+    )
+    assert len(workspace) == len(synthetic_metadata.variables)
+
+
+def test_serialize_variables_workspace(
+    benchmark: BenchmarkFixture,
+    synthetic_metadata: Datadoc,
+):
+    workspace = populate_variables_workspace(synthetic_metadata.variables, "", 0)
+    assert benchmark(to_json_plotly, workspace)
+
+
+def test_save_metadata_and_generate_alerts(
+    benchmark: BenchmarkFixture,
+    synthetic_metadata: Datadoc,
+):
+    assert benchmark(save_metadata_and_generate_alerts, synthetic_metadata)
+
+
+def test_inherit_dataset_values(
+    benchmark: BenchmarkFixture,
+    synthetic_metadata: Datadoc,
+):
+    benchmark(
+        set_variables_values_inherit_dataset_values,
+        "01",
+        DatasetIdentifiers.DATA_SOURCE,
+    )
+    assert synthetic_metadata.variables[-1].data_source == "01"
+
+
+def test_inherit_dataset_multilanguage_values(
+    benchmark: BenchmarkFixture,
+    synthetic_metadata: Datadoc,
+):
+    benchmark(
+        set_variables_value_multilanguage_inherit_dataset_values,
+        "Personer bosatt i Norge",
+        DatasetIdentifiers.POPULATION_DESCRIPTION,
+        "nb",
+    )
+    assert synthetic_metadata.variables[-1].population_description
+
+
+def test_inherit_dataset_derived_date_values(
+    benchmark: BenchmarkFixture,
+    synthetic_metadata: Datadoc,
+):
+    benchmark(set_variables_values_inherit_dataset_derived_date_values)
+    assert (
+        synthetic_metadata.variables[-1].contains_data_from
+        == synthetic_metadata.dataset.contains_data_from
+    )
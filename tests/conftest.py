@@ -23,8 +23,14 @@ from dapla_metadata.datasets.code_list import CodeList
 from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
 from dapla_metadata.datasets.user_info import TestUserInfo
 
+from datadoc import config
 from datadoc import state
+from datadoc.validation.completeness import CompletenessTracker
+from datadoc.validation.engine import ValidationEngine
+from datadoc.validation.engine import get_default_rules
+from datadoc.validation.naming import ShortNameValidator
 
+from .stand_in_server import ExternalSourcesStandIn
 from .utils import TEST_EXISTING_METADATA_DIRECTORY
 from .utils import TEST_PARQUET_FILE_NAME
 from .utils import TEST_PARQUET_FILE_NAME_ILLEGAL_SHORTNAMES
@@ -33,6 +39,7 @@ from .utils import TEST_PARQUET_FILEPATH_ILLEGAL_SHORTNAMES
 from .utils import TEST_RESOURCES_DIRECTORY
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
     from pytest_mock import MockerFixture
@@ -42,12 +49,28 @@ logging.getLogger("faker").setLevel(logging.ERROR)
 DATADOC_METADATA_MODULE = "dapla_metadata.datasets"
 CODE_LIST_DIR = "code_list"
 STATISTICAL_SUBJECT_STRUCTURE_DIR = "statistical_subject_structure"
+BENCHMARKS_DIRECTORY = pathlib.Path(__file__).parent / "benchmarks"
+
+
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> bool | None:
+    """Only collect the benchmarks when running with --benchmark-only.
+
+    They are slow, and need pytest-benchmark. Run them with `nox -s benchmarks`.
+    """
+    if collection_path == BENCHMARKS_DIRECTORY:
+        return not getattr(config.option, "benchmark_only", False)
+    return None
 
 
 @pytest.fixture(autouse=True)
-def _clear_environment(mocker: MockerFixture) -> None:
-    """Ensure that the environment is cleared."""
-    mocker.patch.dict(os.environ, clear=True)
+def _clear_environment(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Ensure that the environment is cleared, and the config snapshot read from it."""
+    mocker.patch.dict(
+        os.environ,
+        {"DATADOC_EXTERNAL_SOURCES_CACHE_DIRECTORY": str(tmp_path / "cache")},
+        clear=True,
+    )
+    config.load_config()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -120,6 +143,10 @@ def _clear_state() -> None:
         del state.statistic_subject_mapping
     except AttributeError:
         pass
+    state.completeness = CompletenessTracker()
+    state.short_name_validator = ShortNameValidator()
+    state.validation = ValidationEngine(get_default_rules(state.short_name_validator))
+    state.missing_variables_fields = []
 
 
 @pytest.fixture
@@ -300,3 +327,24 @@ def copy_dataset_to_path(
     temporary_dataset.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy(TEST_PARQUET_FILEPATH, temporary_dataset)
     return temporary_dataset
+
+
+@pytest.fixture
+def external_sources_stand_in(
+    code_list_csv_filepath_nb: pathlib.Path,
+    code_list_csv_filepath_en: pathlib.Path,
+) -> Iterator[ExternalSourcesStandIn]:
+    codes = {
+        language: pd.read_csv(path, converters={"code": str})
+        .loc[:, ["code", "name"]]
+        .to_dict("records")
+        for language, path in (
+            ("nb", code_list_csv_filepath_nb),
+            ("en", code_list_csv_filepath_en),
+        )
+    }
+    subject_structure = (
+        TEST_RESOURCES_DIRECTORY / STATISTICAL_SUBJECT_STRUCTURE_DIR / "simple.xml"
+    ).read_text(encoding="utf-8")
+    with ExternalSourcesStandIn({100: codes}, subject_structure) as stand_in:
+        yield stand_in
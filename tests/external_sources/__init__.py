@@ -0,0 +1 @@
+"""Unit tests for the external_sources package."""
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import datetime
+import json
+import time
+from typing import TYPE_CHECKING
+
+from datadoc.external_sources.cache import DiskCache
+
+if TYPE_CHECKING:
+    import pathlib
+
+TTL = datetime.timedelta(hours=1)
+
+
+def test_put_and_get(tmp_path: pathlib.Path):
+    cache = DiskCache(tmp_path / "cache", TTL)
+    cache.put("key", {"nb": [{"code": "01", "name": "Adresse"}]})
+    entry = cache.get("key")
+    assert entry is not None
+    assert entry.data == {"nb": [{"code": "01", "name": "Adresse"}]}
+    assert not entry.is_stale(TTL)
+
+
+def test_get_missing(tmp_path: pathlib.Path):
+    assert DiskCache(tmp_path, TTL).get("key") is None
+
+
+def test_get_corrupt(tmp_path: pathlib.Path):
+    (tmp_path / "key.json").write_text("{not json", encoding="utf-8")
+    assert DiskCache(tmp_path, TTL).get("key") is None
+
+
+def test_stale_entry(tmp_path: pathlib.Path):
+    fetched_at = time.time() - TTL.total_seconds() - 1
+    (tmp_path / "key.json").write_text(
+        json.dumps({"fetched_at": fetched_at, "data": []}),
+        encoding="utf-8",
+    )
+    entry = DiskCache(tmp_path, TTL).get("key")
+    assert entry is not None
+    assert entry.is_stale(TTL)
+
+
+def test_put_replaces_entry_without_leaving_temporary_files(tmp_path: pathlib.Path):
+    cache = DiskCache(tmp_path, TTL)
+    cache.put("key", 1)
+    cache.put("key", 2)
+    entry = cache.get("key")
+    assert entry is not None
+    assert entry.data == 2  # noqa: PLR2004
+    assert [p.name for p in tmp_path.iterdir()] == ["key.json"]
+
+
+def test_put_unserializable(tmp_path: pathlib.Path):
+    cache = DiskCache(tmp_path, TTL)
+    cache.put("key", object())
+    assert cache.get("key") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_put_and_get_validators(tmp_path: pathlib.Path):
+    cache = DiskCache(tmp_path, TTL)
+    cache.put("key", [], {"nb": {"etag": '"abc"', "last_modified": None}})
+    entry = cache.get("key")
+    assert entry is not None
+    assert entry.validators == {"nb": {"etag": '"abc"', "last_modified": None}}
+
+
+def test_get_entry_without_validators(tmp_path: pathlib.Path):
+    (tmp_path / "key.json").write_text(
+        json.dumps({"fetched_at": time.time(), "data": []}),
+        encoding="utf-8",
+    )
+    entry = DiskCache(tmp_path, TTL).get("key")
+    assert entry is not None
+    assert entry.validators == {}
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+from datadoc.external_sources.index import CodeIndex
+from datadoc.external_sources.index import IndexedCode
+from datadoc.external_sources.index import get_code_index
+
+if TYPE_CHECKING:
+    from dapla_metadata.datasets.code_list import CodeList
+    from dapla_metadata.datasets.statistic_subject_mapping import (
+        StatisticSubjectMapping,
+    )
+
+NB = SupportedLanguages.NORSK_BOKMÅL
+NN = SupportedLanguages.NORSK_NYNORSK
+EN = SupportedLanguages.ENGLISH
+
+
+def test_code_list_index(code_list_fake_structure: CodeList):
+    code_list_fake_structure.wait_for_external_result()
+    index = get_code_index(code_list_fake_structure)
+
+    assert [code.code for code in index] == ["01", "02", "03"]
+    assert index.get_title("02", NB) == "Arbeidsulykke"
+    assert index.get_title("02", NN) == "Arbeidsulykke"
+    assert index.get_title("99", NB) is None
+    assert index.get_code("Bolig", NB) == "03"
+    assert index.get_code("Bolig", EN) == "03"
+    assert index.get_code("Finnes ikke", NB) is None
+    assert "01" in index
+    assert len(index) == 3  # noqa: PLR2004
+
+
+def test_subject_mapping_index(
+    subject_mapping_fake_statistical_structure: StatisticSubjectMapping,
+):
+    subject_mapping_fake_statistical_structure.wait_for_external_result()
+    index = get_code_index(subject_mapping_fake_statistical_structure)
+
+    assert index.get_title("aa", EN) == "aa english"
+    assert index.get_title("aa", NN) == "aa norwegian"
+    secondary = index.get("ab01")
+    assert secondary is not None
+    assert secondary.parent == "ab"
+    assert [code.code for code in index.with_prefix("aa")] == ["aa", "aa00", "aa01"]
+
+
+def test_index_rebuilt_for_new_version(code_list_fake_structure: CodeList):
+    code_list_fake_structure.wait_for_external_result()
+    index = get_code_index(code_list_fake_structure)
+    assert get_code_index(code_list_fake_structure) is index
+
+    code_list_fake_structure.version = 1  # type: ignore [attr-defined]
+    assert get_code_index(code_list_fake_structure) is not index
+
+
+def test_first_duplicate_wins():
+    index = CodeIndex(
+        [
+            IndexedCode("01", {NB: "Adresse"}),
+            IndexedCode("01", {NB: "Duplikat"}),
+            IndexedCode("02", {NB: "Adresse"}),
+        ],
+    )
+    assert index.get_title("01", NB) == "Adresse"
+    assert index.get_code("Adresse", NB) == "01"
+    assert index.with_prefix("3") == []
+    assert index.get_title("02", EN) == ""
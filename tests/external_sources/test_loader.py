@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import datetime
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from datadoc import state
+from datadoc.app import get_app
+from datadoc.external_sources.loader import ExternalSourcesLoader
+from datadoc.external_sources.loader import external_sources_loaded
+from datadoc.external_sources.loader import get_external_sources
+from datadoc.external_sources.loader import is_started
+from datadoc.external_sources.loader import prefetch_external_sources
+from datadoc.external_sources.loader import refresh_external_sources
+from datadoc.external_sources.sources import CachedCodeList
+from datadoc.frontend.callbacks.utils import check_external_sources_loaded
+from datadoc.frontend.fields.display_base import DROPDOWN_LOADING_OPTION
+from datadoc.frontend.fields.display_base import track_loading_options
+from datadoc.frontend.fields.display_dataset import get_unit_type_options
+from datadoc.frontend.fields.display_variables import get_measurement_unit_options
+
+if TYPE_CHECKING:
+    from tests.stand_in_server import ExternalSourcesStandIn
+
+SLOW_SOURCE_DELAY_SECONDS = 1.0
+CLASSIFICATION_ID = 100
+
+
+@pytest.fixture
+def slow_external_sources(
+    monkeypatch: pytest.MonkeyPatch,
+    external_sources_stand_in: ExternalSourcesStandIn,
+) -> ExternalSourcesStandIn:
+    external_sources_stand_in.delay = SLOW_SOURCE_DELAY_SECONDS
+    monkeypatch.setenv(
+        "DATADOC_KLASS_BASE_URL",
+        external_sources_stand_in.klass_base_url,
+    )
+    monkeypatch.setenv(
+        "DATADOC_STATISTICAL_SUBJECT_SOURCE_URL",
+        external_sources_stand_in.subject_structure_url,
+    )
+    monkeypatch.setenv("DATADOC_UNIT_CODE", "100")
+    monkeypatch.setenv("DATADOC_MEASUREMENT_UNIT", "100")
+    return external_sources_stand_in
+
+
+def test_loader_lifecycle():
+    loader = ExternalSourcesLoader(max_workers=1)
+    with pytest.raises(RuntimeError):
+        _ = loader.executor
+    executor = loader.start()
+    assert loader.start() is executor
+    assert loader.executor is executor
+    loader.shutdown()
+    assert not loader.started
+    with pytest.raises(RuntimeError):
+        executor.submit(time.sleep, 0)
+    # Shutting down twice is harmless
+    loader.shutdown()
+
+
+def test_shutdown_does_not_wait_for_running_fetches():
+    loader = ExternalSourcesLoader(max_workers=1)
+    loader.start().submit(time.sleep, SLOW_SOURCE_DELAY_SECONDS)
+    started = time.perf_counter()
+    loader.shutdown()
+    assert time.perf_counter() - started < SLOW_SOURCE_DELAY_SECONDS
+
+
+@pytest.mark.usefixtures("slow_external_sources")
+def test_startup_latency_with_slow_external_sources():
+    """Startup must not wait for external sources, however slow they are."""
+    with ExternalSourcesLoader() as executor:
+        started = time.perf_counter()
+        get_app(executor)
+        startup_seconds = time.perf_counter() - started
+
+        assert startup_seconds < SLOW_SOURCE_DELAY_SECONDS, (
+            f"Startup took {startup_seconds:.3f}s, "
+            f"the external sources take {SLOW_SOURCE_DELAY_SECONDS}s"
+        )
+        assert not external_sources_loaded()
+
+
+@pytest.mark.usefixtures("slow_external_sources")
+def test_dropdowns_hydrate_when_data_arrives():
+    with ExternalSourcesLoader() as executor:
+        get_app(executor)
+
+        options, shown = track_loading_options(get_unit_type_options)
+        assert options == [{"title": DROPDOWN_LOADING_OPTION, "id": ""}]
+        assert shown
+        assert check_external_sources_loaded([shown]) == (False, False)
+
+        for source in get_external_sources():
+            source.wait_for_external_result()
+
+        # Each session hydrates from its own flags, so one session
+        # hydrating doesn't stop another
+        assert check_external_sources_loaded([False, shown]) == (True, True)
+        assert check_external_sources_loaded([shown]) == (True, True)
+        options, shown = track_loading_options(get_unit_type_options)
+        # The workspaces are only rendered again once
+        assert check_external_sources_loaded([shown, None]) == (False, True)
+        assert len(get_measurement_unit_options()) > 1
+        assert state.unit_types.classifications[0].code == "01"
+
+
+def test_no_hydration_when_loaded_before_render(
+    slow_external_sources: ExternalSourcesStandIn,
+):
+    slow_external_sources.delay = 0
+    with ExternalSourcesLoader() as executor:
+        get_app(executor)
+        for source in get_external_sources():
+            source.wait_for_external_result()
+
+        options, shown = track_loading_options(get_unit_type_options)
+        assert DROPDOWN_LOADING_OPTION not in {option["title"] for option in options}
+        assert check_external_sources_loaded([shown]) == (False, True)
+
+
+def test_periodic_refresh(
+    mocker,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    loader = ExternalSourcesLoader(
+        refresh_interval=datetime.timedelta(seconds=0.05),
+    )
+    with loader as executor:
+        code_list = CachedCodeList(
+            executor,
+            CLASSIFICATION_ID,
+            None,
+            external_sources_stand_in.klass_base_url,
+        )
+        code_list.wait_for_external_result()
+        mocker.patch(
+            "datadoc.external_sources.loader.get_external_sources",
+            return_value=[code_list],
+        )
+        external_sources_stand_in.codes[CLASSIFICATION_ID]["nb"] = [
+            {"code": "42", "name": "Ny"},
+        ]
+        deadline = time.monotonic() + 5
+        while code_list.version == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert code_list.classifications[0].code == "42"
+
+
+def test_refresh_skips_sources_without_refresh(mocker):
+    source = mocker.MagicMock(spec=["check_if_external_data_is_loaded"])
+    broken = mocker.MagicMock()
+    broken.refresh.side_effect = ValueError
+    mocker.patch(
+        "datadoc.external_sources.loader.get_external_sources",
+        return_value=[source, broken],
+    )
+    assert refresh_external_sources() == 0
+
+
+def test_lazy_sources_ignored_until_prefetched(
+    mocker,
+    thread_pool_executor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        None,
+        external_sources_stand_in.klass_base_url,
+        lazy=True,
+    )
+    mocker.patch.object(state, "unit_types", code_list, create=True)
+    mocker.patch(
+        "datadoc.external_sources.loader.get_external_sources",
+        return_value=[code_list],
+    )
+    assert external_sources_loaded()
+    assert refresh_external_sources() == 0
+    assert not code_list.started
+
+    prefetch_external_sources("unit_types", "not_a_source")
+    assert code_list.started
+    code_list.wait_for_external_result()
+    assert external_sources_loaded()
+
+
+def test_warm_up_starts_only_prefetched_sources(
+    monkeypatch: pytest.MonkeyPatch,
+    slow_external_sources: ExternalSourcesStandIn,
+):
+    slow_external_sources.delay = 0
+    monkeypatch.setenv("DATADOC_PREFETCH_EXTERNAL_SOURCES", "unit_types")
+    with ExternalSourcesLoader() as executor:
+        get_app(executor)
+        assert state.readiness.wait_until_warmed_up(timeout=10)
+
+        assert is_started(state.unit_types)
+        assert not is_started(state.organisational_units)
+        assert not is_started(state.data_sources)
+        # The first dropdown which needs a source starts it
+        options, shown = track_loading_options(get_unit_type_options)
+        assert not shown
+        assert len(options) > 1
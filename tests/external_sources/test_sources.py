@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import json
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+from datadoc.external_sources.cache import DiskCache
+from datadoc.external_sources.sources import CachedCodeList
+from datadoc.external_sources.sources import CachedStatisticSubjectMapping
+from tests.conftest import STATISTICAL_SUBJECT_STRUCTURE_DIR
+from tests.utils import TEST_RESOURCES_DIRECTORY
+
+if TYPE_CHECKING:
+    import pathlib
+
+    from tests.stand_in_server import ExternalSourcesStandIn
+
+TTL = datetime.timedelta(hours=1)
+CLASSIFICATION_ID = 100
+
+
+def _write_entry(cache: DiskCache, key: str, data: object, age: float) -> None:
+    cache.directory.mkdir(parents=True, exist_ok=True)
+    (cache.directory / f"{key}.json").write_text(
+        json.dumps({"fetched_at": time.time() - age, "data": data}),
+        encoding="utf-8",
+    )
+
+
+def test_code_list_fetched_and_cached(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    classifications = code_list.classifications
+    assert classifications[0].code == "01"
+    assert classifications[0].get_title(SupportedLanguages.NORSK_BOKMÅL) == "Adresse"
+    assert classifications[0].get_title(SupportedLanguages.ENGLISH) == "Adresse"
+    assert len(external_sources_stand_in.requests) == 2  # noqa: PLR2004
+
+    # A new process is served from the cache without any requests
+    cached_code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    assert cached_code_list.classifications == classifications
+    assert cached_code_list.refresh_future is None
+    assert len(external_sources_stand_in.requests) == 2  # noqa: PLR2004
+
+
+def test_stale_code_list_served_then_refreshed(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    _write_entry(
+        cache,
+        f"klass_codes_{CLASSIFICATION_ID}",
+        {"nb": [{"code": "99", "name": "Stale"}]},
+        TTL.total_seconds() + 1,
+    )
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    code_list.wait_for_external_result()
+    assert code_list.classifications[0].code == "99"
+
+    assert code_list.refresh_future is not None
+    code_list.refresh_future.result()
+    assert code_list.classifications[0].code == "01"
+    entry = cache.get(code_list.cache_key)
+    assert entry is not None
+    assert not entry.is_stale(TTL)
+
+
+def test_code_list_unavailable_source(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        404,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    assert code_list.classifications == []
+    assert cache.get(code_list.cache_key) is None
+
+
+def test_subject_mapping_fetched_and_cached(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    mapping = CachedStatisticSubjectMapping(
+        thread_pool_executor,
+        external_sources_stand_in.subject_structure_url,
+        cache,
+    )
+    mapping.wait_for_external_result()
+    assert [p.subject_code for p in mapping.primary_subjects] == ["aa"]
+
+    cached_mapping = CachedStatisticSubjectMapping(
+        thread_pool_executor,
+        external_sources_stand_in.subject_structure_url,
+        cache,
+    )
+    cached_mapping.wait_for_external_result()
+    assert cached_mapping.get_secondary_subject("aa_kortnvan") == "aa00"
+    assert len(external_sources_stand_in.requests) == 1
+
+
+def test_stale_subject_mapping_refreshed(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    _write_entry(
+        cache,
+        CachedStatisticSubjectMapping.cache_key,
+        "<result><emnestruktur></emnestruktur></result>",
+        TTL.total_seconds() + 1,
+    )
+    mapping = CachedStatisticSubjectMapping(
+        thread_pool_executor,
+        external_sources_stand_in.subject_structure_url,
+        cache,
+    )
+    mapping.wait_for_external_result()
+    assert mapping.refresh_future is not None
+    mapping.refresh_future.result()
+    assert [p.subject_code for p in mapping.primary_subjects] == ["aa"]
+
+
+def test_lazy_code_list_fetched_on_first_access(
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        None,
+        external_sources_stand_in.klass_base_url,
+        lazy=True,
+    )
+    assert not code_list.started
+    assert external_sources_stand_in.requests == []
+
+    assert not code_list.check_if_external_data_is_loaded()
+    assert code_list.started
+    code_list.wait_for_external_result()
+    assert code_list.check_if_external_data_is_loaded()
+    assert code_list.classifications[0].code == "01"
+
+
+def test_lazy_code_list_classifications_start_fetch(
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        None,
+        external_sources_stand_in.klass_base_url,
+        lazy=True,
+    )
+    assert code_list.classifications[0].code == "01"
+
+
+def test_lazy_code_list_accessed_after_shutdown(
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    code_list = CachedCodeList(
+        executor,
+        CLASSIFICATION_ID,
+        None,
+        external_sources_stand_in.klass_base_url,
+        lazy=True,
+    )
+    executor.shutdown()
+
+    assert code_list.check_if_external_data_is_loaded()
+    assert code_list.classifications[0].code == "01"
+
+
+def test_code_list_refresh_unchanged(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    classifications = code_list.classifications
+
+    assert not code_list.refresh()
+    assert external_sources_stand_in.statuses[-2:] == [
+        HTTPStatus.NOT_MODIFIED,
+        HTTPStatus.NOT_MODIFIED,
+    ]
+    assert code_list.version == 0
+    assert code_list.classifications is classifications
+
+
+def test_code_list_refresh_swaps_in_new_version(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    assert code_list.classifications[0].code == "01"
+
+    external_sources_stand_in.codes[CLASSIFICATION_ID]["nb"] = [
+        {"code": "42", "name": "Ny"},
+    ]
+    assert code_list.refresh()
+    assert code_list.version == 1
+    assert code_list.classifications[0].code == "42"
+    # Only the changed language was sent again
+    assert external_sources_stand_in.statuses[-2:] == [
+        HTTPStatus.OK,
+        HTTPStatus.NOT_MODIFIED,
+    ]
+
+    # The validators are cached, so a new process makes conditional requests too
+    cached_code_list = CachedCodeList(
+        thread_pool_executor,
+        CLASSIFICATION_ID,
+        cache,
+        external_sources_stand_in.klass_base_url,
+    )
+    cached_code_list.wait_for_external_result()
+    assert not cached_code_list.refresh()
+    assert cached_code_list.classifications[0].code == "42"
+
+
+def test_subject_mapping_refresh(
+    tmp_path: pathlib.Path,
+    thread_pool_executor: concurrent.futures.ThreadPoolExecutor,
+    external_sources_stand_in: ExternalSourcesStandIn,
+):
+    cache = DiskCache(tmp_path, TTL)
+    mapping = CachedStatisticSubjectMapping(
+        thread_pool_executor,
+        external_sources_stand_in.subject_structure_url,
+        cache,
+    )
+    mapping.wait_for_external_result()
+    assert [p.subject_code for p in mapping.primary_subjects] == ["aa"]
+
+    assert not mapping.refresh()
+    assert external_sources_stand_in.statuses[-1] == HTTPStatus.NOT_MODIFIED
+
+    external_sources_stand_in.subject_structure = (
+        TEST_RESOURCES_DIRECTORY
+        / STATISTICAL_SUBJECT_STRUCTURE_DIR
+        / "extract_secondary_subject.xml"
+    ).read_text(encoding="utf-8")
+    assert mapping.refresh()
+    assert mapping.version == 1
+    assert [p.subject_code for p in mapping.primary_subjects] == ["aa", "ab"]
@@ -1,3 +1,4 @@
+import datetime
 from dataclasses import dataclass
 from unittest import mock
 
@@ -5,14 +6,29 @@ import dash_bootstrap_components as dbc
 import pytest
 from dapla_metadata.datasets import model
 from dash import html
+from dash import no_update
 
 from datadoc import state
 from datadoc.frontend.callbacks.utils import check_variable_names
 from datadoc.frontend.callbacks.utils import find_existing_language_string
+from datadoc.frontend.callbacks.utils import get_metadata_version
+from datadoc.frontend.callbacks.utils import get_missing_obligatory_fields_text
+from datadoc.frontend.callbacks.utils import get_variable_sub_header
 from datadoc.frontend.callbacks.utils import render_tabs
 from datadoc.frontend.callbacks.utils import save_metadata_and_generate_alerts
+from datadoc.frontend.callbacks.utils import update_completeness_indicators
+from datadoc.frontend.callbacks.utils import validation_control
 from datadoc.frontend.components.identifiers import ACCORDION_WRAPPER_ID
 from datadoc.frontend.components.identifiers import SECTION_WRAPPER_ID
+from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+from datadoc.frontend.fields.display_variables import VariableIdentifiers
+from datadoc.validation.completeness import CompletenessTracker
+from datadoc.validation.engine import VARIABLE_DATE_ORDER_RULE
+from datadoc.validation.engine import RuleScope
+from datadoc.validation.engine import ValidationEngine
+from datadoc.validation.engine import ValidationRule
+from datadoc.validation.engine import get_short_name_rules
+from datadoc.validation.naming import ShortNameValidator
 
 
 def test_find_existing_language_string_no_existing_strings(bokmål_name: str):
@@ -88,12 +104,16 @@ def test_save_and_generate_alerts():
         Variable(short_name="var illegal"),
     ]
     state.metadata = mock_metadata
+    state.validation = ValidationEngine(
+        get_short_name_rules(ShortNameValidator()),
+        mock_metadata,
+    )
     result = save_metadata_and_generate_alerts(
         mock_metadata,
     )
-    assert (result[1] and result[2]) is None
+    assert (result[1] and result[2] and result[3]) is None
     assert isinstance(result[0], dbc.Alert)
-    assert isinstance(result[3], dbc.Alert)
+    assert isinstance(result[4], dbc.Alert)
 
 
 @pytest.mark.parametrize(
@@ -111,7 +131,11 @@ def test_illegal_shortname(shortname: str):
         short_name: str
 
     mock_metadata = mock.Mock(variables=[MockVariable(short_name=shortname)])
-    assert isinstance(check_variable_names(mock_metadata.variables), dbc.Alert)
+    engine = ValidationEngine(
+        get_short_name_rules(ShortNameValidator()),
+        mock_metadata,
+    )
+    assert isinstance(check_variable_names(engine), dbc.Alert)
 
 
 @pytest.mark.parametrize(
@@ -128,4 +152,124 @@ def test_legal_shortname(shortname: str):
         short_name: str
 
     mock_metadata = mock.Mock(variables=[MockVariable(short_name=shortname)])
-    assert check_variable_names(mock_metadata.variables) is None
+    engine = ValidationEngine(
+        get_short_name_rules(ShortNameValidator()),
+        mock_metadata,
+    )
+    assert check_variable_names(engine) is None
+
+
+def test_update_completeness_indicators_no_change(metadata):
+    tracker = CompletenessTracker(metadata)
+    engine = ValidationEngine([], metadata)
+    assert update_completeness_indicators(
+        tracker,
+        engine,
+        get_metadata_version(tracker, engine),
+        [],
+    ) == (
+        no_update,
+        no_update,
+        no_update,
+        no_update,
+    )
+
+
+def test_update_completeness_indicators_only_changed_variables(
+    metadata,
+    language_object,
+):
+    tracker = CompletenessTracker(metadata)
+    engine = ValidationEngine([], metadata)
+    version = get_metadata_version(tracker, engine)
+    changed, unchanged = (v.short_name for v in metadata.variables[:2])
+    tracker.update_variable_field(changed, "name", language_object)
+    assert get_metadata_version(tracker, engine) > version
+
+    value, label, sub_headers, new_version = update_completeness_indicators(
+        tracker,
+        engine,
+        version,
+        [
+            {"type": "variables-accordion", "id": f"{changed}-1"},
+            {"type": "variables-accordion", "id": f"{unchanged}-1"},
+        ],
+    )
+    assert value == tracker.percent_complete
+    assert label == f"{tracker.percent_complete} %"
+    assert sub_headers == [
+        get_missing_obligatory_fields_text(
+            tracker.num_missing_variable_fields(changed),
+        ),
+        no_update,
+    ]
+    assert new_version == tracker.version
+
+
+VARIABLE_FORMAT_RULE = ValidationRule(
+    name="variable_format",
+    scope=RuleScope.VARIABLE,
+    depends_on=frozenset({VariableIdentifiers.FORMAT.value}),
+    message="Ugyldig format",
+    is_valid=lambda variable: variable.format != "invalid",
+)
+
+DATASET_SOURCE_RULE = ValidationRule(
+    name="dataset_source",
+    scope=RuleScope.DATASET,
+    depends_on=frozenset({DatasetIdentifiers.DATA_SOURCE.value}),
+    message="Ugyldig datakilde",
+    is_valid=lambda dataset: dataset.data_source != "invalid",
+)
+
+
+def test_update_completeness_indicators_includes_violations(metadata):
+    tracker = CompletenessTracker(metadata)
+    engine = ValidationEngine([VARIABLE_FORMAT_RULE], metadata)
+    version = get_metadata_version(tracker, engine)
+    variable = metadata.variables[0]
+    variable.format = "invalid"
+    engine.update_variable_field(variable.short_name, VariableIdentifiers.FORMAT.value)
+
+    _, _, sub_headers, new_version = update_completeness_indicators(
+        tracker,
+        engine,
+        version,
+        [{"type": "variables-accordion", "id": f"{variable.short_name}-1"}],
+    )
+    assert sub_headers == [
+        get_variable_sub_header(
+            [VARIABLE_FORMAT_RULE.message],
+            tracker.num_missing_variable_fields(variable.short_name),
+        ),
+    ]
+    assert new_version == engine.version
+
+
+def test_validation_control(metadata):
+    metadata.dataset.data_source = "invalid"
+    engine = ValidationEngine([DATASET_SOURCE_RULE], metadata)
+    result = validation_control(engine)
+    assert isinstance(result, dbc.Alert)
+    assert [li.children for li in result.children[-1].children] == [
+        DATASET_SOURCE_RULE.message,
+    ]
+    assert validation_control(ValidationEngine([], metadata)) is None
+
+
+def test_save_reads_completeness_and_validation(metadata):
+    metadata.write_metadata_document = mock.Mock()
+    metadata.variables[0].contains_data_from = datetime.date(2024, 1, 1)
+    metadata.variables[0].contains_data_until = datetime.date(2020, 1, 1)
+    state.metadata = metadata
+    state.completeness = CompletenessTracker(metadata)
+    state.validation = ValidationEngine([VARIABLE_DATE_ORDER_RULE], metadata)
+
+    result = save_metadata_and_generate_alerts(metadata)
+
+    assert state.missing_variables_fields == list(
+        state.completeness.iter_missing_variables_fields(),
+    )
+    assert [li.children for li in result[3].children[-1].children] == [
+        f"{metadata.variables[0].short_name}: {VARIABLE_DATE_ORDER_RULE.message}",
+    ]
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import datetime
 import random
-import warnings
 from typing import TYPE_CHECKING
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -11,11 +10,13 @@ from uuid import UUID
 import dash
 import dash_bootstrap_components as dbc
 import pytest
-from dapla_metadata.datasets import ObligatoryDatasetWarning
 from dapla_metadata.datasets import model
+from dash import html
 
+from datadoc import config
 from datadoc import enums
 from datadoc import state
+from datadoc.constants import DAPLA_MANUAL_TEXT
 from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_date_input
 from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_input
 from datadoc.frontend.callbacks.dataset import open_dataset_handling
@@ -28,6 +29,7 @@ from datadoc.frontend.fields.display_dataset import (
     MULTIPLE_LANGUAGE_DATASET_IDENTIFIERS,
 )
 from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+from datadoc.validation.completeness import get_missing_obligatory_dataset_fields
 
 if TYPE_CHECKING:
     from dapla_metadata.datasets import Datadoc
@@ -360,6 +362,26 @@ def test_open_dataset_handling_naming_standard(
     assert counter == 1
 
 
+@patch(f"{DATASET_CALLBACKS_MODULE}.open_file")
+def test_open_dataset_handling_naming_standard_link(
+    open_file_mock: Mock,  # noqa: ARG001
+    n_clicks_1: int,
+    file_path_without_dates: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    url = "https://manual.dapla.ssb.no/navnestandard.html"
+    monkeypatch.setenv("DAPLA_MANUAL_NAMING_STANDARD_URL", url)
+    config.load_config()
+    alert, _ = open_dataset_handling(
+        n_clicks_1,
+        file_path_without_dates,
+        0,
+    )
+    link = next(child for child in alert.children if isinstance(child, html.A))
+    assert link.href == url
+    assert link.children == DAPLA_MANUAL_TEXT
+
+
 def test_process_special_cases_keyword():
     value = "test,key,words"
     identifier = "keyword"
@@ -404,17 +426,14 @@ def test_process_special_cases_no_change():
 def test_dataset_metadata_control_return_alert(metadata: Datadoc):
     """Return alert when obligatory metadata is missing."""
     state.metadata = metadata
-    missing_metadata: str
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter("always")
-        state.metadata.write_metadata_document()
-        if issubclass(w[0].category, ObligatoryDatasetWarning):
-            missing_metadata = str(w[0].message)
+    missing_metadata = get_missing_obligatory_dataset_fields(metadata.dataset)
     result = dataset_control(missing_metadata)
     assert isinstance(result, dbc.Alert)
+    assert [li.children for li in result.children[-1].children] == [
+        DISPLAY_DATASET[DatasetIdentifiers(f)].display_name for f in missing_metadata
+    ]
 
 
 def test_dataset_metadata_control_not_return_alert():
-    missing_metadata = None
-    result = dataset_control(missing_metadata)
+    result = dataset_control([])
     assert result is None
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import warnings
 from typing import TYPE_CHECKING
 from typing import Any
 from uuid import UUID
@@ -10,12 +9,14 @@ from uuid import UUID
 import arrow
 import dash_bootstrap_components as dbc
 import pytest
-from dapla_metadata.datasets import ObligatoryVariableWarning
 from dapla_metadata.datasets import model
 from pydantic import AnyUrl
 
 from datadoc import enums
 from datadoc import state
+from datadoc.frontend.callbacks.utils import MISSING_VARIABLES_PAGE_SIZE
+from datadoc.frontend.callbacks.utils import save_metadata_and_generate_alerts
+from datadoc.frontend.callbacks.utils import show_more_missing_variables
 from datadoc.frontend.callbacks.utils import variables_control
 from datadoc.frontend.callbacks.variables import accept_variable_metadata_date_input
 from datadoc.frontend.callbacks.variables import accept_variable_metadata_input
@@ -36,6 +37,8 @@ from datadoc.frontend.fields.display_base import get_standard_metadata
 from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
 from datadoc.frontend.fields.display_variables import DISPLAY_VARIABLES
 from datadoc.frontend.fields.display_variables import VariableIdentifiers
+from datadoc.validation.completeness import CompletenessTracker
+from datadoc.validation.completeness import get_missing_obligatory_variables_fields
 
 if TYPE_CHECKING:
     from dapla_metadata.datasets import Datadoc
@@ -585,19 +588,14 @@ def test_variables_values_inherit_dataset_date_values_not_when_variable_has_valu
 def test_variables_metadata_control_return_alert(metadata: Datadoc):
     """Return alert when obligatory metadata is missing."""
     state.metadata = metadata
-    missing_metadata: str
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter("always")
-        state.metadata.write_metadata_document()
-        if issubclass(w[1].category, ObligatoryVariableWarning):
-            missing_metadata = str(w[1].message)
-    result = variables_control(missing_metadata, metadata.variables)
+    missing_metadata = get_missing_obligatory_variables_fields(metadata.variables)
+    result = variables_control(missing_metadata)
     assert isinstance(result, dbc.Alert)
+    assert len(result.children[-1].children) == len(metadata.variables)
 
 
 def test_variables_metadata_control_dont_return_alert(metadata: Datadoc):
     state.metadata = metadata
-    missing_metadata: str | None = None
     for val in state.metadata.variables:
         """Not return alert when all obligatory metadata has value."""
         setattr(
@@ -627,15 +625,99 @@ def test_variables_metadata_control_dont_return_alert(metadata: Datadoc):
             VariableIdentifiers.IS_PERSONAL_DATA,
             enums.IsPersonalData.NON_PSEUDONYMISED_ENCRYPTED_PERSONAL_DATA,
         )
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter("always")
-        state.metadata.write_metadata_document()
-        if issubclass(w[0].category, ObligatoryVariableWarning):
-            missing_metadata = str(w[0].message)
-    result = variables_control(missing_metadata, metadata.variables)
+    missing_metadata = get_missing_obligatory_variables_fields(metadata.variables)
+    assert missing_metadata == {}
+    result = variables_control(missing_metadata)
     assert result is None
 
 
+def test_variables_control_many_variables():
+    num_variables = 8000
+    variables = [
+        model.Variable(short_name=f"var_{i}", data_type=enums.DataType.STRING)
+        for i in range(num_variables)
+    ]
+    missing_metadata = get_missing_obligatory_variables_fields(variables)
+    assert len(missing_metadata) == num_variables
+    assert missing_metadata["var_7999"] == [
+        VariableIdentifiers.NAME.value,
+        VariableIdentifiers.IS_PERSONAL_DATA.value,
+        VariableIdentifiers.VARIABLE_ROLE.value,
+    ]
+    result = variables_control(missing_metadata)
+    assert isinstance(result, dbc.Alert)
+    summary_list, variables_list = result.children[2], result.children[3]
+    assert [li.children for li in summary_list.children] == [
+        f"Navn: {num_variables}",
+        f"Er personopplysning: {num_variables}",
+        f"Variabelens rolle: {num_variables}",
+    ]
+    assert len(variables_list.children) == MISSING_VARIABLES_PAGE_SIZE
+    link, text = variables_list.children[-1].children
+    assert link.id["variable_short_name"] == "var_9"
+    assert text == ": Navn, Er personopplysning, Variabelens rolle"
+
+
+def test_variables_control_few_variables_not_summarized(metadata: Datadoc):
+    missing_metadata = get_missing_obligatory_variables_fields(metadata.variables)
+    assert 0 < len(missing_metadata) <= MISSING_VARIABLES_PAGE_SIZE
+    result = variables_control(missing_metadata)
+    assert isinstance(result, dbc.Alert)
+    assert all(isinstance(li.children, str) for li in result.children[-1].children)
+
+
+@pytest.mark.parametrize(
+    ("num_variables", "page", "expected_items", "expected_disabled"),
+    [
+        (25, 1, 10, False),
+        (25, 2, 5, True),
+        (20, 1, 10, True),
+        (20, 2, 0, True),
+    ],
+)
+def test_show_more_missing_variables(
+    num_variables: int,
+    page: int,
+    expected_items: int,
+    expected_disabled: bool,  # noqa: FBT001
+):
+    missing_fields = [
+        (f"var_{i}", [VariableIdentifiers.NAME.value]) for i in range(num_variables)
+    ]
+    patch, disabled = show_more_missing_variables(missing_fields, page)
+    operations = patch.to_plotly_json()["operations"]
+    assert len(operations) == expected_items
+    if expected_items:
+        first_item = operations[0]["params"]["value"]
+        link = first_item.children[0]
+        assert link.id["variable_short_name"] == f"var_{page * 10}"
+    assert disabled is expected_disabled
+
+
+def test_show_more_pages_from_list_when_alert_built(mocker):
+    metadata = mocker.Mock(
+        dataset=model.Dataset(),
+        variables=[
+            model.Variable(short_name=f"var_{i}", data_type=enums.DataType.STRING)
+            for i in range(25)
+        ],
+    )
+    state.metadata = metadata
+    state.completeness = CompletenessTracker(metadata)
+    save_metadata_and_generate_alerts(metadata)
+
+    # Filling in variables after the alert was built doesn't shift the pages
+    for variable in metadata.variables[:15]:
+        variable.name = model.LanguageStringType(
+            [model.LanguageStringTypeItem(languageCode="nb", languageText="Navn")],
+        )
+    patch, disabled = show_more_missing_variables(state.missing_variables_fields, 1)
+
+    first_item = patch.to_plotly_json()["operations"][0]["params"]["value"]
+    assert first_item.children[0].id["variable_short_name"] == "var_10"
+    assert not disabled
+
+
 def test_accept_variable_metadata_input_when_shortname_is_non_ascii(
     metadata_illegal_shortnames: Datadoc,
 ):
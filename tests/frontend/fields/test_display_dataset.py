@@ -1,7 +1,10 @@
 import pytest
+from dapla_metadata.datasets import model
 
 from datadoc import state
 from datadoc.frontend.fields.display_base import DROPDOWN_DESELECT_OPTION
+from datadoc.frontend.fields.display_dataset import DISPLAY_DATASET
+from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
 from datadoc.frontend.fields.display_dataset import get_statistical_subject_options
 from datadoc.frontend.fields.display_dataset import get_unit_type_options
 from tests.conftest import CODE_LIST_DIR
@@ -68,3 +71,40 @@ def test_get_unit_type_options(
     state.unit_types = code_list_fake_structure
     state.unit_types.wait_for_external_result()
     assert get_unit_type_options() == expected
+
+
+def test_unit_type_options_built_once_per_version(code_list_fake_structure):
+    state.unit_types = code_list_fake_structure
+    state.unit_types.wait_for_external_result()
+    options = get_unit_type_options()
+
+    first = code_list_fake_structure.classifications[:1]
+    code_list_fake_structure._classifications = first  # noqa: SLF001
+    assert get_unit_type_options() == options
+
+    # A refresh swapping in new data increments the version
+    code_list_fake_structure.version = 1
+    assert get_unit_type_options() == options[:2]
+
+
+@pytest.mark.parametrize(
+    ("unit_type", "expected"),
+    [
+        ("01", []),
+        ("99", [{"title": "99", "id": "99"}]),
+        (None, []),
+    ],
+)
+def test_stored_unit_type_not_in_code_list_is_shown(
+    code_list_fake_structure,
+    unit_type,
+    expected,
+):
+    state.unit_types = code_list_fake_structure
+    state.unit_types.wait_for_external_result()
+    dropdown = DISPLAY_DATASET[DatasetIdentifiers.UNIT_TYPE].render(
+        {"type": "dataset", "id": DatasetIdentifiers.UNIT_TYPE.value},
+        model.Dataset(unit_type=unit_type),
+    )
+    assert dropdown.items[len(get_unit_type_options()) :] == expected
+    assert dropdown.value == (unit_type or "")
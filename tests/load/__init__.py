@@ -0,0 +1 @@
+"""Load testing of the Dash endpoints, with concurrent scripted users."""
@@ -0,0 +1,65 @@
+"""Load test Datadoc under Gunicorn, fully offline.
+
+Run from the root of the repo:
+
+    python -m tests.load --users 10 --duration 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import tempfile
+
+from tests.load.harness import external_sources_stand_in
+from tests.load.harness import format_summary
+from tests.load.harness import run_load_test
+from tests.load.harness import serve_with_gunicorn
+from tests.synthetic_datasets import generate_dataset
+
+
+def main() -> int:
+    """Run the load test and print the statistics.
+
+    Returns:
+        The exit code, 1 if any request failed.
+    """
+    parser = argparse.ArgumentParser(prog="python -m tests.load", description=__doc__)
+    parser.add_argument("--users", type=int, default=5, help="concurrent users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run for")
+    parser.add_argument(
+        "--variables",
+        type=int,
+        default=100,
+        help="variables in the dataset",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, external_sources_stand_in() as stand_in:
+        dataset = generate_dataset(
+            pathlib.Path(directory),
+            num_variables=arguments.variables,
+            fill_ratio=0.5,
+        )
+        with serve_with_gunicorn(
+            stand_in,
+            pathlib.Path(directory) / "cache",
+            workers=arguments.workers,
+            threads=arguments.threads,
+        ) as url:
+            recorder = run_load_test(
+                url,
+                str(dataset.path),
+                [f"var_{index}" for index in range(arguments.variables)],
+                users=arguments.users,
+                duration=arguments.duration,
+            )
+    print(format_summary(recorder.summary()))  # noqa: T201
+    return 1 if recorder.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
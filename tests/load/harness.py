@@ -0,0 +1,540 @@
+"""Scripted user sessions against a running Datadoc, with latency statistics.
+
+A user session loads the page, opens a dataset, searches the variables,
+edits a dataset field and a variable field, and saves, the way the browser
+does it: through `/_dash-layout`, `/_dash-dependencies` and
+`/_dash-update-component`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import json
+import math
+import os
+import pathlib
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import requests
+
+from datadoc import config
+from datadoc.utils import pick_random_port
+from tests.stand_in_server import ExternalSourcesStandIn
+from tests.utils import TEST_RESOURCES_DIRECTORY
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+REPOSITORY_ROOT = pathlib.Path(__file__).parents[2]
+GUNICORN_CONFIG = REPOSITORY_ROOT / "gunicorn.conf.py"
+READY_PATH = "/healthz/ready"
+REQUEST_TIMEOUT_SECONDS = 120
+SEARCH_QUERY = "var_1"
+EDITED_DATASET_NAME = "Lasttest"
+EDITED_DEFINITION_URI = "https://www.ssb.no/a/metadata/definisjoner/variabler/main.html"
+
+
+@dataclass(frozen=True)
+class CallbackStats:
+    """Latency and throughput for one kind of request.
+
+    Attributes:
+        name: The step of the user session.
+        count: The number of requests.
+        errors: The number of requests which failed.
+        p50: The median latency in seconds.
+        p90: The 90th percentile latency in seconds.
+        p99: The 99th percentile latency in seconds.
+        throughput: Requests per second over the whole run.
+    """
+
+    name: str
+    count: int
+    errors: int
+    p50: float
+    p90: float
+    p99: float
+    throughput: float
+
+
+class LatencyRecorder:
+    """Collect request latencies from many threads."""
+
+    def __init__(self) -> None:
+        """Start the clock for the throughput."""
+        self._latencies: dict[str, list[float]] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._stopped: float | None = None
+
+    def stop(self) -> None:
+        """Stop the clock for the throughput."""
+        self._stopped = time.perf_counter()
+
+    def record(self, name: str, seconds: float, *, ok: bool = True) -> None:
+        """Record the latency of a request, and whether it failed."""
+        with self._lock:
+            self._latencies.setdefault(name, []).append(seconds)
+            self._errors[name] = self._errors.get(name, 0) + (not ok)
+
+    @property
+    def errors(self) -> int:
+        """The number of failed requests."""
+        return sum(self._errors.values())
+
+    def summary(self) -> list[CallbackStats]:
+        """Get the statistics for each step, in the order they were first seen."""
+        elapsed = (self._stopped or time.perf_counter()) - self._started
+        with self._lock:
+            return [
+                CallbackStats(
+                    name=name,
+                    count=len(latencies),
+                    errors=self._errors[name],
+                    p50=_percentile(latencies, 50),
+                    p90=_percentile(latencies, 90),
+                    p99=_percentile(latencies, 99),
+                    throughput=len(latencies) / elapsed,
+                )
+                for name, latencies in self._latencies.items()
+            ]
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def format_summary(summary: Sequence[CallbackStats]) -> str:
+    """Format the statistics as a table, with latencies in milliseconds."""
+    header = f"{'step':<28}{'count':>8}{'errors':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'req/s':>9}"
+    rows = [
+        f"{stats.name:<28}{stats.count:>8}{stats.errors:>8}"
+        f"{stats.p50 * 1000:>10.1f}{stats.p90 * 1000:>10.1f}{stats.p99 * 1000:>10.1f}"
+        f"{stats.throughput:>9.2f}"
+        for stats in summary
+    ]
+    return "\n".join([header, *rows])
+
+
+def _dash_id(component_id: str | dict) -> str:
+    """The ID as Dash writes it in dependencies and changed props."""
+    if isinstance(component_id, str):
+        return component_id
+    return json.dumps(component_id, sort_keys=True, separators=(",", ":"))
+
+
+def _split_outputs(output: str) -> list[tuple[str, str]]:
+    """Split the output of a dependency into component IDs and properties.
+
+    Callbacks with several outputs have them joined as `..a.prop...b.prop..`,
+    and duplicate outputs have a hash appended to the property.
+    """
+    if output.startswith(".."):
+        parts = output.removeprefix("..").removesuffix("..").split("...")
+    else:
+        parts = [output]
+    outputs = []
+    for part in parts:
+        component_id, prop = part.rsplit(".", 1)
+        outputs.append((component_id, prop.split("@")[0]))
+    return outputs
+
+
+def _resolve(
+    component_id: str,
+    prop: str,
+    wildcards: Mapping[str, object],
+) -> dict | list[dict]:
+    """Fill in the wildcards of a pattern-matching ID.
+
+    MATCH keys take the value in `wildcards`, and ALL keys a list of values,
+    giving a list of IDs.
+    """
+    if not component_id.startswith("{"):
+        return {"id": component_id, "property": prop}
+    pattern = json.loads(component_id)
+    concrete = {
+        key: wildcards[key] if value == ["MATCH"] else value
+        for key, value in pattern.items()
+    }
+    for key, value in pattern.items():
+        if value == ["ALL"]:
+            values = wildcards.get(key, [])
+            assert isinstance(values, list)
+            return [{"id": {**concrete, key: v}, "property": prop} for v in values]
+    return {"id": concrete, "property": prop}
+
+
+class DashClient:
+    """A browser stand-in which talks to the Dash endpoints."""
+
+    def __init__(self, base_url: str, recorder: LatencyRecorder) -> None:
+        """Use a session of its own, like a browser tab."""
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.session = requests.Session()
+        self.dependencies: list[dict] = []
+
+    def _request(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        **kwargs: object,
+    ) -> requests.Response | None:
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                self.base_url + path,
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                **kwargs,  # type: ignore[arg-type]
+            )
+        except requests.RequestException:
+            self.recorder.record(name, time.perf_counter() - started, ok=False)
+            return None
+        self.recorder.record(name, time.perf_counter() - started, ok=response.ok)
+        return response
+
+    def load_page(self) -> None:
+        """Load the page, the layout and the callback dependencies."""
+        self._request("GET /", "GET", "/")
+        self._request("GET /_dash-layout", "GET", "/_dash-layout")
+        response = self._request(
+            "GET /_dash-dependencies",
+            "GET",
+            "/_dash-dependencies",
+        )
+        if response is not None and response.ok:
+            self.dependencies = response.json()
+
+    def find_callback(self, output: str, input_: str) -> dict:
+        """Find the callback with the given output and input, both as `id.property`.
+
+        Raises:
+            LookupError: If the app has no such callback.
+        """
+        for dependency in self.dependencies:
+            if dependency.get("clientside_function"):
+                continue
+            outputs = {f"{i}.{p}" for i, p in _split_outputs(dependency["output"])}
+            inputs = {f"{i['id']}.{i['property']}" for i in dependency["inputs"]}
+            if output in outputs and input_ in inputs:
+                return dependency
+        msg = f"No callback from {input_} to {output}"
+        raise LookupError(msg)
+
+    def update(  # noqa: PLR0913
+        self,
+        name: str,
+        dependency: dict,
+        inputs: Sequence[object],
+        state: Sequence[object] = (),
+        *,
+        wildcards: Mapping[str, object] | None = None,
+        triggered: int | None = 0,
+    ) -> dict:
+        """Call a callback, like the browser does when an input changes.
+
+        Args:
+            name: The step to record the latency under.
+            dependency: The callback, from `find_callback`.
+            inputs: The values of the inputs, in order.
+            state: The values of the states, in order.
+            wildcards: Values for the MATCH and ALL keys of pattern-matching IDs.
+            triggered: The index of the input which changed, None for the
+                initial call when the page loads.
+
+        Returns:
+            The updated properties by component ID, including those the
+            callback set on other components. Empty if nothing was updated.
+        """
+        wildcards = wildcards or {}
+
+        def with_values(items: list[dict], values: Sequence[object]) -> list[dict]:
+            resolved = []
+            for item, value in zip(items, values, strict=True):
+                target = _resolve(item["id"], item["property"], wildcards)
+                assert isinstance(target, dict)
+                resolved.append({**target, "value": value})
+            return resolved
+
+        outputs = [
+            _resolve(i, p, wildcards) for i, p in _split_outputs(dependency["output"])
+        ]
+        resolved_inputs = with_values(dependency["inputs"], inputs)
+        changed = []
+        if triggered is not None:
+            trigger = resolved_inputs[triggered]
+            changed.append(f"{_dash_id(trigger['id'])}.{trigger['property']}")
+        payload = {
+            "output": dependency["output"],
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": resolved_inputs,
+            "changedPropIds": changed,
+            "state": with_values(dependency["state"], state),
+        }
+        response = self._request(
+            name,
+            "POST",
+            "/_dash-update-component",
+            json=payload,
+        )
+        if response is None or response.status_code == HTTPStatus.NO_CONTENT:
+            return {}
+        if not response.ok:
+            return {}
+        body = response.json()
+        return {**body.get("response", {}), **body.get("sideUpdate", {})}
+
+
+def run_user_session(
+    client: DashClient,
+    dataset_path: str,
+    variable_names: Sequence[str],
+) -> None:
+    """Go through the steps a user typically takes to document a dataset."""
+    client.load_page()
+    if not client.dependencies:
+        return
+    dataset_workspace = client.find_callback(
+        "section-wrapper-id.children",
+        "dataset-opened-counter.data",
+    )
+    variables_workspace = client.find_callback(
+        "accordion-wrapper.children",
+        "search-variables.value",
+    )
+    completeness = client.find_callback(
+        "completeness-progress.value",
+        "completeness-version.data",
+    )
+    client.update(
+        "populate_dataset_workspace",
+        dataset_workspace,
+        [0, True],
+        triggered=None,
+    )
+    client.update(
+        "populate_variables_workspace",
+        variables_workspace,
+        [0, "", True],
+        triggered=None,
+    )
+
+    response = client.update(
+        "open_dataset",
+        client.find_callback("dataset-opened-counter.data", "open-button.n_clicks"),
+        [1],
+        [dataset_path, 0],
+    )
+    counter = response.get("dataset-opened-counter", {}).get("data", 1)
+    client.update("populate_dataset_workspace", dataset_workspace, [counter, True])
+    client.update(
+        "populate_variables_workspace",
+        variables_workspace,
+        [counter, "", True],
+    )
+    # Opening and editing send the completeness version, which triggers
+    # the update of the completeness indicators
+    displayed_version = (
+        client.update(
+            "update_completeness",
+            completeness,
+            [response.get("completeness-version", {}).get("data")],
+            [None],
+            wildcards={"id": [f"{name}-{counter}" for name in variable_names]},
+        )
+        .get("completeness-displayed-version", {})
+        .get("data")
+    )
+
+    client.update(
+        "search_variables",
+        variables_workspace,
+        [counter, SEARCH_QUERY, True],
+        triggered=1,
+    )
+    client.update(
+        "edit_dataset_field",
+        client.find_callback(
+            '{"id":["MATCH"],"language":["MATCH"],"type":"dataset-metadata-multilanguage-input"}.error',
+            '{"id":["MATCH"],"language":["MATCH"],"type":"dataset-metadata-multilanguage-input"}.value',
+        ),
+        [EDITED_DATASET_NAME],
+        wildcards={"id": "name", "language": "nb"},
+    )
+    response = client.update(
+        "edit_variable_field",
+        client.find_callback(
+            '{"id":["MATCH"],"type":"variables-metadata-input","variable_short_name":["MATCH"]}.error',
+            '{"id":["MATCH"],"type":"variables-metadata-input","variable_short_name":["MATCH"]}.value',
+        ),
+        [EDITED_DEFINITION_URI],
+        wildcards={"id": "definition_uri", "variable_short_name": variable_names[0]},
+    )
+    client.update(
+        "update_completeness",
+        completeness,
+        [response.get("completeness-version", {}).get("data")],
+        [displayed_version],
+        wildcards={"id": [f"{name}-{counter}" for name in variable_names]},
+    )
+    client.update(
+        "save_metadata",
+        client.find_callback("alerts-section.children", "save-button.n_clicks"),
+        [1],
+        [None],
+    )
+
+
+def run_load_test(
+    base_url: str,
+    dataset_path: str,
+    variable_names: Sequence[str],
+    *,
+    users: int,
+    duration: float,
+) -> LatencyRecorder:
+    """Run user sessions from concurrent users, back to back, for a while.
+
+    Args:
+        base_url: The URL of the app.
+        dataset_path: The dataset each user opens.
+        variable_names: The short names of the variables in the dataset.
+        users: The number of concurrent users.
+        duration: Seconds to start new sessions for. Sessions in progress
+            run to the end.
+
+    Returns:
+        The latencies of every request.
+    """
+    recorder = LatencyRecorder()
+    deadline = time.monotonic() + duration
+
+    def user() -> None:
+        while time.monotonic() < deadline:
+            run_user_session(
+                DashClient(base_url, recorder),
+                dataset_path,
+                variable_names,
+            )
+
+    threads = [threading.Thread(target=user, daemon=True) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.stop()
+    return recorder
+
+
+def external_sources_stand_in() -> ExternalSourcesStandIn:
+    """A stand-in which serves the test code list for every code list the app uses."""
+    codes = {}
+    for language in ("nb", "en"):
+        with (
+            TEST_RESOURCES_DIRECTORY / "code_list" / f"code_list_{language}.csv"
+        ).open(
+            encoding="utf-8",
+        ) as file:
+            codes[language] = [
+                {"code": row["code"], "name": row["name"]}
+                for row in csv.DictReader(file)
+            ]
+    subject_structure = (
+        TEST_RESOURCES_DIRECTORY / "statistical_subject_structure" / "simple.xml"
+    ).read_text(encoding="utf-8")
+    return ExternalSourcesStandIn(
+        {
+            code: codes
+            for code in (
+                config.get_unit_code(),
+                config.get_measurement_unit_code(),
+                config.get_organisational_unit_code(),
+                config.get_data_source_code(),
+            )
+            if code is not None
+        },
+        subject_structure,
+    )
+
+
+@contextlib.contextmanager
+def serve_with_gunicorn(
+    stand_in: ExternalSourcesStandIn,
+    cache_directory: pathlib.Path,
+    *,
+    workers: int = 1,
+    threads: int = 1,
+    ready_timeout: float = 120,
+) -> Iterator[str]:
+    """Run the app under Gunicorn, configured as in production, until it is ready.
+
+    Args:
+        stand_in: Serves the external sources to the app.
+        cache_directory: Where the app caches the external sources.
+        workers: The number of Gunicorn worker processes.
+        threads: The number of threads in each worker.
+        ready_timeout: Seconds to wait for the app to report ready.
+
+    Yields:
+        The URL of the app.
+
+    Raises:
+        RuntimeError: If Gunicorn stops, or the app isn't ready in time.
+    """
+    port = pick_random_port()
+    url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            str(GUNICORN_CONFIG),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+            "--threads",
+            str(threads),
+            "datadoc.wsgi:server",
+        ],
+        cwd=REPOSITORY_ROOT,
+        env={
+            **os.environ,
+            "DATADOC_KLASS_BASE_URL": stand_in.klass_base_url,
+            "DATADOC_STATISTICAL_SUBJECT_SOURCE_URL": stand_in.subject_structure_url,
+            "DATADOC_EXTERNAL_SOURCES_CACHE_DIRECTORY": str(cache_directory),
+        },
+    )
+    try:
+        deadline = time.monotonic() + ready_timeout
+        while True:
+            if process.poll() is not None:
+                msg = f"Gunicorn stopped with exit code {process.returncode}"
+                raise RuntimeError(msg)
+            with contextlib.suppress(requests.ConnectionError):
+                if requests.get(url + READY_PATH, timeout=5).ok:
+                    break
+            if time.monotonic() > deadline:
+                msg = f"Datadoc was not ready within {ready_timeout} seconds"
+                raise RuntimeError(msg)
+            time.sleep(0.5)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from werkzeug.serving import make_server
+
+from datadoc import state
+from datadoc.app import get_app
+from datadoc.external_sources.loader import ExternalSourcesLoader
+from tests.load.harness import DashClient
+from tests.load.harness import LatencyRecorder
+from tests.load.harness import _percentile
+from tests.load.harness import _resolve
+from tests.load.harness import _split_outputs
+from tests.load.harness import external_sources_stand_in
+from tests.load.harness import format_summary
+from tests.load.harness import run_user_session
+from tests.synthetic_datasets import generate_dataset
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+NUM_VARIABLES = 5
+
+
+@pytest.fixture
+def app_url(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    with external_sources_stand_in() as stand_in, ExternalSourcesLoader() as executor:
+        monkeypatch.setenv("DATADOC_KLASS_BASE_URL", stand_in.klass_base_url)
+        monkeypatch.setenv(
+            "DATADOC_STATISTICAL_SUBJECT_SOURCE_URL",
+            stand_in.subject_structure_url,
+        )
+        app, _ = get_app(executor)
+        assert state.readiness.wait_until_warmed_up(timeout=30)
+        server = make_server("127.0.0.1", 0, app.server, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_port}"
+        server.shutdown()
+
+
+def test_split_outputs():
+    assert _split_outputs("..a.children@123abc...b.data..") == [
+        ("a", "children"),
+        ("b", "data"),
+    ]
+    assert _split_outputs("display-tab.children") == [("display-tab", "children")]
+
+
+def test_resolve_pattern_matching_ids():
+    assert _resolve('{"id":["MATCH"],"type":"input"}', "value", {"id": "name"}) == {
+        "id": {"id": "name", "type": "input"},
+        "property": "value",
+    }
+    assert _resolve('{"id":["ALL"],"type":"input"}', "value", {"id": ["a", "b"]}) == [
+        {"id": {"id": "a", "type": "input"}, "property": "value"},
+        {"id": {"id": "b", "type": "input"}, "property": "value"},
+    ]
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert _percentile(values, 50) == 50  # noqa: PLR2004
+    assert _percentile(values, 99) == 99  # noqa: PLR2004
+    assert _percentile([1.0], 90) == 1
+
+
+def test_user_session(app_url: str, tmp_path: pathlib.Path):
+    dataset = generate_dataset(tmp_path, num_variables=NUM_VARIABLES)
+    recorder = LatencyRecorder()
+
+    run_user_session(
+        DashClient(app_url, recorder),
+        str(dataset.path),
+        [f"var_{index}" for index in range(NUM_VARIABLES)],
+    )
+
+    summary = {stats.name: stats for stats in recorder.summary()}
+    assert recorder.errors == 0
+    assert {
+        "open_dataset",
+        "search_variables",
+        "edit_dataset_field",
+        "edit_variable_field",
+        "save_metadata",
+    } <= summary.keys()
+    assert state.metadata.dataset.name is not None
+    assert state.metadata.variables_lookup["var_0"].definition_uri is not None
+    assert "save_metadata" in format_summary(recorder.summary())
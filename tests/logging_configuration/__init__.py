@@ -0,0 +1 @@
+"""Unit tests for the logging_configuration package."""
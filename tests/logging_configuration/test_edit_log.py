@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from datadoc.logging_configuration.edit_log import EditSummary
+from datadoc.logging_configuration.edit_log import finish_edit_summary
+from datadoc.logging_configuration.edit_log import get_edit_summary
+from datadoc.logging_configuration.edit_log import record_dataset_edit
+from datadoc.logging_configuration.edit_log import record_variable_edits
+from datadoc.logging_configuration.edit_log import start_edit_summary
+
+
+@pytest.fixture
+def caplog_info(caplog: pytest.LogCaptureFixture) -> pytest.LogCaptureFixture:
+    caplog.set_level(logging.INFO, logger="datadoc")
+    return caplog
+
+
+@pytest.mark.parametrize(
+    ("summary", "expected"),
+    [
+        (
+            EditSummary(
+                variable_fields=4312,
+                variables={f"var_{i}" for i in range(4312)},
+                field_names={"definition_uri"},
+            ),
+            "Updated 4,312 fields on 4,312 variables in 180 ms: definition_uri",
+        ),
+        (
+            EditSummary(dataset_fields=1, field_names={"name"}),
+            "Updated 1 field on the dataset in 180 ms: name",
+        ),
+        (
+            EditSummary(
+                dataset_fields=1,
+                variable_fields=1,
+                variables={"pers_id"},
+                field_names={"a", "b", "c", "d", "e", "f"},
+            ),
+            "Updated 2 fields on the dataset and 1 variable in 180 ms: a, b, c, d, e, ...",
+        ),
+    ],
+)
+def test_describe(summary: EditSummary, expected: str):
+    assert summary.describe(180.2) == expected
+
+
+def test_edits_summarised_in_one_line(caplog_info: pytest.LogCaptureFixture):
+    start_edit_summary()
+    record_dataset_edit("contains_data_from")
+    record_variable_edits("contains_data_from", ["pers_id", "sivilstand"])
+    record_variable_edits("name", ["pers_id"])
+    finish_edit_summary(12)
+
+    (record,) = caplog_info.records
+    assert record.levelno == logging.INFO
+    assert record.getMessage() == (
+        "Updated 4 fields on the dataset and 2 variables in 12 ms: contains_data_from, name"
+    )
+    assert get_edit_summary() is None
+
+
+def test_nothing_logged_without_edits(caplog_info: pytest.LogCaptureFixture):
+    start_edit_summary()
+    finish_edit_summary(12)
+    assert not caplog_info.records
+
+
+def test_edits_not_counted_outside_requests():
+    record_dataset_edit("name")
+    record_variable_edits("name", ["pers_id"])
+    assert get_edit_summary() is None
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+import sys
+from typing import Literal
+
+import pytest
+
+from datadoc.logging_configuration.json_formatter import DatadocJSONFormatter
+
+FMT_KEYS = {
+    "level": "levelname",
+    "message": "message",
+    "timestamp": "timestamp",
+    "logger": "name",
+    "request_id": "request_id",
+}
+
+
+@pytest.fixture
+def record() -> logging.LogRecord:
+    record = logging.LogRecord(
+        "datadoc.test",
+        logging.INFO,
+        __file__,
+        1,
+        "Updated %s with value %s",
+        ("name", "Navn"),
+        None,
+    )
+    record.created = 0
+    return record
+
+
+def test_format(record: logging.LogRecord):
+    record.request_id = "abc"
+    assert json.loads(DatadocJSONFormatter(fmt_keys=FMT_KEYS).format(record)) == {
+        "level": "INFO",
+        "message": "Updated name with value Navn",
+        "timestamp": "1970-01-01T00:00:00+00:00",
+        "logger": "datadoc.test",
+        "request_id": "abc",
+    }
+
+
+def test_format_missing_field(record: logging.LogRecord):
+    formatted = json.loads(DatadocJSONFormatter(fmt_keys=FMT_KEYS).format(record))
+    assert formatted["request_id"] is None
+
+
+def test_format_exception(record: logging.LogRecord):
+    try:
+        raise ValueError("Invalid")  # noqa: TRY301, EM101
+    except ValueError:
+        record.exc_info = sys.exc_info()
+    formatted = json.loads(DatadocJSONFormatter(fmt_keys=FMT_KEYS).format(record))
+    assert "ValueError: Invalid" in formatted["exc_info"]
+
+
+@pytest.mark.parametrize(
+    "created",
+    [0, 1.5, 1_700_000_000.123456, 1_700_000_000.9999996, 1_700_000_001.0000004],
+)
+def test_format_timestamp(created: float):
+    assert (
+        DatadocJSONFormatter().format_timestamp(
+            created,
+        )
+        == dt.datetime.fromtimestamp(created, tz=dt.timezone.utc).isoformat()
+    )
+
+
+def test_format_timestamp_cached_per_second():
+    formatter = DatadocJSONFormatter()
+    assert formatter.format_timestamp(10.25) == "1970-01-01T00:00:10.250000+00:00"
+    assert formatter.format_timestamp(10.5) == "1970-01-01T00:00:10.500000+00:00"
+    assert formatter.format_timestamp(11) == "1970-01-01T00:00:11+00:00"
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_backends_give_same_json(
+    record: logging.LogRecord,
+    backend: Literal["json", "orjson"],
+):
+    record.request_id = 2**70  # Too large for orjson, which falls back to json
+    formatter = DatadocJSONFormatter(fmt_keys=FMT_KEYS, backend=backend)
+    assert formatter.format(record) == DatadocJSONFormatter(
+        fmt_keys=FMT_KEYS,
+        backend="json",
+    ).format(record)
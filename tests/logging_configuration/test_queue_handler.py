@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from datadoc.logging_configuration.logging_config import get_log_config
+from datadoc.logging_configuration.queue_handler import QueueStreamHandler
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class BlockingStream(io.StringIO):
+    """A stream which blocks writing until released, like stdout with back-pressure."""
+
+    def __init__(self) -> None:
+        """Start blocked."""
+        super().__init__()
+        self.writing = threading.Event()
+        self.released = threading.Event()
+
+    def write(self, s: str) -> int:
+        """Wait until released, then write."""
+        self.writing.set()
+        self.released.wait()
+        return super().write(s)
+
+
+def make_record(message: str, *args: object) -> logging.LogRecord:
+    return logging.LogRecord(
+        "datadoc.test",
+        logging.INFO,
+        __file__,
+        1,
+        message,
+        args,
+        None,
+    )
+
+
+@pytest.fixture
+def stream() -> io.StringIO:
+    return io.StringIO()
+
+
+@pytest.fixture
+def handler(stream: io.StringIO) -> Iterator[QueueStreamHandler]:
+    handler = QueueStreamHandler(stream)
+    yield handler
+    handler.close()
+
+
+def test_records_written_by_listener(handler: QueueStreamHandler, stream: io.StringIO):
+    handler.setFormatter(logging.Formatter("%(threadName)s %(message)s"))
+    handler.handle(make_record("Updated %s", "name"))
+    handler.handle(make_record("Updated %s", "version"))
+    handler.flush()
+
+    thread_name = threading.current_thread().name
+    assert stream.getvalue().splitlines() == [
+        f"{thread_name} Updated name",
+        f"{thread_name} Updated version",
+    ]
+
+
+def test_record_arguments_captured_when_logged(
+    handler: QueueStreamHandler,
+    stream: io.StringIO,
+):
+    value = ["a"]
+    handler.handle(make_record("Value %s", value))
+    value.append("b")
+    handler.flush()
+    assert stream.getvalue() == "Value ['a']\n"
+
+
+def test_records_dropped_when_queue_full():
+    stream = BlockingStream()
+    handler = QueueStreamHandler(stream, queue_size=2)
+    handler.handle(make_record("Written"))
+    assert stream.writing.wait(timeout=5)
+    for index in range(4):
+        handler.handle(make_record("Queued %d", index))
+    assert handler.dropped == 2  # noqa: PLR2004
+
+    stream.released.set()
+    handler.flush()
+    handler.handle(make_record("After"))
+    handler.close()
+
+    assert stream.getvalue().splitlines() == [
+        "Written",
+        "Queued 0",
+        "Queued 1",
+        "After",
+        "Dropped 2 log records, the log queue was full",
+    ]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError, match="overflow policy"):
+        QueueStreamHandler(overflow="wait")  # type: ignore[arg-type]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork")
+def test_listener_restarted_after_fork():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "w") as stream:
+        handler = QueueStreamHandler(stream)
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            handler.handle(make_record("From the child"))
+            handler.close()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        handler.close()
+    with os.fdopen(read_fd) as output:
+        assert output.read() == "From the child\n"
+
+
+def test_log_config_with_queue(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DATADOC_LOG_QUEUE_ENABLED", "True")
+    monkeypatch.setenv("DATADOC_LOG_QUEUE_OVERFLOW", "block")
+    handler = get_log_config()["handlers"]["stdout"]
+    assert handler["()"].endswith("QueueStreamHandler")
+    assert handler["overflow"] == "block"
+    assert handler["filters"] == ["request_context"]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from typing import Any
+
+import pytest
+from dash import Dash
+from dash import Input
+from dash import Output
+from dash import html
+
+from datadoc.logging_configuration.edit_log import record_variable_edits
+from datadoc.logging_configuration.request_context import CONTEXT_FIELDS
+from datadoc.logging_configuration.request_context import REQUEST_ID_HEADER
+from datadoc.logging_configuration.request_context import SESSION_COOKIE
+from datadoc.logging_configuration.request_context import RequestContextFilter
+from datadoc.logging_configuration.request_context import get_request_context
+from datadoc.logging_configuration.request_context import init_request_context
+
+CALLBACK_REQUEST = {
+    "output": "output.children",
+    "outputs": {"id": "output", "property": "children"},
+    "inputs": [{"id": "button", "property": "n_clicks", "value": 1}],
+    "changedPropIds": ["button.n_clicks"],
+    "state": [],
+}
+
+
+@pytest.fixture
+def caplog_with_context(caplog: pytest.LogCaptureFixture) -> pytest.LogCaptureFixture:
+    caplog.handler.addFilter(RequestContextFilter())
+    caplog.set_level(logging.INFO, logger="datadoc")
+    return caplog
+
+
+def get_context(record: logging.LogRecord) -> dict[str, Any]:
+    return {field: getattr(record, field) for field in CONTEXT_FIELDS}
+
+
+def get_app(slow_request_threshold: datetime.timedelta) -> Dash:
+    app = Dash(__name__)
+    app.layout = html.Div([html.Button(id="button"), html.Div(id="output")])
+
+    @app.callback(Output("output", "children"), Input("button", "n_clicks"))
+    def callback_click(n_clicks: int | None) -> str:
+        logging.getLogger("datadoc.test").info("Clicked %s times", n_clicks)
+        time.sleep(0.01)
+        return str(n_clicks)
+
+    init_request_context(app, slow_request_threshold)
+    return app
+
+
+def test_log_records_have_request_context(
+    caplog_with_context: pytest.LogCaptureFixture,
+):
+    client = get_app(datetime.timedelta(minutes=1)).server.test_client()
+
+    response = client.post(
+        "/_dash-update-component",
+        json=CALLBACK_REQUEST,
+        headers={REQUEST_ID_HEADER: "abc"},
+    )
+
+    (record,) = caplog_with_context.records
+    context = get_context(record)
+    assert context["request_id"] == "abc"
+    assert context["callback"] == "callback_click"
+    assert context["elapsed_ms"] >= 0
+    assert response.headers[REQUEST_ID_HEADER] == "abc"
+    assert context["session_id"] == client.get_cookie(SESSION_COOKIE).value
+    assert get_request_context() is None
+
+
+def test_session_id_kept_between_requests(
+    caplog_with_context: pytest.LogCaptureFixture,
+):
+    client = get_app(datetime.timedelta(minutes=1)).server.test_client()
+
+    client.post("/_dash-update-component", json=CALLBACK_REQUEST)
+    client.post("/_dash-update-component", json=CALLBACK_REQUEST)
+
+    first, second = caplog_with_context.records
+    assert get_context(first)["request_id"] != get_context(second)["request_id"]
+    assert get_context(first)["session_id"] == get_context(second)["session_id"]
+
+
+def test_slow_request_logged(caplog_with_context: pytest.LogCaptureFixture):
+    client = get_app(datetime.timedelta(0)).server.test_client()
+
+    client.post("/_dash-update-component", json=CALLBACK_REQUEST)
+
+    (slow,) = [
+        r
+        for r in caplog_with_context.records
+        if r.getMessage().startswith("Slow request")
+    ]
+    assert slow.levelno == logging.WARNING
+    assert get_context(slow)["callback"] == "callback_click"
+    assert "POST /_dash-update-component" in slow.getMessage()
+
+
+def test_edits_logged_once_for_request(
+    caplog_with_context: pytest.LogCaptureFixture,
+):
+    app = Dash(__name__)
+    app.layout = html.Div([html.Button(id="button"), html.Div(id="output")])
+
+    @app.callback(Output("output", "children"), Input("button", "n_clicks"))
+    def callback_edit(n_clicks: int | None) -> str:
+        for index in range(1000):
+            record_variable_edits("name", [f"var_{index}"])
+        return str(n_clicks)
+
+    init_request_context(app, datetime.timedelta(minutes=1))
+    app.server.test_client().post("/_dash-update-component", json=CALLBACK_REQUEST)
+
+    (summary,) = caplog_with_context.records
+    assert summary.getMessage().startswith(
+        "Updated 1,000 fields on 1,000 variables in ",
+    )
+    assert get_context(summary)["callback"] == "callback_edit"
+
+
+def test_no_context_outside_requests():
+    record = logging.LogRecord("datadoc.test", logging.INFO, __file__, 1, "", (), None)
+    RequestContextFilter().filter(record)
+    assert get_context(record) == dict.fromkeys(CONTEXT_FIELDS)
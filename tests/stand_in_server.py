@@ -0,0 +1,128 @@
+"""Local HTTP stand-in for Klass and the statistical subject structure."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from typing import Self
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+KLASS_PATH = "/api/klass/v1/"
+KLASS_CODES_PATH = re.compile(KLASS_PATH + r"classifications/(\d+)/codes")
+SUBJECT_STRUCTURE_PATH = "/statistical_subject_structure"
+
+
+class ExternalSourcesStandIn:
+    """Serve Klass codes and a statistical structure document on localhost.
+
+    Attributes:
+        codes: Codes served for each classification ID and language.
+        subject_structure: The statistical structure document.
+        delay: Seconds to wait before answering each request.
+        requests: The paths of the requests received, in order.
+        statuses: The status of each response, in order.
+
+    Responses have an ETag, and conditional requests for unchanged content
+    are answered with 304 Not Modified.
+    """
+
+    def __init__(
+        self,
+        codes: dict[int, dict[str, list[dict[str, str]]]] | None = None,
+        subject_structure: str = "",
+        delay: float = 0,
+    ) -> None:
+        """Start listening on a free port. Requests are served inside the context manager."""
+        self.codes = codes or {}
+        self.subject_structure = subject_structure
+        self.delay = delay
+        self.requests: list[str] = []
+        self.statuses: list[int] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """The URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def klass_base_url(self) -> str:
+        """The base URL of the Klass API."""
+        return self.url + KLASS_PATH
+
+    @property
+    def subject_structure_url(self) -> str:
+        """The URL of the statistical structure document."""
+        return self.url + SUBJECT_STRUCTURE_PATH
+
+    def __enter__(self) -> Self:
+        """Start serving requests."""
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop serving requests."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(self, path: str, query: dict[str, list[str]]) -> tuple[int, str, str]:
+        """Get the status, content type and body for a request."""
+        self.requests.append(path)
+        if self.delay:
+            time.sleep(self.delay)
+        if path == SUBJECT_STRUCTURE_PATH:
+            return HTTPStatus.OK, "application/xml", self.subject_structure
+        if match := KLASS_CODES_PATH.fullmatch(path):
+            language = query.get("language", ["nb"])[0]
+            codes = self.codes.get(int(match.group(1)))
+            if codes is not None:
+                body = json.dumps({"codes": codes.get(language, [])})
+                return HTTPStatus.OK, "application/json", body
+        return HTTPStatus.NOT_FOUND, "text/plain", "Not found"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urllib.parse.urlparse(self.path)
+                status, content_type, body = stand_in._respond(
+                    url.path,
+                    urllib.parse.parse_qs(url.query),
+                )
+                encoded = body.encode("utf-8")
+                etag = f'"{hashlib.sha256(encoded).hexdigest()}"'
+                if (
+                    status == HTTPStatus.OK
+                    and self.headers.get("If-None-Match") == etag
+                ):
+                    status, encoded = HTTPStatus.NOT_MODIFIED, b""
+                stand_in.statuses.append(status)
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                """Keep the test output clean."""
+
+        return Handler
@@ -0,0 +1,271 @@
+"""Synthetic datasets for exercising Datadoc at production scale.
+
+The datasets follow the Dapla naming standard, and are generated
+deterministically from a seed, so the same arguments always give the same
+data and metadata documents.
+"""
+
+from __future__ import annotations
+
+import datetime
+import random
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dapla_metadata.datasets import model
+from dapla_metadata.datasets.dataset_parser import DatasetParser
+from faker import Faker
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Callable
+    from collections.abc import Mapping
+
+METADATA_DOCUMENT_SUFFIX = "__DOC.json"
+FIRST_PERIOD = 2021
+FIRST_PERIOD_START = datetime.datetime(FIRST_PERIOD, 1, 1)  # noqa: DTZ001
+
+# The proportion of variables of each data type in a typical dataset
+DEFAULT_TYPE_MIX: Mapping[str, float] = {
+    "integer": 0.4,
+    "float": 0.2,
+    "string": 0.3,
+    "boolean": 0.05,
+    "datetime": 0.05,
+}
+
+ARROW_TYPES: Mapping[str, pa.DataType] = {
+    "integer": pa.int64(),
+    "float": pa.float64(),
+    "string": pa.string(),
+    "boolean": pa.bool_(),
+    "datetime": pa.timestamp("us"),
+}
+
+
+@dataclass(frozen=True)
+class SyntheticDataset:
+    """A generated dataset.
+
+    Attributes:
+        paths: A data file for each partition, one period each, in order.
+        metadata_documents: The metadata document for each data file, empty
+            if no metadata was filled in.
+    """
+
+    paths: list[pathlib.Path]
+    metadata_documents: list[pathlib.Path]
+
+    @property
+    def path(self) -> pathlib.Path:
+        """The data file for the first partition."""
+        return self.paths[0]
+
+
+class _Generator:
+    def __init__(self, seed: int) -> None:
+        self.random = random.Random(seed)  # noqa: S311
+        self.faker = Faker("no_NO")
+        self.faker.seed_instance(seed)
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+
+    def language_string(self) -> model.LanguageStringType:
+        return model.LanguageStringType(
+            [
+                model.LanguageStringTypeItem(
+                    languageCode="nb",
+                    languageText=self.faker.sentence(nb_words=4),
+                ),
+            ],
+        )
+
+    def column(self, data_type: str, num_rows: int) -> list:
+        values: dict[str, Callable[[], object]] = {
+            "integer": lambda: self.random.randint(0, 1_000_000),
+            "float": lambda: self.random.uniform(0, 1_000),
+            "string": self.faker.word,
+            "boolean": self.boolean,
+            "datetime": lambda: FIRST_PERIOD_START
+            + datetime.timedelta(days=self.random.uniform(0, 365)),
+        }
+        return [values[data_type]() for _ in range(num_rows)]
+
+    def boolean(self) -> bool:
+        return self.random.choice([True, False])
+
+    def variable_fields(self) -> Mapping[str, Callable[[], object]]:
+        """The fields a user fills in for a variable, and how to fill them."""
+        return {
+            "name": self.language_string,
+            "variable_role": lambda: self.random.choice(list(model.VariableRole)),
+            "definition_uri": self.faker.url,
+            "is_personal_data": lambda: self.random.choice(
+                list(model.IsPersonalData),
+            ),
+            "data_source": lambda: f"{self.random.randint(1, 20):02}",
+            "population_description": self.language_string,
+            "comment": self.language_string,
+            "temporality_type": lambda: self.random.choice(
+                list(model.TemporalityTypeType),
+            ),
+            "measurement_unit": lambda: f"{self.random.randint(1, 20):02}",
+            "multiplication_factor": lambda: self.random.choice([1, 1_000]),
+            "invalid_value_description": self.language_string,
+        }
+
+    def dataset_fields(self) -> Mapping[str, Callable[[], object]]:
+        """The fields a user fills in for a dataset, and how to fill them."""
+        return {
+            "name": self.language_string,
+            "description": self.language_string,
+            "assessment": lambda: self.random.choice(list(model.Assessment)),
+            "dataset_status": lambda: self.random.choice(list(model.DataSetStatus)),
+            "data_source": lambda: f"{self.random.randint(1, 20):02}",
+            "population_description": self.language_string,
+            "version_description": self.language_string,
+            "unit_type": lambda: f"{self.random.randint(1, 20):02}",
+            "temporality_type": lambda: self.random.choice(
+                list(model.TemporalityTypeType),
+            ),
+            "subject_field": self.faker.word,
+            "keyword": lambda: self.faker.words(nb=3),
+            "spatial_coverage_description": self.language_string,
+            "contains_personal_data": self.boolean,
+            "owner": lambda: self.faker.bothify("###"),
+        }
+
+    def fill(
+        self,
+        metadata: model.Dataset | model.Variable,
+        fields: Mapping[str, Callable[[], object]],
+        fill_ratio: float,
+    ) -> None:
+        for field in self.random.sample(
+            sorted(fields),
+            round(fill_ratio * len(fields)),
+        ):
+            setattr(metadata, field, fields[field]())
+
+
+def generate_dataset(  # noqa: PLR0913
+    directory: pathlib.Path,
+    *,
+    num_variables: int = 10,
+    num_rows: int = 5,
+    type_mix: Mapping[str, float] = DEFAULT_TYPE_MIX,
+    partitions: int = 1,
+    fill_ratio: float = 0.0,
+    seed: int = 0,
+    short_name: str = "person_testdata",
+    statistic_short_name: str = "ifpn",
+) -> SyntheticDataset:
+    """Generate a Parquet dataset and matching metadata documents.
+
+    The dataset is partitioned into a data file for each yearly period,
+    starting in 2021, with the same variables in each. The files are placed
+    in `<directory>/<statistic_short_name>/klargjorte_data/`.
+
+    Args:
+        directory: The directory to place the dataset in.
+        num_variables: The number of variables.
+        num_rows: The number of rows in each data file.
+        type_mix: The relative weight of each data type among the variables,
+            keyed by the names in `ARROW_TYPES`.
+        partitions: The number of data files.
+        fill_ratio: The proportion of the metadata fields a user fills in,
+            for the dataset and for each variable. No metadata documents are
+            written when this is 0.
+        seed: Seed for the random data and metadata.
+        short_name: The short name of the dataset.
+        statistic_short_name: The short name of the statistic the dataset belongs to.
+
+    Returns:
+        The paths to the generated files.
+    """
+    generator = _Generator(seed)
+    data_types = generator.random.choices(
+        list(type_mix),
+        weights=list(type_mix.values()),
+        k=num_variables,
+    )
+    schema = pa.schema(
+        [
+            (f"var_{index}", ARROW_TYPES[data_type])
+            for index, data_type in enumerate(data_types)
+        ],
+    )
+    dataset_directory = directory / statistic_short_name / "klargjorte_data"
+    dataset_directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    metadata_documents = []
+    for period in range(FIRST_PERIOD, FIRST_PERIOD + partitions):
+        path = dataset_directory / f"{short_name}_p{period}_v1.parquet"
+        pq.write_table(
+            pa.table(
+                [generator.column(data_type, num_rows) for data_type in data_types],
+                schema=schema,
+            ),
+            path,
+        )
+        paths.append(path)
+        if fill_ratio > 0:
+            document = path.with_name(f"{path.stem}{METADATA_DOCUMENT_SUFFIX}")
+            document.write_text(
+                _build_metadata_document(
+                    generator,
+                    path,
+                    short_name=short_name,
+                    schema=schema,
+                    period=period,
+                    fill_ratio=fill_ratio,
+                ).model_dump_json(indent=4),
+                encoding="utf-8",
+            )
+            metadata_documents.append(document)
+    return SyntheticDataset(paths, metadata_documents)
+
+
+def _build_metadata_document(  # noqa: PLR0913
+    generator: _Generator,
+    path: pathlib.Path,
+    *,
+    short_name: str,
+    schema: pa.Schema,
+    period: int,
+    fill_ratio: float,
+) -> model.MetadataContainer:
+    timestamp = datetime.datetime(period + 1, 1, 1, tzinfo=datetime.timezone.utc)
+    dataset = model.Dataset(
+        short_name=short_name,
+        dataset_state=model.DataSetState.PROCESSED_DATA,
+        version="1",
+        id=generator.uuid(),
+        file_path=str(path),
+        metadata_created_date=timestamp,
+        metadata_created_by="synthetic@ssb.no",
+        metadata_last_updated_date=timestamp,
+        metadata_last_updated_by="synthetic@ssb.no",
+        contains_data_from=datetime.date(period, 1, 1),
+        contains_data_until=datetime.date(period, 12, 31),
+    )
+    generator.fill(dataset, generator.dataset_fields(), fill_ratio)
+    variables = []
+    for field in schema:
+        variable = model.Variable(
+            short_name=field.name,
+            data_type=DatasetParser.transform_data_type(str(field.type)),
+            id=generator.uuid(),
+            contains_data_from=dataset.contains_data_from,
+            contains_data_until=dataset.contains_data_until,
+        )
+        generator.fill(variable, generator.variable_fields(), fill_ratio)
+        variables.append(variable)
+    return model.MetadataContainer(
+        datadoc=model.DatadocMetadata(dataset=dataset, variables=variables),
+    )
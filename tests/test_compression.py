@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from unittest.mock import MagicMock
+
+import flask
+import pytest
+from dash import Dash
+from dash import html
+
+from datadoc.compression import COMPRESSORS
+from datadoc.compression import IDENTITY
+from datadoc.compression import init_compression
+from datadoc.metrics import RESPONSE_COMPRESSED_SIZE
+from datadoc.metrics import RESPONSE_SIZE
+
+LARGE_JSON = json.dumps([{"short_name": f"var_{i}"} for i in range(1000)])
+
+
+@pytest.fixture
+def client():
+    app = Dash(__name__)
+    app.layout = html.Div()
+
+    @app.server.route("/large.json")
+    def large_json() -> flask.Response:
+        return flask.Response(LARGE_JSON, mimetype="application/json")
+
+    @app.server.route("/small.json")
+    def small_json() -> flask.Response:
+        return flask.Response("{}", mimetype="application/json")
+
+    @app.server.route("/tagged.json")
+    def tagged_json() -> flask.Response:
+        response = flask.Response(LARGE_JSON, mimetype="application/json")
+        response.set_etag("v1")
+        return response
+
+    @app.server.route("/fingerprinted.v1.json")
+    def fingerprinted_json() -> flask.Response:
+        response = flask.Response(LARGE_JSON, mimetype="application/json")
+        response.cache_control.max_age = 31536000
+        return response
+
+    @app.server.route("/large.bin")
+    def large_binary() -> flask.Response:
+        return flask.Response(LARGE_JSON, mimetype="application/octet-stream")
+
+    init_compression(
+        app,
+        encodings=["gzip"],
+        min_size=1024,
+        content_types={"application/json"},
+    )
+    return app.server.test_client()
+
+
+def test_large_json_compressed(client: flask.testing.FlaskClient):
+    before = RESPONSE_COMPRESSED_SIZE.count("/large.json", "gzip")
+
+    response = client.get("/large.json", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.content_length < len(LARGE_JSON)
+    assert gzip.decompress(response.get_data()).decode() == LARGE_JSON
+    assert RESPONSE_COMPRESSED_SIZE.count("/large.json", "gzip") == before + 1
+
+
+@pytest.mark.parametrize(
+    ("path", "compressions"),
+    [
+        ("/large.json", 2),
+        ("/tagged.json", 1),
+        ("/fingerprinted.v1.json", 1),
+    ],
+)
+def test_unchanging_bodies_compressed_once(
+    monkeypatch: pytest.MonkeyPatch,
+    client: flask.testing.FlaskClient,
+    path: str,
+    compressions: int,
+):
+    compress = MagicMock(wraps=COMPRESSORS["gzip"])
+    monkeypatch.setitem(COMPRESSORS, "gzip", compress)
+
+    for _ in range(2):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert gzip.decompress(response.get_data()).decode() == LARGE_JSON
+
+    assert compress.call_count == compressions
+
+
+@pytest.mark.parametrize(
+    ("path", "accept_encoding"),
+    [
+        ("/large.json", ""),
+        ("/large.json", "gzip;q=0"),
+        ("/small.json", "gzip"),
+        ("/large.bin", "gzip"),
+    ],
+)
+def test_sent_uncompressed(
+    client: flask.testing.FlaskClient,
+    path: str,
+    accept_encoding: str,
+):
+    before = RESPONSE_SIZE.count(path, IDENTITY)
+
+    response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    assert "Content-Encoding" not in response.headers
+    assert RESPONSE_SIZE.count(path, IDENTITY) == before + 1
+
+
+def test_unavailable_encoding(caplog: pytest.LogCaptureFixture):
+    app = Dash(__name__)
+    after_request_funcs = {
+        key: list(funcs) for key, funcs in app.server.after_request_funcs.items()
+    }
+    with caplog.at_level(logging.WARNING, logger="datadoc"):
+        init_compression(
+            app,
+            encodings=["zstd"],
+            min_size=0,
+            content_types={"application/json"},
+        )
+    assert "Compression with zstd isn't available" in caplog.text
+    assert app.server.after_request_funcs == after_request_funcs
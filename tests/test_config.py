@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import signal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from datadoc import config
+
+if TYPE_CHECKING:
+    import pathlib
+
+
+def test_snapshot_read_once(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DATADOC_DATASET_PATH", "gs://bucket/first.parquet")
+    snapshot = config.load_config()
+    monkeypatch.setenv("DATADOC_DATASET_PATH", "gs://bucket/second.parquet")
+
+    assert config.get_config() is snapshot
+    assert snapshot.datadoc_dataset_path == "gs://bucket/first.parquet"
+    assert config.load_config().datadoc_dataset_path == "gs://bucket/second.parquet"
+
+
+def test_snapshot_holds_naming_standard_url(monkeypatch: pytest.MonkeyPatch):
+    url = "https://manual.dapla.ssb.no/navnestandard.html"
+    monkeypatch.setenv("DAPLA_MANUAL_NAMING_STANDARD_URL", url)
+    assert config.load_config().dapla_manual_naming_standard_url == url
+
+    monkeypatch.delenv("DAPLA_MANUAL_NAMING_STANDARD_URL")
+    assert config.load_config().dapla_manual_naming_standard_url is None
+
+
+def test_reload_dotenv_file(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+):
+    dotenv_file = tmp_path / ".env"
+    dotenv_file.write_text("DATADOC_APP_NAME=First\nDATADOC_PORT=8000\n")
+    monkeypatch.setattr(config, "DOT_ENV_FILE_PATH", dotenv_file)
+    monkeypatch.setattr(config, "_dotenv_variables", set())
+    monkeypatch.setenv("DATADOC_PORT", "9000")
+    assert config.load_config().app_name == "First"
+
+    dotenv_file.write_text("DATADOC_APP_NAME=Second\nDATADOC_PORT=8000\n")
+    snapshot = config.load_config()
+
+    assert snapshot.app_name == "Second"
+    # The environment takes precedence over the .env file
+    assert snapshot.port == 9000  # noqa: PLR2004
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="Needs SIGHUP")
+def test_reload_on_sighup(monkeypatch: pytest.MonkeyPatch):
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        config.reload_config_on_sighup()
+        monkeypatch.setenv("DATADOC_APP_NAME", "Reloaded")
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert config.get_config().app_name == "Reloaded"
+    finally:
+        signal.signal(signal.SIGHUP, previous)
@@ -0,0 +1,108 @@
+"""Import-time budgets, measured with `python -X importtime`.
+
+The budgets are relative to the time it takes to import dash alone, measured
+in the same way, so they hold on slow machines as well as fast ones.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import pytest
+
+# Dependencies which take hundreds of milliseconds to import
+HEAVY_MODULES = {
+    "dapla_metadata",
+    "dash",
+    "dash_bootstrap_components",
+    "pandas",
+    "pyarrow",
+    "ssb_dash_components",
+}
+
+# Modules which don't need the frontend may take this fraction of dash's
+# time. Measured at up to 0.35, for datadoc.app which imports flask.
+LIGHT_MODULE_BUDGET = 0.75
+# What the frontend imports, apart from the heavy dependencies, may take this
+# fraction of dash's time. Measured at about 0.3.
+APP_MODULES_BUDGET = 1
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    """The cumulative import time of a module, in seconds, and how deeply it was nested."""
+
+    name: str
+    seconds: float
+    level: int
+
+
+def _import_times(module: str) -> list[ImportTime]:
+    """Import the module in a fresh interpreter.
+
+    Returns:
+        Every module imported, in the order `-X importtime` reports them,
+        which is each module after the modules it imported.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # Nested imports are indented by two spaces for each level
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append(ImportTime(name.strip(), int(cumulative) / 1_000_000, level))
+    return times
+
+
+def _seconds(times: list[ImportTime], module: str) -> float:
+    return next(time.seconds for time in times if time.name == module)
+
+
+def _heavy_seconds(times: list[ImportTime]) -> float:
+    """Sum the import time of the heavy modules, counting each nested one only once."""
+    total = 0.0
+    importers: list[str] = []
+    for time in reversed(times):
+        del importers[time.level :]
+        if time.name in HEAVY_MODULES and HEAVY_MODULES.isdisjoint(importers):
+            total += time.seconds
+        importers.append(time.name)
+    return total
+
+
+@pytest.fixture(scope="module")
+def dash_seconds() -> float:
+    return _seconds(_import_times("dash"), "dash")
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "datadoc",
+        "datadoc.app",
+        "datadoc.config",
+        "datadoc.state",
+        "datadoc.external_sources.cache",
+        "datadoc.external_sources.loader",
+    ],
+)
+def test_light_modules_import_quickly(module: str, dash_seconds: float):
+    times = _import_times(module)
+    assert HEAVY_MODULES.isdisjoint(time.name for time in times)
+    assert _seconds(times, module) < LIGHT_MODULE_BUDGET * dash_seconds
+
+
+def test_app_modules_import_budget(dash_seconds: float):
+    module = "datadoc.frontend.callbacks.register_callbacks"
+    times = _import_times(module)
+    own_seconds = _seconds(times, module) - _heavy_seconds(times)
+    assert own_seconds < APP_MODULES_BUDGET * dash_seconds
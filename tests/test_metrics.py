@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+
+import flask
+import pytest
+from dash.exceptions import PreventUpdate
+
+from datadoc import state
+from datadoc.app import get_app
+from datadoc.metrics import CALLBACK_DURATION
+from datadoc.metrics import CALLBACK_OUTPUT_SIZE
+from datadoc.metrics import ERROR
+from datadoc.metrics import PREVENTED
+from datadoc.metrics import SUCCESS
+from datadoc.metrics import Histogram
+from datadoc.metrics import instrument_callback
+
+
+def test_histogram_exposition():
+    histogram = Histogram("test_seconds", "A test.", ("callback",), (0.1, 1))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5, "a")
+
+    assert list(histogram.collect()) == [
+        "# HELP test_seconds A test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{callback="a",le="0.1"} 1',
+        'test_seconds_bucket{callback="a",le="1"} 2',
+        'test_seconds_bucket{callback="a",le="+Inf"} 3',
+        'test_seconds_sum{callback="a"} 5.55',
+        'test_seconds_count{callback="a"} 3',
+    ]
+
+
+def test_histogram_escapes_label_values():
+    histogram = Histogram("test_bytes", "A test.", ("callback",), (1,))
+    histogram.observe(1, 'a "quoted"\\name')
+    assert 'callback="a \\"quoted\\"\\\\name"' in "\n".join(histogram.collect())
+
+
+# Not ASCII, so the size in bytes differs from the length
+RESPONSE = '{"response": {"value": "Bokmål"}}'
+
+
+@pytest.mark.parametrize(
+    ("exception", "outcome", "output_size"),
+    [
+        (None, SUCCESS, len(RESPONSE.encode())),
+        (PreventUpdate, PREVENTED, 0),
+        (ValueError, ERROR, 0),
+    ],
+)
+def test_instrument_callback(
+    exception: type[Exception] | None,
+    outcome: str,
+    output_size: int,
+):
+    name = f"test_instrument_callback_{outcome}"
+
+    def callback() -> str:
+        if exception:
+            raise exception
+        return RESPONSE
+
+    instrumented = instrument_callback(name, callback)
+    server = flask.Flask(__name__)
+    server.add_url_rule("/callback", view_func=instrumented, methods=["POST"])
+    response = server.test_client().post("/callback")
+    if exception:
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+    else:
+        assert response.text == RESPONSE
+
+    assert CALLBACK_DURATION.count(name, outcome) == 1
+    assert (
+        f'datadoc_callback_output_bytes_sum{{callback="{name}",outcome="{outcome}"}}'
+        f" {float(output_size)}"
+    ) in "\n".join(CALLBACK_OUTPUT_SIZE.collect())
+
+
+def test_metrics_endpoint(
+    subject_mapping_fake_statistical_structure,
+    code_list_fake_structure,
+    thread_pool_executor,
+):
+    state.statistic_subject_mapping = subject_mapping_fake_statistical_structure
+    state.code_list = code_list_fake_structure
+    app, _ = get_app(thread_pool_executor)
+    client = app.server.test_client()
+    before = CALLBACK_DURATION.count("callback_render_tabs", SUCCESS)
+
+    response = client.post(
+        "/_dash-update-component",
+        json={
+            "output": "display-tab.children",
+            "outputs": {"id": "display-tab", "property": "children"},
+            "inputs": [{"id": "tabs", "property": "value", "value": "dataset"}],
+            "changedPropIds": ["tabs.value"],
+            "state": [],
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert CALLBACK_DURATION.count("callback_render_tabs", SUCCESS) == before + 1
+
+    response = client.get("/metrics")
+    assert response.status_code == HTTPStatus.OK
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert (
+        'datadoc_callback_input_bytes_count{callback="callback_render_tabs",outcome="success"}'
+        in response.text
+    )
+    assert (
+        'datadoc_callback_output_bytes_count{callback="callback_render_tabs",outcome="success"}'
+        in response.text
+    )
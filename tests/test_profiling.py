@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pstats
+from typing import TYPE_CHECKING
+
+import flask
+import pytest
+from dash import Dash
+from dash import Input
+from dash import Output
+from dash import html
+
+from datadoc import config
+from datadoc.profiling import PROFILE_HEADER
+from datadoc.profiling import PROFILE_SUFFIX
+from datadoc.profiling import CallbackProfiler
+from datadoc.profiling import profile_callbacks
+
+if TYPE_CHECKING:
+    import pathlib
+
+RESPONSE = '{"response": {}}'
+
+
+def callback_save() -> str:
+    return RESPONSE
+
+
+def test_profile_selected_callback(tmp_path: pathlib.Path):
+    profiler = CallbackProfiler(tmp_path, callbacks={"callback_save"})
+    assert profiler.wrap("callback_save", callback_save)() == RESPONSE
+
+    (profile,) = tmp_path.glob(f"*callback_save*{PROFILE_SUFFIX}")
+    assert any(
+        function_name == "callback_save"
+        for _, _, function_name in pstats.Stats(str(profile)).stats  # type: ignore[attr-defined]
+    )
+
+
+def test_unselected_callback_not_profiled(tmp_path: pathlib.Path):
+    profiler = CallbackProfiler(tmp_path, callbacks={"callback_other"})
+    profiler.wrap("callback_save", callback_save)()
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(("sample", "profiled"), [(0.05, True), (0.5, False)])
+def test_sampled_requests_profiled(
+    tmp_path: pathlib.Path,
+    sample: float,
+    profiled: bool,  # noqa: FBT001
+):
+    profiler = CallbackProfiler(tmp_path, sample_rate=0.1, sample=lambda: sample)
+    profiler.wrap("callback_save", callback_save)()
+    assert bool(list(tmp_path.iterdir())) == profiled
+
+
+@pytest.mark.parametrize(
+    ("token", "header", "profiled"),
+    [
+        ("secret", "secret", True),
+        ("secret", "guess", False),
+        (None, "secret", False),
+    ],
+)
+def test_profile_header(
+    tmp_path: pathlib.Path,
+    token: str | None,
+    header: str,
+    profiled: bool,  # noqa: FBT001
+):
+    profiler = CallbackProfiler(tmp_path, token=token)
+    with flask.Flask(__name__).test_request_context(headers={PROFILE_HEADER: header}):
+        profiler.wrap("callback_save", callback_save)()
+    assert bool(list(tmp_path.iterdir())) == profiled
+
+
+def test_oldest_profiles_deleted(tmp_path: pathlib.Path):
+    profiler = CallbackProfiler(tmp_path, callbacks={"callback_save"})
+    profiled = profiler.wrap("callback_save", callback_save)
+    profiled()
+    (first,) = tmp_path.iterdir()
+    profiler.max_bytes = first.stat().st_size * 2
+    for _ in range(5):
+        profiled()
+
+    profiles = sorted(tmp_path.iterdir())
+    assert first not in profiles
+    assert sum(path.stat().st_size for path in profiles) <= profiler.max_bytes
+
+
+def test_profile_callbacks_from_config(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    app = Dash(__name__)
+    app.layout = html.Div([html.Button(id="button"), html.Div(id="output")])
+
+    @app.callback(Output("output", "children"), Input("button", "n_clicks"))
+    def callback_click(n_clicks: int | None) -> str:
+        return str(n_clicks)
+
+    (callback,) = app.callback_map.values()
+    unprofiled = callback["callback"]
+    profile_callbacks(app)
+    assert callback["callback"] is unprofiled
+
+    monkeypatch.setenv("DATADOC_PROFILING_DIRECTORY", str(tmp_path))
+    monkeypatch.setenv("DATADOC_PROFILING_CALLBACKS", "callback_click, callback_other")
+    config.load_config()
+    profile_callbacks(app)
+    response = app.server.test_client().post(
+        "/_dash-update-component",
+        json={
+            "output": "output.children",
+            "outputs": {"id": "output", "property": "children"},
+            "inputs": [{"id": "button", "property": "n_clicks", "value": 1}],
+            "changedPropIds": ["button.n_clicks"],
+            "state": [],
+        },
+    )
+    assert response.json["response"]["output"]["children"] == "1"
+    assert len(list(tmp_path.glob(f"*callback_click*{PROFILE_SUFFIX}"))) == 1
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import datetime
+import logging
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from flask_healthz import HealthError
+
+from datadoc import state
+from datadoc.app import get_app
+from datadoc.external_sources.loader import ExternalSourcesLoader
+from datadoc.readiness import Readiness
+
+TIMEOUT = datetime.timedelta(seconds=10)
+
+
+@pytest.fixture
+def sources_loaded(mocker) -> MagicMock:
+    return mocker.patch(
+        "datadoc.readiness.external_sources_loaded",
+        return_value=True,
+    )
+
+
+def test_not_ready_until_warmed_up(sources_loaded):
+    readiness = Readiness(TIMEOUT)
+    with pytest.raises(HealthError, match="layout, warm-up"):
+        readiness.check()
+    readiness.mark_layout_built()
+    readiness.warm_up(lambda: None)
+    readiness.check()
+    assert readiness.get_pending() == []
+    assert not readiness.degraded
+
+    sources_loaded.return_value = False
+    assert readiness.get_pending() == ["external sources"]
+
+
+def test_degraded_mode_after_timeout(sources_loaded):
+    sources_loaded.return_value = False
+    clock = MagicMock(return_value=0.0)
+    readiness = Readiness(TIMEOUT, clock=clock)
+    readiness.mark_layout_built()
+    with pytest.raises(HealthError, match="external sources"):
+        readiness.check()
+
+    clock.return_value = TIMEOUT.total_seconds()
+    readiness.check()
+    assert readiness.degraded
+
+
+def test_degraded_mode_disabled(sources_loaded):
+    sources_loaded.return_value = False
+    clock = MagicMock(return_value=0.0)
+    readiness = Readiness(TIMEOUT, allow_degraded=False, clock=clock)
+    readiness.mark_layout_built()
+    clock.return_value = TIMEOUT.total_seconds() * 10
+    with pytest.raises(HealthError, match="external sources"):
+        readiness.check()
+    assert not readiness.degraded
+
+
+@pytest.mark.usefixtures("sources_loaded")
+def test_warm_up_renders_once():
+    render = MagicMock()
+    readiness = Readiness(TIMEOUT)
+    readiness.warm_up(render)
+    readiness.warm_up(render)
+    render.assert_called_once()
+
+
+@pytest.mark.usefixtures("sources_loaded")
+def test_failed_warm_up_still_finishes(caplog: pytest.LogCaptureFixture):
+    readiness = Readiness(TIMEOUT)
+    with caplog.at_level(logging.INFO, logger="datadoc.readiness"):
+        readiness.warm_up(MagicMock(side_effect=ValueError))
+    assert readiness.warmed_up
+    assert [(r.levelno, r.message) for r in caplog.records] == [
+        (logging.WARNING, "Warm-up render failed"),
+    ]
+    assert caplog.records[0].exc_info
+
+
+def test_ready_endpoint(external_sources_stand_in, monkeypatch):
+    monkeypatch.setenv(
+        "DATADOC_KLASS_BASE_URL",
+        external_sources_stand_in.klass_base_url,
+    )
+    monkeypatch.setenv(
+        "DATADOC_STATISTICAL_SUBJECT_SOURCE_URL",
+        external_sources_stand_in.subject_structure_url,
+    )
+    monkeypatch.setenv("DATADOC_READINESS_ALLOW_DEGRADED", "False")
+    external_sources_stand_in.delay = 0.5
+    with ExternalSourcesLoader() as executor:
+        app, _ = get_app(executor)
+        client = app.server.test_client()
+
+        response = client.get("/healthz/ready")
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert "external sources" in response.json["title"]
+
+        assert state.readiness.wait_until_warmed_up(timeout=10)
+        response = client.get("/healthz/ready")
+        assert response.status_code == HTTPStatus.OK
@@ -1,7 +1,18 @@
 """Smoke tests."""
 
+import json
+from http import HTTPStatus
+
+from plotly.io.json import to_json_plotly
+
 from datadoc import state
 from datadoc.app import get_app
+from datadoc.frontend.callbacks.utils import get_metadata_version
+from datadoc.frontend.components.identifiers import COMPLETENESS_VERSION_STORE_ID
+from datadoc.frontend.components.identifiers import EXTERNAL_SOURCES_INTERVAL_ID
+from datadoc.frontend.fields.display_base import DATASET_METADATA_MULTILANGUAGE_INPUT
+from tests.utils import TEST_PARQUET_FILE_NAME
+from tests.utils import TEST_PARQUET_FILEPATH
 
 
 def test_get_app(
@@ -15,3 +26,85 @@ def test_get_app(
     app, _ = get_app(thread_pool_executor)
     assert app.config["name"] == "Datadoc"
     assert len(app.callback_map.items()) > 0
+
+
+def test_layout_served_from_cache(
+    subject_mapping_fake_statistical_structure,
+    code_list_fake_structure,
+    thread_pool_executor,
+):
+    state.statistic_subject_mapping = subject_mapping_fake_statistical_structure
+    state.code_list = code_list_fake_structure
+    app, _ = get_app(thread_pool_executor)
+    client = app.server.test_client()
+
+    response = client.get("/_dash-layout")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == json.loads(to_json_plotly(app.layout))
+
+    cached = client.get(
+        "/_dash-layout",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_app_with_dataset_path(
+    subject_mapping_fake_statistical_structure,
+    code_list_fake_structure,
+    thread_pool_executor,
+):
+    state.statistic_subject_mapping = subject_mapping_fake_statistical_structure
+    state.code_list = code_list_fake_structure
+    app, _ = get_app(thread_pool_executor, str(TEST_PARQUET_FILEPATH))
+
+    response = app.server.test_client().get("/_dash-layout")
+    assert response.status_code == HTTPStatus.OK
+    assert TEST_PARQUET_FILE_NAME in response.get_data(as_text=True)
+
+
+def test_edit_sends_completeness_version(
+    subject_mapping_fake_statistical_structure,
+    code_list_fake_structure,
+    thread_pool_executor,
+):
+    state.statistic_subject_mapping = subject_mapping_fake_statistical_structure
+    state.code_list = code_list_fake_structure
+    app, _ = get_app(thread_pool_executor, str(TEST_PARQUET_FILEPATH))
+    # The completeness indicators are only updated after an edit. The only
+    # polling left is for the external sources, until they have loaded.
+    polled = {
+        input_["id"]
+        for callback in app.callback_map.values()
+        for input_ in callback["inputs"]
+        if input_["property"] == "n_intervals"
+    }
+    assert polled == {EXTERNAL_SOURCES_INTERVAL_ID}
+
+    input_id = {
+        "id": "name",
+        "language": "nb",
+        "type": DATASET_METADATA_MULTILANGUAGE_INPUT,
+    }
+    output, _ = next(
+        (output, callback)
+        for output, callback in app.callback_map.items()
+        if DATASET_METADATA_MULTILANGUAGE_INPUT in output and ".error." in output
+    )
+    response = app.server.test_client().post(
+        "/_dash-update-component",
+        json={
+            "output": output,
+            "outputs": [
+                {"id": input_id, "property": "error"},
+                {"id": input_id, "property": "errorMessage"},
+            ],
+            "inputs": [{"id": input_id, "property": "value", "value": "Navn"}],
+            "changedPropIds": [f"{json.dumps(input_id)}.value"],
+            "state": [],
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["sideUpdate"][COMPLETENESS_VERSION_STORE_ID] == {
+        "data": get_metadata_version(state.completeness, state.validation),
+    }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from dash import Dash
+from dash import html
+
+from datadoc.static_assets import ASSETS_IGNORE
+from datadoc.static_assets import BUNDLE_MAX_BYTES
+from datadoc.static_assets import IMMUTABLE_CACHE_CONTROL
+from datadoc.static_assets import ROUTE
+from datadoc.static_assets import StaticAssets
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from flask.testing import FlaskClient
+
+URL_PREFIX = f"/user/ola/proxy/1234/{ROUTE}"
+
+
+@pytest.fixture
+def assets_folder(tmp_path: Path) -> Path:
+    (tmp_path / "fonts").mkdir()
+    (tmp_path / "fonts" / "icons.woff2").write_bytes(b"font")
+    (tmp_path / "a_style.css").write_text(".a { color: red; }")
+    (tmp_path / "b_style.css").write_text(".b { color: blue; }")
+    (tmp_path / "icons.css").write_text(
+        '@font-face { src: url("./fonts/icons.woff2?abc") format("woff2"); }\n'
+        "/* padding */" * BUNDLE_MAX_BYTES,
+    )
+    (tmp_path / "z_style.css").write_text(
+        ".z { background: url(data:image/png;base64,AA==); }",
+    )
+    (tmp_path / "script.js").write_text("document.documentElement.lang = 'nb'")
+    return tmp_path
+
+
+@pytest.fixture
+def static_assets(assets_folder: Path) -> StaticAssets:
+    return StaticAssets(assets_folder, URL_PREFIX)
+
+
+def get_asset(static_assets: StaticAssets, url: str) -> str:
+    return static_assets.assets[url.removeprefix(URL_PREFIX)].content.decode()
+
+
+def test_small_css_bundled_in_order(static_assets: StaticAssets):
+    bundle, icons, last = static_assets.stylesheets
+
+    assert bundle.startswith(f"{URL_PREFIX}bundle.")
+    content = get_asset(static_assets, bundle)
+    assert content.index(".a {") < content.index(".b {")
+    assert icons.startswith(f"{URL_PREFIX}icons.")
+    assert last.startswith(f"{URL_PREFIX}z_style.")
+    assert "data:image/png;base64,AA==" in get_asset(static_assets, last)
+
+
+def test_urls_rewritten_to_fingerprinted_names(static_assets: StaticAssets):
+    font_name = next(name for name in static_assets.assets if name.endswith(".woff2"))
+    assert font_name.startswith("fonts/icons.")
+
+    content = get_asset(static_assets, static_assets.stylesheets[1])
+    assert f'url("{URL_PREFIX}{font_name}")' in content
+
+
+def test_fingerprint_changes_with_content(assets_folder: Path):
+    before = StaticAssets(assets_folder, URL_PREFIX).stylesheets
+    (assets_folder / "b_style.css").write_text(".b { color: green; }")
+    after = StaticAssets(assets_folder, URL_PREFIX).stylesheets
+
+    assert before[0] != after[0]
+    assert before[1:] == after[1:]
+
+
+@pytest.fixture
+def client(static_assets: StaticAssets, assets_folder: Path) -> FlaskClient:
+    app = Dash(
+        __name__,
+        assets_folder=str(assets_folder),
+        assets_ignore=ASSETS_IGNORE,
+        external_stylesheets=static_assets.stylesheets,
+        external_scripts=static_assets.scripts,
+    )
+    app.layout = html.Div()
+    static_assets.init_app(app)
+    return app.server.test_client()
+
+
+def test_index_links_fingerprinted_assets(
+    client: FlaskClient,
+    static_assets: StaticAssets,
+):
+    index = client.get("/").get_data(as_text=True)
+
+    for url in static_assets.stylesheets + static_assets.scripts:
+        assert url in index
+    assert "a_style.css" not in index
+    assert "script.js" not in index
+
+
+def test_assets_served_immutable(client: FlaskClient, static_assets: StaticAssets):
+    name = static_assets.stylesheets[0].removeprefix(URL_PREFIX)
+
+    response = client.get(f"/{ROUTE}{name}")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "text/css"
+    assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.get_etag() == (static_assets.assets[name].etag, False)
+    assert client.get(f"/{ROUTE}missing.css").status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,107 @@
+"""Tests for the synthetic dataset generator."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pyarrow.parquet as pq
+import pytest
+from dapla_metadata.datasets import DaplaDatasetPathInfo
+from dapla_metadata.datasets import Datadoc
+from dapla_metadata.datasets import model
+
+from tests.synthetic_datasets import generate_dataset
+
+if TYPE_CHECKING:
+    import pathlib
+
+    from dapla_metadata.datasets.statistic_subject_mapping import (
+        StatisticSubjectMapping,
+    )
+
+
+# The variable fields the generator fills in
+FIELDS = (
+    "name",
+    "variable_role",
+    "definition_uri",
+    "is_personal_data",
+    "data_source",
+    "population_description",
+    "comment",
+    "temporality_type",
+    "measurement_unit",
+    "multiplication_factor",
+    "invalid_value_description",
+)
+
+
+def _read_document(path: pathlib.Path) -> dict:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    del document["datadoc"]["dataset"]["file_path"]
+    return document
+
+
+def test_deterministic_from_seed(tmp_path: pathlib.Path):
+    first = generate_dataset(tmp_path / "first", fill_ratio=0.5, seed=1)
+    second = generate_dataset(tmp_path / "second", fill_ratio=0.5, seed=1)
+    other = generate_dataset(tmp_path / "other", fill_ratio=0.5, seed=2)
+
+    assert pq.read_table(first.path).equals(pq.read_table(second.path))
+    assert not pq.read_table(first.path).equals(pq.read_table(other.path))
+    assert _read_document(first.metadata_documents[0]) == _read_document(
+        second.metadata_documents[0],
+    )
+
+
+def test_partitions_follow_naming_standard(tmp_path: pathlib.Path):
+    dataset = generate_dataset(tmp_path, partitions=3)
+    assert [path.name for path in dataset.paths] == [
+        "person_testdata_p2021_v1.parquet",
+        "person_testdata_p2022_v1.parquet",
+        "person_testdata_p2023_v1.parquet",
+    ]
+    assert dataset.metadata_documents == []
+    for path in dataset.paths:
+        assert DaplaDatasetPathInfo(path).path_complies_with_naming_standard()
+
+
+@pytest.mark.parametrize("num_variables", [1, 100])
+def test_type_mix(tmp_path: pathlib.Path, num_variables: int):
+    dataset = generate_dataset(
+        tmp_path,
+        num_variables=num_variables,
+        num_rows=3,
+        type_mix={"string": 1, "boolean": 0},
+    )
+    table = pq.read_table(dataset.path)
+    assert table.num_columns == num_variables
+    assert table.num_rows == 3  # noqa: PLR2004
+    assert {str(field.type) for field in table.schema} == {"string"}
+
+
+@pytest.mark.usefixtures("_mock_user_info")
+@pytest.mark.parametrize(("fill_ratio", "filled"), [(0.5, 6), (1, 11)])
+def test_metadata_documents_match_dataset(
+    tmp_path: pathlib.Path,
+    subject_mapping_fake_statistical_structure: StatisticSubjectMapping,
+    fill_ratio: float,
+    filled: int,
+):
+    dataset = generate_dataset(tmp_path, num_variables=20, fill_ratio=fill_ratio)
+    metadata = Datadoc(
+        str(dataset.path),
+        statistic_subject_mapping=subject_mapping_fake_statistical_structure,
+    )
+    assert metadata.metadata_document == dataset.metadata_documents[0]
+    assert metadata.dataset.dataset_state == model.DataSetState.PROCESSED_DATA
+    assert len(metadata.variables) == 20  # noqa: PLR2004
+    assert all(variable.data_type is not None for variable in metadata.variables)
+
+    document = model.MetadataContainer.model_validate_json(
+        dataset.metadata_documents[0].read_text(encoding="utf-8"),
+    )
+    assert document.datadoc
+    for variable in document.datadoc.variables or []:
+        assert sum(getattr(variable, field) is not None for field in FIELDS) == filled
@@ -17,3 +17,10 @@ def test_get_app_version():
         pyproject = tomli.load(f)
 
     assert get_app_version() == pyproject["tool"]["poetry"]["version"]
+
+
+def test_get_app_version_cached():
+    get_app_version()
+    hits = get_app_version.cache_info().hits
+    get_app_version()
+    assert get_app_version.cache_info().hits == hits + 1
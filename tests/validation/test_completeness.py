@@ -0,0 +1,173 @@
+"""Tests for the completeness module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from dapla_metadata.datasets import model
+
+from datadoc import state
+from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_input
+from datadoc.frontend.callbacks.variables import accept_variable_metadata_input
+from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+from datadoc.frontend.fields.display_variables import VariableIdentifiers
+from datadoc.validation.completeness import OBLIGATORY_DATASET_IDENTIFIERS
+from datadoc.validation.completeness import OBLIGATORY_DATASET_RULES
+from datadoc.validation.completeness import OBLIGATORY_VARIABLES_IDENTIFIERS
+from datadoc.validation.completeness import OBLIGATORY_VARIABLES_RULES
+from datadoc.validation.completeness import CompletenessTracker
+from datadoc.validation.completeness import get_missing_obligatory_dataset_fields
+from datadoc.validation.completeness import get_missing_obligatory_variable_fields
+from datadoc.validation.completeness import get_missing_obligatory_variables_fields
+from datadoc.validation.completeness import is_missing_value
+
+if TYPE_CHECKING:
+    from dapla_metadata.datasets import Datadoc
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, True),
+        ("", False),
+        ("STATUS", False),
+        (model.LanguageStringType([]), True),
+        (
+            model.LanguageStringType(
+                [
+                    model.LanguageStringTypeItem(languageCode="nb", languageText=""),
+                    model.LanguageStringTypeItem(languageCode="en", languageText=""),
+                ],
+            ),
+            True,
+        ),
+        (
+            model.LanguageStringType(
+                [
+                    model.LanguageStringTypeItem(languageCode="nb", languageText=""),
+                    model.LanguageStringTypeItem(languageCode="en", languageText="a"),
+                ],
+            ),
+            False,
+        ),
+    ],
+)
+def test_is_missing_value(value, expected):
+    assert is_missing_value(value) == expected
+
+
+def test_empty_tracker():
+    tracker = CompletenessTracker()
+    assert tracker.num_missing_fields == 0
+    assert tracker.percent_complete == 0
+    assert tracker.get_missing_variable_fields("unknown") == []
+
+
+def test_load_matches_model(metadata: Datadoc):
+    tracker = CompletenessTracker(metadata)
+    assert tracker.num_obligatory_fields == len(OBLIGATORY_DATASET_IDENTIFIERS) + len(
+        OBLIGATORY_VARIABLES_IDENTIFIERS,
+    ) * len(metadata.variables)
+    for variable in metadata.variables:
+        assert tracker.get_missing_variable_fields(variable.short_name) == [
+            i
+            for i in OBLIGATORY_VARIABLES_IDENTIFIERS
+            if is_missing_value(getattr(variable, i))
+        ]
+    assert tracker.get_missing_dataset_fields() == [
+        i
+        for i in OBLIGATORY_DATASET_IDENTIFIERS
+        if is_missing_value(getattr(metadata.dataset, i))
+    ]
+
+
+def test_update_variable_field(
+    metadata: Datadoc,
+    language_object: model.LanguageStringType,
+):
+    tracker = CompletenessTracker(metadata)
+    short_name = metadata.variables[0].short_name
+    num_missing = tracker.num_missing_fields
+    version = tracker.version
+    assert VariableIdentifiers.NAME in tracker.get_missing_variable_fields(
+        short_name,
+    )
+
+    tracker.update_variable_field(short_name, VariableIdentifiers.NAME, language_object)
+    assert VariableIdentifiers.NAME not in tracker.get_missing_variable_fields(
+        short_name,
+    )
+    assert tracker.num_missing_fields == num_missing - 1
+    assert tracker.version > version
+    assert tracker.variable_changed_since(short_name, version)
+    assert not tracker.variable_changed_since(metadata.variables[1].short_name, version)
+
+    tracker.update_variable_field(short_name, VariableIdentifiers.NAME, None)
+    assert tracker.num_missing_fields == num_missing
+
+
+def test_update_unchanged_does_not_change_version(metadata: Datadoc):
+    tracker = CompletenessTracker(metadata)
+    version = tracker.version
+    tracker.update_variable_field(
+        metadata.variables[0].short_name,
+        VariableIdentifiers.NAME,
+        None,
+    )
+    tracker.update_variable_field(
+        metadata.variables[0].short_name,
+        VariableIdentifiers.FORMAT,
+        "not obligatory",
+    )
+    tracker.update_dataset_field(DatasetIdentifiers.KEYWORD, ["not", "obligatory"])
+    assert tracker.version == version
+
+
+def test_accepted_edits_update_tracker(metadata: Datadoc):
+    state.metadata = metadata
+    state.completeness = CompletenessTracker(metadata)
+    short_name = metadata.variables[0].short_name
+    num_missing = state.completeness.num_missing_fields
+
+    accept_variable_metadata_input(
+        "Variabelnavn",
+        short_name,
+        VariableIdentifiers.NAME.value,
+        "nb",
+    )
+    accept_dataset_metadata_input(
+        "Datasettnavn",
+        DatasetIdentifiers.NAME.value,
+        "nb",
+    )
+
+    assert state.completeness.num_missing_fields == num_missing - 2
+    assert (
+        state.completeness.num_missing_fields
+        == CompletenessTracker(metadata).num_missing_fields
+    )
+
+
+def test_get_missing_obligatory_variables_fields(metadata: Datadoc):
+    missing = get_missing_obligatory_variables_fields(metadata.variables)
+    assert all(missing.values())
+    assert list(CompletenessTracker(metadata).iter_missing_variables_fields()) == list(
+        missing.items(),
+    )
+
+
+def test_get_missing_obligatory_dataset_fields_no_dataset():
+    assert get_missing_obligatory_dataset_fields(None) == list(
+        OBLIGATORY_DATASET_IDENTIFIERS,
+    )
+
+
+def test_obligatory_rules(metadata: Datadoc):
+    variable = metadata.variables[0]
+    for identifier, rule in OBLIGATORY_VARIABLES_RULES.items():
+        assert rule.depends_on == {identifier}
+        assert rule.is_valid(variable) == (
+            identifier not in get_missing_obligatory_variable_fields(variable)
+        )
+    assert not any(rule.is_valid(None) for rule in OBLIGATORY_DATASET_RULES.values())
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+from datadoc import state
+from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_date_input
+from datadoc.frontend.callbacks.dataset import accept_dataset_metadata_input
+from datadoc.frontend.callbacks.variables import accept_variable_metadata_input
+from datadoc.frontend.fields.display_dataset import DatasetIdentifiers
+from datadoc.frontend.fields.display_variables import VariableIdentifiers
+from datadoc.validation.engine import DATASET_DATE_ORDER_RULE
+from datadoc.validation.engine import VARIABLE_DATE_ORDER_RULE
+from datadoc.validation.engine import RuleScope
+from datadoc.validation.engine import ValidationEngine
+from datadoc.validation.engine import ValidationRule
+from datadoc.validation.engine import dates_in_order
+from datadoc.validation.engine import get_default_rules
+from datadoc.validation.engine import get_short_name_rules
+from datadoc.validation.naming import NAMING_STANDARD_RULE
+from datadoc.validation.naming import ShortNameValidator
+
+if TYPE_CHECKING:
+    from dapla_metadata.datasets import Datadoc
+
+EARLIER = datetime.date(2020, 1, 1)
+LATER = datetime.date(2024, 1, 1)
+
+
+def test_dates_in_order(metadata: Datadoc):
+    variable = metadata.variables[0]
+    assert dates_in_order(variable)
+    variable.contains_data_from = LATER
+    assert dates_in_order(variable)
+    variable.contains_data_until = EARLIER
+    assert not dates_in_order(variable)
+
+
+def test_load_finds_violations(metadata: Datadoc):
+    metadata.dataset.contains_data_from = LATER
+    metadata.dataset.contains_data_until = EARLIER
+    variable = metadata.variables[0]
+    variable.contains_data_from = LATER
+    variable.contains_data_until = EARLIER
+
+    engine = ValidationEngine(get_default_rules(ShortNameValidator()), metadata)
+
+    assert [v.rule for v in engine.get_dataset_violations()] == [
+        DATASET_DATE_ORDER_RULE,
+    ]
+    assert [v.rule for v in engine.get_variable_violations(variable.short_name)] == [
+        VARIABLE_DATE_ORDER_RULE,
+    ]
+    assert engine.get_variable_violations(metadata.variables[1].short_name) == []
+    assert len(engine.violations) == 2  # noqa: PLR2004
+
+
+def test_only_rules_depending_on_the_field_are_evaluated(metadata: Datadoc):
+    evaluated = []
+
+    def is_valid(variable) -> bool:
+        evaluated.append(variable.short_name)
+        return True
+
+    rule = ValidationRule(
+        name="counting",
+        scope=RuleScope.VARIABLE,
+        depends_on=frozenset({VariableIdentifiers.NAME.value}),
+        message="",
+        is_valid=is_valid,
+    )
+    engine = ValidationEngine([rule], metadata)
+    evaluated.clear()
+    version = engine.version
+    short_name = metadata.variables[0].short_name
+
+    engine.update_variable_field(short_name, VariableIdentifiers.FORMAT.value)
+    assert evaluated == []
+    engine.update_variable_field(short_name, VariableIdentifiers.NAME.value)
+    assert evaluated == [short_name]
+    # Nothing changed, so the version is the same
+    assert engine.version == version
+
+
+def test_update_variable_field(metadata: Datadoc):
+    engine = ValidationEngine([VARIABLE_DATE_ORDER_RULE], metadata)
+    version = engine.version
+    variable = metadata.variables[0]
+
+    variable.contains_data_from = LATER
+    variable.contains_data_until = EARLIER
+    engine.update_variable_field(
+        variable.short_name,
+        VariableIdentifiers.CONTAINS_DATA_UNTIL.value,
+    )
+    assert engine.get_variable_violations(variable.short_name)
+    assert engine.variable_changed_since(variable.short_name, version)
+    assert not engine.variable_changed_since(metadata.variables[1].short_name, version)
+
+    variable.contains_data_until = LATER
+    engine.update_variable_field(
+        variable.short_name,
+        VariableIdentifiers.CONTAINS_DATA_UNTIL.value,
+    )
+    assert engine.get_variable_violations(variable.short_name) == []
+
+
+def test_short_name_rules(metadata_illegal_shortnames: Datadoc):
+    engine = ValidationEngine(
+        get_short_name_rules(ShortNameValidator()),
+        metadata_illegal_shortnames,
+    )
+    assert {v.short_name for v in engine.violations} == {
+        v.short_name
+        for v in metadata_illegal_shortnames.variables
+        if not NAMING_STANDARD_RULE.is_valid(v.short_name)
+    }
+
+
+def test_broken_rule_is_not_a_violation(metadata: Datadoc):
+    def is_valid(dataset) -> bool:  # noqa: ARG001
+        raise TypeError
+
+    rule = ValidationRule(
+        name="broken",
+        scope=RuleScope.DATASET,
+        depends_on=frozenset({DatasetIdentifiers.NAME.value}),
+        message="",
+        is_valid=is_valid,
+    )
+    assert ValidationEngine([rule], metadata).violations == []
+
+
+def test_accepted_edits_update_engine(metadata: Datadoc):
+    state.metadata = metadata
+    state.validation = ValidationEngine(
+        [
+            ValidationRule(
+                name="dataset_source",
+                scope=RuleScope.DATASET,
+                depends_on=frozenset({DatasetIdentifiers.DATA_SOURCE.value}),
+                message="",
+                is_valid=lambda dataset: dataset.data_source != "invalid",
+            ),
+            ValidationRule(
+                name="variable_format",
+                scope=RuleScope.VARIABLE,
+                depends_on=frozenset({VariableIdentifiers.FORMAT.value}),
+                message="",
+                is_valid=lambda variable: variable.format != "invalid",
+            ),
+        ],
+        metadata,
+    )
+    short_name = metadata.variables[0].short_name
+
+    accept_dataset_metadata_input("invalid", DatasetIdentifiers.DATA_SOURCE, "nb")
+    accept_variable_metadata_input(
+        "invalid",
+        short_name,
+        VariableIdentifiers.FORMAT.value,
+    )
+
+    assert {(v.rule.name, v.short_name) for v in state.validation.violations} == {
+        ("dataset_source", None),
+        ("variable_format", short_name),
+    }
+
+
+def test_inherited_dates_out_of_order_are_violations(metadata: Datadoc):
+    state.metadata = metadata
+    variable = metadata.variables[0]
+    variable.contains_data_until = datetime.datetime(2020, 1, 1, tzinfo=datetime.UTC)
+    state.validation = ValidationEngine([VARIABLE_DATE_ORDER_RULE], metadata)
+
+    accept_dataset_metadata_date_input(
+        DatasetIdentifiers.CONTAINS_DATA_FROM,
+        "2024-01-01",
+        None,
+    )
+
+    assert [(v.message, v.short_name) for v in state.validation.violations] == [
+        (VARIABLE_DATE_ORDER_RULE.message, variable.short_name),
+    ]
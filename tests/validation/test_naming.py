@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from datadoc.constants import ILLEGAL_SHORTNAME_BADGE
+from datadoc.validation.naming import NAMING_STANDARD_RULE
+from datadoc.validation.naming import NamingRule
+from datadoc.validation.naming import ShortNameValidator
+
+
+@pytest.mark.parametrize(
+    ("short_name", "expected_violations"),
+    [
+        ("var", ()),
+        ("var_2", ()),
+        ("rådyr", (NAMING_STANDARD_RULE,)),
+        ("Var", (NAMING_STANDARD_RULE,)),
+        ("Var illegal", (NAMING_STANDARD_RULE,)),
+        ("V", (NAMING_STANDARD_RULE,)),
+        (None, (NAMING_STANDARD_RULE,)),
+    ],
+)
+def test_naming_standard(
+    short_name: str | None,
+    expected_violations: tuple[NamingRule, ...],
+):
+    assert ShortNameValidator().get_violations(short_name) == expected_violations
+
+
+def test_violations_are_cached():
+    calls = []
+
+    def is_valid(short_name: str) -> bool:
+        calls.append(short_name)
+        return True
+
+    validator = ShortNameValidator([NamingRule("counting", "", is_valid)])
+    validator.validate(["var_1", "var_2"])
+    validator.get_violations("var_1")
+    validator.get_invalid_short_names(["var_1", "var_2"])
+    assert calls == ["var_1", "var_2"]
+
+
+def test_add_rule_clears_cache():
+    validator = ShortNameValidator()
+    validator.validate(["pers_id"])
+    max_length = NamingRule(
+        "max_length",
+        "For langt kortnavn",
+        lambda short_name: len(short_name) <= 5,  # noqa: PLR2004
+    )
+    validator.add_rule(max_length)
+    assert validator.get_violations("pers_id") == (max_length,)
+    assert validator.get_badges("Pers_id") == [
+        ILLEGAL_SHORTNAME_BADGE,
+        "For langt kortnavn",
+    ]
+
+
+def test_get_invalid_short_names():
+    assert ShortNameValidator().get_invalid_short_names(
+        ["var", "Var", None, "rådyr"],
+    ) == ["Var", "rådyr"]